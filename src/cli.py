@@ -0,0 +1,227 @@
+"""Headless scan entry point that writes results to a file."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import date
+
+from data.alpaca_client import AlpacaDataProvider
+from data.bar_cache import DEFAULT_SPILL_MB, spill_limit_bytes
+from data.local_provider import LocalBarProvider
+from screener.engine import ScanConfig, ScreenerEngine, has_signals
+from screener.export import EXPORT_FORMATS, export_results
+from screener.ranking import RANK_SCORES
+from screener.streaming import cache_bars
+from utils.logging import configure_logging
+
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the streamed results.
+_END = object()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run a stock screener scan without the GUI.")
+    symbols = parser.add_mutually_exclusive_group(required=True)
+    symbols.add_argument("--symbols", help="Tickers, comma or whitespace separated")
+    symbols.add_argument("--symbols-file", help="File with tickers, one per line or comma-separated")
+
+    parser.add_argument(
+        "--bars-dir",
+        default=os.getenv("SCREENER_BARS_DIR"),
+        help="Read bars from local CSV/Parquet files instead of Alpaca",
+    )
+    parser.add_argument("--timeframe", default="Day", choices=["Day", "Hour", "Minute"])
+    parser.add_argument("--lookback-days", type=int, default=180)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None, help="YYYY-MM-DD")
+    parser.add_argument("--within", type=int, default=1, help="Crossover within last N bars")
+
+    parser.add_argument("--no-macd", action="store_true", help="Disable the MACD crossover filter")
+    parser.add_argument("--macd", type=int, nargs=3, default=[12, 26, 9], metavar=("FAST", "SLOW", "SIGNAL"))
+    parser.add_argument("--ma", action="store_true", help="Enable the MA crossover filter")
+    parser.add_argument("--ma-periods", type=int, nargs=2, default=[20, 200], metavar=("FAST", "SLOW"))
+    parser.add_argument("--ema", action="store_true", help="Enable the EMA crossover filter")
+    parser.add_argument("--ema-periods", type=int, nargs=2, default=[12, 26], metavar=("FAST", "SLOW"))
+
+    parser.add_argument("--rsi-range", type=float, nargs=2, metavar=("MIN", "MAX"), help="Keep matches with RSI in range")
+    parser.add_argument("--rsi-period", type=int, default=14)
+    parser.add_argument("--min-avg-volume", type=float, help="Keep matches whose average volume exceeds this")
+    parser.add_argument("--volume-period", type=int, default=20)
+
+    parser.add_argument("--top", type=int, default=None, metavar="K", help="Keep only the K best-ranked matches")
+    parser.add_argument("--rank-by", choices=sorted(RANK_SCORES), default="age", help="Score used with --top")
+
+    parser.add_argument(
+        "--memory-limit", type=float, default=None, metavar="MB", help="Stream symbols within about MB of fetched bars"
+    )
+    parser.add_argument(
+        "--spill-dir",
+        default=os.getenv("SCREENER_SPILL_DIR"),
+        help="Keep completed Alpaca segments evicted from memory in this directory",
+    )
+    parser.add_argument(
+        "--spill-max-mb",
+        type=float,
+        default=float(os.getenv("SCREENER_SPILL_MAX_MB", DEFAULT_SPILL_MB)),
+        metavar="MB",
+        help="Delete the least recently used spill files beyond MB (0 = no limit)",
+    )
+
+    parser.add_argument("--workers", type=int, default=1, help="Evaluate scans of 500+ symbols on N processes (0 = all CPU cores)")
+
+    parser.add_argument("-o", "--output", required=True, help="Output path (.csv, .jsonl, .parquet, .arrow)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None, help="Override format inferred from --output")
+    parser.add_argument("--include-series", action="store_true", help="Also write each result's close and indicator series")
+    parser.add_argument(
+        "--sort",
+        action="store_true",
+        help="Hold every result and write them by signal age (default: write each match as it is found)",
+    )
+    return parser
+
+
+def _scan_and_export(engine: ScreenerEngine, config: ScanConfig, args: argparse.Namespace) -> tuple[int, list[str], list[str]]:
+    """Run the scan and write its results; returns the row count, invalid symbols and warnings.
+
+    Ranked (``--top``) and ``--sort`` scans need every result before the
+    first row is written. Otherwise rows are written while the scan runs,
+    so results are never all held in memory.
+    """
+    if config.top_k is not None or args.sort:
+        results, invalid, warnings = engine.run_scan(config, threading.Event(), lambda *_: None)
+        if config.top_k is None:
+            results.sort(key=lambda r: (r.signal_age, r.symbol))
+        return export_results(results, args.output, args.format, args.include_series), invalid, warnings
+
+    pending: queue.Queue = queue.Queue()
+    cancel_event = threading.Event()
+    outcome: dict = {}
+
+    def scan() -> None:
+        try:
+            outcome["scan"] = engine.run_scan(config, cancel_event, lambda *_: None, pending.put, collect=False)
+        except BaseException as exc:
+            outcome["error"] = exc
+        finally:
+            pending.put(_END)
+
+    def rows():
+        while True:
+            result = pending.get()
+            if result is _END:
+                return
+            yield result
+
+    thread = threading.Thread(target=scan, name="scan", daemon=True)
+    thread.start()
+    try:
+        count = export_results(rows(), args.output, args.format, args.include_series)
+    finally:
+        # Stops the scan early if writing failed; a finished scan ignores it.
+        cancel_event.set()
+        thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    _, invalid, warnings = outcome["scan"]
+    return count, invalid, warnings
+
+
+def main(argv: list[str] | None = None) -> int:
+    configure_logging()
+    args = build_parser().parse_args(argv)
+
+    max_cached_bars = cache_bars(args.memory_limit) if args.memory_limit else None
+    if args.bars_dir:
+        provider = LocalBarProvider(args.bars_dir, max_cached_bars=max_cached_bars)
+    else:
+        api_key = os.getenv("ALPACA_API_KEY", "")
+        secret_key = os.getenv("ALPACA_SECRET_KEY", "")
+        if not api_key or not secret_key:
+            logger.error("Missing API credentials: set ALPACA_API_KEY and ALPACA_SECRET_KEY, or pass --bars-dir")
+            return 2
+        provider = AlpacaDataProvider(
+            api_key,
+            secret_key,
+            max_cached_bars=max_cached_bars,
+            spill_dir=args.spill_dir,
+            max_spill_bytes=spill_limit_bytes(args.spill_max_mb),
+        )
+
+    if args.symbols_file:
+        with open(args.symbols_file, "r", encoding="utf-8") as f:
+            symbols_text = f.read()
+    else:
+        symbols_text = args.symbols
+
+    config = ScanConfig(
+        symbols_text=symbols_text,
+        timeframe=args.timeframe,
+        lookback_days=args.lookback_days,
+        end_date=args.end_date,
+        within_bars=args.within,
+        use_macd=not args.no_macd,
+        macd_fast=args.macd[0],
+        macd_slow=args.macd[1],
+        macd_signal=args.macd[2],
+        use_ma=args.ma,
+        ma_fast=args.ma_periods[0],
+        ma_slow=args.ma_periods[1],
+        use_ema=args.ema,
+        ema_fast=args.ema_periods[0],
+        ema_slow=args.ema_periods[1],
+        rsi_period=args.rsi_period,
+        rsi_min=args.rsi_range[0] if args.rsi_range else None,
+        rsi_max=args.rsi_range[1] if args.rsi_range else None,
+        volume_period=args.volume_period,
+        min_avg_volume=args.min_avg_volume,
+        top_k=args.top,
+        rank_by=args.rank_by,
+        memory_limit_mb=args.memory_limit,
+        include_series=args.include_series,
+    )
+    if not has_signals(config):
+        logger.error("Enable at least one filter (MACD, MA or EMA)")
+        return 2
+
+    evaluator = None
+    if args.workers != 1:
+        from screener.parallel import ParallelEvaluator
+
+        evaluator = ParallelEvaluator(args.workers or None)
+
+    engine = ScreenerEngine(provider, evaluator=evaluator)
+    try:
+        count, invalid, warnings = _scan_and_export(engine, config, args)
+    finally:
+        if evaluator is not None:
+            evaluator.shutdown()
+        if isinstance(provider, AlpacaDataProvider):
+            stats = provider.http.stats()
+            if stats["requests"]:
+                logger.info(
+                    "HTTP: %d requests on %d connections, %.0f%% reused, avg %.1f ms, p95 %.1f ms",
+                    stats["requests"],
+                    stats["connections_opened"],
+                    100 * stats["reused"],
+                    stats["total_ms"],
+                    stats["p95_ms"],
+                )
+            provider.close()
+
+    if invalid:
+        logger.warning("Invalid symbols skipped: %s", ", ".join(invalid))
+    for warning in warnings:
+        logger.warning(warning)
+
+    logger.info("Wrote %d results to %s", count, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,92 +1,308 @@
-"""Alpaca market data wrapper with in-memory caching."""
+"""Alpaca market data wrapper with in-memory caching.
+
+Bars come from the REST ``/v2/stocks/bars`` endpoint over ``HTTPPool``
+rather than through alpaca-py. The provider only needs that one read-only
+endpoint, and owning the transport lets it size the keep-alive pool to its
+fetch workers, request gzip, retry 429/504 and time every request, without
+importing the SDK or building its per-bar models before converting them to
+``OHLCVBar``.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_left
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import date, datetime, timedelta, timezone
-from typing import Dict, Iterable, List, Tuple
+from threading import Event
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from data.bar_cache import DEFAULT_MAX_SPILL_BYTES, BarCache
+from data.http_pool import HTTPPool
+from data.provider import TIMEFRAME_DELTAS, FetchCancelled, OHLCVBar, parse_timeframe
+
 
-from alpaca.data.historical.stock import StockHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest
-from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
+T = TypeVar("T")
 
+DATA_URL = "https://data.alpaca.markets"
+# Largest page the bars endpoint serves; longer ranges continue via next_page_token.
+_PAGE_LIMIT = 10000
 
-@dataclass
-class OHLCVBar:
-    timestamp: datetime
-    open: float
-    high: float
-    low: float
-    close: float
-    volume: float
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# How often a waiting caller checks its cancel event.
+_CANCEL_POLL_SECONDS = 0.05
 
 
 class AlpacaDataProvider:
-    """Fetches and caches stock bars from Alpaca data API."""
+    """Fetches and caches stock bars from Alpaca data API.
+
+    Ranges are downloaded in epoch-aligned segments (see ``_segment_span``).
+    Segments that lie entirely in the past are cached, so scans with
+    different end times, or a scan restarted after a cancel, only download
+    the segments they are still missing. Segments are fetched concurrently
+    on ``fetch_workers`` threads over a pool of as many keep-alive
+    connections: a cancelled caller returns at once while in-flight
+    segments finish in the background and are still cached.
+
+    ``max_cached_bars`` bounds the bars each cache keeps in memory; with
+    ``spill_dir`` set, completed segments evicted from memory are kept on
+    disk there instead of being downloaded again, up to ``max_spill_bytes``.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        secret_key: str,
+        fetch_workers: int = 4,
+        base_url: str = DATA_URL,
+        max_cached_bars: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        max_spill_bytes: Optional[int] = DEFAULT_MAX_SPILL_BYTES,
+    ):
+        self.http = HTTPPool(
+            base_url,
+            size=fetch_workers,
+            headers={"APCA-API-KEY-ID": api_key, "APCA-API-SECRET-KEY": secret_key},
+        )
+        # (symbol, timeframe, start, end) -> bars returned by get_bars.
+        self._cache = BarCache(max_cached_bars)
+        # (symbol, timeframe, segment start) -> bars of a completed segment.
+        self._segments = BarCache(max_cached_bars, spill_dir, max_spill_bytes)
+        # Growing per-(symbol, timeframe) series used by scheduled rescans.
+        self._live: Dict[Tuple[str, str], List[OHLCVBar]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="alpaca-fetch")
 
-    def __init__(self, api_key: str, secret_key: str):
-        self.client = StockHistoricalDataClient(api_key=api_key, secret_key=secret_key)
-        self._cache: Dict[Tuple[str, str, datetime, datetime], List[OHLCVBar]] = {}
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.http.close()
 
     @staticmethod
-    def timeframe_from_string(value: str) -> TimeFrame:
-        value = value.lower().strip()
-        if value == "day":
-            return TimeFrame.Day
-        if value == "hour":
-            return TimeFrame(1, TimeFrameUnit.Hour)
-        if value == "minute":
-            return TimeFrame(1, TimeFrameUnit.Minute)
-        raise ValueError(f"Unsupported timeframe: {value}")
+    def timeframe_from_string(value: str) -> str:
+        return parse_timeframe(value)
 
     @staticmethod
-    def _estimated_delta(timeframe: TimeFrame) -> timedelta:
-        if timeframe == TimeFrame.Day:
-            return timedelta(days=1)
-        if timeframe.unit_value == TimeFrameUnit.Hour:
-            return timedelta(hours=timeframe.amount_value)
-        if timeframe.unit_value == TimeFrameUnit.Minute:
-            return timedelta(minutes=timeframe.amount_value)
-        return timedelta(minutes=1)
+    def _estimated_delta(timeframe: str) -> timedelta:
+        return TIMEFRAME_DELTAS.get(timeframe, timedelta(minutes=1))
+
+    @classmethod
+    def _segment_span(cls, timeframe: str) -> timedelta:
+        """Segment length: roughly a few thousand bars per symbol for each timeframe."""
+        delta = cls._estimated_delta(timeframe)
+        if delta >= timedelta(days=1):
+            return timedelta(days=180)
+        if delta >= timedelta(hours=1):
+            return timedelta(days=15)
+        return timedelta(days=1)
 
     def get_bars(
         self,
         symbols: Iterable[str],
-        timeframe: TimeFrame,
+        timeframe: str,
         start: datetime,
         end: datetime,
+        cancel_event: Optional[Event] = None,
     ) -> Dict[str, List[OHLCVBar]]:
-        """Fetch bar data for symbols, with cache and latest-forming-bar pruning."""
+        """Fetch bar data for symbols, with cache and latest-forming-bar pruning.
+
+        Raises ``FetchCancelled`` soon after ``cancel_event`` is set.
+        """
         symbols = [s.upper() for s in symbols]
-        missing = [s for s in symbols if (s, str(timeframe), start, end) not in self._cache]
+        tf_key = str(timeframe)
+        out: Dict[str, List[OHLCVBar]] = {}
+        missing = []
+        for symbol in symbols:
+            bars = self._cache.get((symbol, tf_key, start, end))
+            if bars is None:
+                missing.append(symbol)
+            else:
+                out[symbol] = bars
 
         if missing:
-            request = StockBarsRequest(
-                symbol_or_symbols=missing,
-                timeframe=timeframe,
-                start=start,
-                end=end,
-            )
-            bars_response = self.client.get_stock_bars(request)
-
+            fetched = self._fetch_range(missing, timeframe, start, end, cancel_event)
             for symbol in missing:
-                symbol_bars = bars_response.data.get(symbol, [])
-                converted = [
-                    OHLCVBar(
-                        timestamp=bar.timestamp,
-                        open=bar.open,
-                        high=bar.high,
-                        low=bar.low,
-                        close=bar.close,
-                        volume=bar.volume,
+                self._cache.put((symbol, tf_key, start, end), fetched[symbol])
+                out[symbol] = fetched[symbol]
+
+        return {s: out[s] for s in symbols}
+
+    def reset_live(self, symbols: Iterable[str], timeframe: str) -> None:
+        """Forget live series, so the next ``refresh_bars`` downloads and reports them afresh."""
+        for symbol in symbols:
+            self._live.pop((symbol.upper(), str(timeframe)), None)
+
+    def refresh_bars(
+        self,
+        symbols: Iterable[str],
+        timeframe: str,
+        start: datetime,
+        cancel_event: Optional[Event] = None,
+    ) -> Tuple[Dict[str, List[OHLCVBar]], Set[str]]:
+        """Extend live per-symbol series with bars completed since the last call.
+
+        The first call for a symbol downloads ``start``..now; later calls only
+        request bars after the last completed one. Series that gain bars are
+        trimmed to ``start`` (the lookback window), so a long-running session
+        does not grow them without bound; unchanged symbols keep identical
+        bars. Returns all bars plus the set of symbols that gained bars. Live
+        series are only extended once every group has been fetched, so a
+        cancelled refresh leaves them as they were.
+        """
+        symbols = [s.upper() for s in symbols]
+        tf_key = str(timeframe)
+        now_utc = datetime.now(timezone.utc)
+        delta = self._estimated_delta(timeframe)
+        changed: Set[str] = set()
+
+        by_since: Dict[datetime, List[str]] = {}
+        for symbol in symbols:
+            live = self._live.get((symbol, tf_key))
+            if not live:
+                by_since.setdefault(start, []).append(symbol)
+            elif live[-1].timestamp + 2 * delta <= now_utc:
+                by_since.setdefault(live[-1].timestamp + delta, []).append(symbol)
+
+        fetched_groups = []
+        for since, group in by_since.items():
+            if since == start:
+                fetched = self._fetch_range(group, timeframe, start, now_utc, cancel_event)
+            else:
+                fetched = self._await(self._executor.submit(self._fetch, group, timeframe, since, now_utc), cancel_event)
+            fetched_groups.append((group, fetched))
+
+        for group, fetched in fetched_groups:
+            for symbol in group:
+                if (symbol, tf_key) not in self._live:
+                    changed.add(symbol)
+                live = self._live.setdefault((symbol, tf_key), [])
+                new_bars = [b for b in fetched[symbol] if not live or b.timestamp > live[-1].timestamp]
+                if new_bars:
+                    live.extend(new_bars)
+                    del live[: bisect_left([b.timestamp for b in live], start)]
+                    changed.add(symbol)
+
+        return {s: self._live.get((s, tf_key), []) for s in symbols}, changed
+
+    def _fetch_range(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start: datetime,
+        end: datetime,
+        cancel_event: Optional[Event],
+    ) -> Dict[str, List[OHLCVBar]]:
+        tf_key = str(timeframe)
+        span = self._segment_span(timeframe)
+        # A segment is complete once its last bar has closed.
+        complete_before = datetime.now(timezone.utc) - self._estimated_delta(timeframe)
+        out: Dict[str, List[OHLCVBar]] = {s: [] for s in symbols}
+
+        # Submit every missing segment up front so they download concurrently.
+        # (segment start, segment end, download or None when cached, complete)
+        jobs: List[Tuple[datetime, datetime, Optional[Future[Any]], bool]] = []
+        segment_start = _EPOCH + ((start - _EPOCH) // span) * span
+        while segment_start <= end:
+            segment_end = segment_start + span
+            if segment_end <= complete_before:
+                pending = [s for s in symbols if (s, tf_key, segment_start) not in self._segments]
+                future = (
+                    self._executor.submit(self._fetch_segment, pending, timeframe, segment_start, segment_end)
+                    if pending
+                    else None
+                )
+                jobs.append((segment_start, segment_end, future, True))
+            else:
+                # Still forming: fetch just the requested part and do not keep it.
+                future = self._executor.submit(self._fetch, symbols, timeframe, max(start, segment_start), end)
+                jobs.append((segment_start, segment_end, future, False))
+            segment_start = segment_end
+
+        try:
+            for segment_start, segment_end, future, complete in jobs:
+                fetched = self._await(future, cancel_event) if future is not None else {}
+                if not complete:
+                    for symbol in symbols:
+                        out[symbol].extend(fetched[symbol])
+                    continue
+                segment = {s: fetched[s] if s in fetched else self._segments.get((s, tf_key, segment_start)) for s in symbols}
+                # A bounded cache may have evicted segments since they were checked.
+                lost = [s for s, bars in segment.items() if bars is None]
+                if lost:
+                    segment.update(
+                        self._await(
+                            self._executor.submit(self._fetch_segment, lost, timeframe, segment_start, segment_end),
+                            cancel_event,
+                        )
                     )
-                    for bar in symbol_bars
-                ]
-                self._cache[(symbol, str(timeframe), start, end)] = self._prune_incomplete_bar(converted, timeframe)
+                for symbol in symbols:
+                    out[symbol].extend(b for b in segment[symbol] if start <= b.timestamp <= end)
+        except BaseException:
+            # Cancelled or failed: drop segments that have not started; running ones finish and are cached.
+            for _, _, future, _ in jobs:
+                if future is not None:
+                    future.cancel()
+            raise
+        return out
+
+    def _fetch_segment(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        segment_start: datetime,
+        segment_end: datetime,
+    ) -> Dict[str, List[OHLCVBar]]:
+        fetched = self._fetch(symbols, timeframe, segment_start, segment_end)
+        tf_key = str(timeframe)
+        out = {symbol: [b for b in fetched[symbol] if b.timestamp < segment_end] for symbol in symbols}
+        for symbol, bars in out.items():
+            self._segments.put((symbol, tf_key, segment_start), bars)
+        return out
 
-        return {s: self._cache.get((s, str(timeframe), start, end), []) for s in symbols}
+    @staticmethod
+    def _await(future: Future[T], cancel_event: Optional[Event]) -> T:
+        """Wait for ``future``; if cancelled first, leave it running and raise ``FetchCancelled``."""
+        if cancel_event is not None:
+            while not wait([future], timeout=_CANCEL_POLL_SECONDS).done:
+                if cancel_event.is_set():
+                    raise FetchCancelled()
+        return future.result()
 
-    def _prune_incomplete_bar(self, bars: List[OHLCVBar], timeframe: TimeFrame) -> List[OHLCVBar]:
+    def _fetch(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start: datetime,
+        end: datetime,
+    ) -> Dict[str, List[OHLCVBar]]:
+        params: Dict[str, Any] = {
+            "symbols": ",".join(symbols),
+            "timeframe": timeframe,
+            "start": _rfc3339(start),
+            "end": _rfc3339(end),
+            "limit": _PAGE_LIMIT,
+        }
+        out: Dict[str, List[OHLCVBar]] = {symbol: [] for symbol in symbols}
+        while True:
+            page = self.http.get_json("/v2/stocks/bars", params)
+            for symbol, bars in (page.get("bars") or {}).items():
+                if symbol in out:
+                    out[symbol].extend(
+                        OHLCVBar(
+                            timestamp=_parse_timestamp(bar["t"]),
+                            open=bar["o"],
+                            high=bar["h"],
+                            low=bar["l"],
+                            close=bar["c"],
+                            volume=bar["v"],
+                        )
+                        for bar in bars
+                    )
+            token = page.get("next_page_token")
+            if not token:
+                break
+            params["page_token"] = token
+
+        return {symbol: self._prune_incomplete_bar(bars, timeframe) for symbol, bars in out.items()}
+
+    def _prune_incomplete_bar(self, bars: List[OHLCVBar], timeframe: str) -> List[OHLCVBar]:
         if not bars:
             return bars
 
@@ -98,6 +314,14 @@ class AlpacaDataProvider:
         return bars
 
 
+def _rfc3339(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 def build_date_range(lookback_days: int, end_date: date | None = None) -> Tuple[datetime, datetime]:
     """Build UTC datetime range used for historical requests."""
     if lookback_days <= 0:
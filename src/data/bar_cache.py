@@ -0,0 +1,180 @@
+"""Bar-count-bounded LRU cache for bar lists, with optional spill to disk."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Hashable, List, Optional, Tuple
+
+from data.provider import OHLCVBar
+
+
+# Values stored per bar on disk: timestamp (epoch seconds), open, high, low, close, volume.
+_FIELDS = 6
+_SPILL_SUFFIX = ".bars"
+# Default bound on a spill directory's size.
+DEFAULT_SPILL_MB = 2048.0
+DEFAULT_MAX_SPILL_BYTES = int(DEFAULT_SPILL_MB * 1024 * 1024)
+
+
+def spill_limit_bytes(megabytes: float) -> Optional[int]:
+    """``max_spill_bytes`` for a bound given in MB; ``0`` means no bound."""
+    return int(megabytes * 1024 * 1024) if megabytes > 0 else None
+
+
+def _dump(bars: List[OHLCVBar]) -> array:
+    values = array("d")
+    for bar in bars:
+        values.extend((bar.timestamp.timestamp(), bar.open, bar.high, bar.low, bar.close, bar.volume))
+    return values
+
+
+def _load(values: array) -> List[OHLCVBar]:
+    fromtimestamp = datetime.fromtimestamp
+    return [
+        OHLCVBar(fromtimestamp(values[i], timezone.utc), *values[i + 1 : i + _FIELDS])
+        for i in range(0, len(values), _FIELDS)
+    ]
+
+
+class BarCache:
+    """Maps keys to bar lists, keeping at most ``max_bars`` bars in memory.
+
+    Least recently used entries are evicted first. With ``spill_dir`` set,
+    evicted entries are written there as packed float64 records (48 bytes a
+    bar instead of ~300 for ``OHLCVBar`` objects) and read back on the next
+    ``get``; spill files persist, so a later run reuses them. Once the
+    directory holds more than ``max_spill_bytes`` of spill files, the least
+    recently written or read ones are deleted (``None`` never deletes).
+    Without a ``spill_dir`` evicted entries are simply dropped.
+    ``max_bars=None`` never evicts.
+    """
+
+    def __init__(
+        self,
+        max_bars: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        max_spill_bytes: Optional[int] = DEFAULT_MAX_SPILL_BYTES,
+    ):
+        if max_bars is not None and max_bars <= 0:
+            raise ValueError("max_bars must be > 0")
+        if max_spill_bytes is not None and max_spill_bytes <= 0:
+            raise ValueError("max_spill_bytes must be > 0")
+        self.max_bars = max_bars
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        # Running size of the spill directory; recounted from disk whenever it passes the bound.
+        self.spill_bytes = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_bytes = sum(size for _, size, _ in self._spill_files())
+        self.memory_bars = 0
+        self._entries: OrderedDict[Hashable, List[OHLCVBar]] = OrderedDict()
+        self._lock = Lock()
+        # Separate from ``_lock`` so trimming the directory never stalls in-memory hits.
+        self._spill_lock = Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries or self._spill_path(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[List[OHLCVBar]]:
+        with self._lock:
+            bars = self._entries.get(key)
+            if bars is not None:
+                self._entries.move_to_end(key)
+                return bars
+            path = self._spill_path(key)
+        if path is None:
+            return None
+
+        values = array("d")
+        try:
+            with open(path, "rb") as f:
+                values.frombytes(f.read())
+            # Reads count as use, so the size bound deletes files nobody reads first.
+            os.utime(path)
+        except FileNotFoundError:
+            # Deleted by the size bound since the existence check.
+            return None
+        bars = _load(values)
+        self.put(key, bars)
+        return bars
+
+    def put(self, key: Hashable, bars: List[OHLCVBar]) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.memory_bars -= len(old)
+            self._entries[key] = bars
+            self.memory_bars += len(bars)
+            evicted = []
+            while self.max_bars is not None and self.memory_bars > self.max_bars and len(self._entries) > 1:
+                old_key, old_bars = self._entries.popitem(last=False)
+                self.memory_bars -= len(old_bars)
+                evicted.append((old_key, old_bars))
+
+        if self.spill_dir:
+            for old_key, old_bars in evicted:
+                self._write(old_key, old_bars)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.memory_bars = 0
+
+    def _path(self, key: Hashable) -> str:
+        # Keys are tuples of str/datetime, whose repr is stable across runs.
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir or "", f"{digest}{_SPILL_SUFFIX}")
+
+    def _spill_path(self, key: Hashable) -> Optional[str]:
+        if not self.spill_dir:
+            return None
+        path = self._path(key)
+        return path if os.path.exists(path) else None
+
+    def _write(self, key: Hashable, bars: List[OHLCVBar]) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        # Write then rename so a reader never sees a partial file.
+        tmp = f"{path}.{os.getpid()}.{id(bars)}.tmp"
+        with open(tmp, "wb") as f:
+            _dump(bars).tofile(f)
+        os.replace(tmp, path)
+
+        with self._spill_lock:
+            self.spill_bytes += len(bars) * _FIELDS * 8
+            if self.max_spill_bytes is None or self.spill_bytes <= self.max_spill_bytes:
+                return
+            # Other caches may share the directory, so recount it before deleting.
+            files = sorted(self._spill_files())
+            self.spill_bytes = sum(size for _, size, _ in files)
+            for _, size, old_path in files:
+                if self.spill_bytes <= self.max_spill_bytes:
+                    break
+                try:
+                    os.remove(old_path)
+                except FileNotFoundError:
+                    pass
+                self.spill_bytes -= size
+
+    def _spill_files(self) -> List[Tuple[float, int, str]]:
+        """``(mtime, size, path)`` of every spill file in the directory."""
+        files = []
+        for entry in os.scandir(self.spill_dir or "."):
+            if entry.name.endswith(_SPILL_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
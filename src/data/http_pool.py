@@ -0,0 +1,193 @@
+"""Keep-alive HTTP/1.1 connection pool with gzip and per-request timing."""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from threading import BoundedSemaphore, Lock
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying after a pause (rate limit, gateway timeout).
+_RETRY_STATUSES = {429, 504}
+# A pooled connection the server already closed fails like this on first use.
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+@dataclass
+class RequestTiming:
+    path: str
+    status: int
+    reused: bool
+    connect_s: float
+    wait_s: float
+    total_s: float
+    wire_bytes: int
+
+
+class HTTPStatusError(RuntimeError):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+class HTTPPool:
+    """Up to ``size`` persistent connections to one host, shared by all threads.
+
+    Callers block while every connection is busy, so ``size`` should match
+    the number of threads issuing requests. Responses are requested with
+    gzip compression and decoded as JSON; the last ``history`` request
+    timings are kept for ``stats()``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        size: int = 4,
+        timeout: float = 30.0,
+        headers: Optional[Mapping[str, str]] = None,
+        retries: int = 3,
+        retry_wait: float = 3.0,
+        history: int = 512,
+    ):
+        parts = urlsplit(base_url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported base URL: {base_url}")
+        self.base_url = base_url
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.headers = {"Accept": "application/json", "Accept-Encoding": "gzip", **(headers or {})}
+        self.retries = retries
+        self.retry_wait = retry_wait
+
+        self._slots = BoundedSemaphore(size)
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = Lock()
+        self.timings: Deque[RequestTiming] = deque(maxlen=history)
+        self.connections_opened = 0
+        self._closed = False
+
+    def get_json(self, path: str, params: Optional[Mapping[str, Any]] = None) -> Any:
+        url = self._prefix + path + (f"?{urlencode(params)}" if params else "")
+        for attempt in range(self.retries + 1):
+            status, body = self._request("GET", url, path)
+            if status in _RETRY_STATUSES and attempt < self.retries:
+                logger.warning("HTTP %d from %s, retrying in %.1fs", status, path, self.retry_wait)
+                time.sleep(self.retry_wait)
+                continue
+            break
+        if status >= 400:
+            raise HTTPStatusError(status, body.decode("utf-8", "replace")[:200])
+        return json.loads(body)
+
+    def stats(self) -> Dict[str, float]:
+        """Aggregate timings over the retained history."""
+        timings = list(self.timings)
+        if not timings:
+            return {"requests": 0, "connections_opened": self.connections_opened}
+        totals = sorted(t.total_s for t in timings)
+        return {
+            "requests": len(timings),
+            "connections_opened": self.connections_opened,
+            "reused": sum(t.reused for t in timings) / len(timings),
+            "connect_ms": 1000 * sum(t.connect_s for t in timings) / len(timings),
+            "wait_ms": 1000 * sum(t.wait_s for t in timings) / len(timings),
+            "total_ms": 1000 * sum(totals) / len(totals),
+            "p95_ms": 1000 * totals[min(len(totals) - 1, int(0.95 * len(totals)))],
+            "wire_bytes": sum(t.wire_bytes for t in timings),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _request(self, method: str, url: str, path: str) -> Tuple[int, bytes]:
+        with self._slots:
+            conn, reused = self._checkout()
+            try:
+                try:
+                    return self._send(conn, reused, method, url, path)
+                except _STALE_ERRORS:
+                    if not reused:
+                        raise
+                    conn.close()
+                    conn, reused = self._connect(), False
+                    return self._send(conn, reused, method, url, path)
+            except BaseException:
+                conn.close()
+                raise
+
+    def _send(
+        self, conn: http.client.HTTPConnection, reused: bool, method: str, url: str, path: str
+    ) -> Tuple[int, bytes]:
+        began = time.perf_counter()
+        if conn.sock is None:
+            conn.connect()
+        connected = time.perf_counter()
+        conn.request(method, url, headers=self.headers)
+        response = conn.getresponse()
+        answered = time.perf_counter()
+        raw = response.read()
+        body = gzip.decompress(raw) if response.getheader("Content-Encoding", "").lower() == "gzip" else raw
+        finished = time.perf_counter()
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+
+        timing = RequestTiming(
+            path=path,
+            status=response.status,
+            reused=reused,
+            connect_s=connected - began,
+            wait_s=answered - connected,
+            total_s=finished - began,
+            wire_bytes=len(raw),
+        )
+        self.timings.append(timing)
+        logger.debug(
+            "%s %s -> %d in %.1f ms (connect %.1f ms, %s, %d bytes)",
+            method,
+            path,
+            timing.status,
+            1000 * timing.total_s,
+            1000 * timing.connect_s,
+            "reused" if reused else "new",
+            timing.wire_bytes,
+        )
+        return response.status, body
+
+    def _checkout(self) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self.timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
@@ -0,0 +1,359 @@
+"""Bar provider that reads vendor dumps from a local directory (CSV or Parquet)."""
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from threading import Event, Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from data.bar_cache import BarCache
+from data.provider import TIMEFRAME_DELTAS, FetchCancelled, OHLCVBar, parse_timeframe
+
+
+# Accepted directory names per timeframe key, besides the key itself.
+_TIMEFRAME_DIRS = {"1Day": {"day", "1day", "daily"}, "1Hour": {"hour", "1hour", "hourly"}, "1Min": {"minute", "1min", "1minute"}}
+
+_COLUMN_ALIASES = {
+    "timestamp": ("timestamp", "time", "date", "datetime", "t"),
+    "open": ("open", "o"),
+    "high": ("high", "h"),
+    "low": ("low", "l"),
+    "close": ("close", "c"),
+    "volume": ("volume", "v"),
+    "symbol": ("symbol", "ticker", "s"),
+}
+_EXTENSIONS = (".csv", ".parquet")
+# Byte ranges closer than this are read as one span: reading past a short
+# gap of other symbols' rows is cheaper than another seek and read.
+_MAX_RANGE_GAP = 64 * 1024
+
+
+@dataclass
+class _FileEntry:
+    path: str
+    fmt: str
+    mtime: float
+    # Multi-symbol files only: symbol -> (start, end) byte ranges holding its rows (CSV),
+    # and symbol -> spellings as stored in the file (Parquet).
+    ranges: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict)
+    spellings: Dict[str, List[str]] = field(default_factory=dict)
+    header: Optional[List[str]] = None
+
+
+def _add_range(ranges: List[Tuple[int, int]], start: int, end: int) -> None:
+    """Append ``[start, end)`` to sorted ``ranges``, merging it into the last range when close."""
+    if ranges and start - ranges[-1][1] <= _MAX_RANGE_GAP:
+        ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+    else:
+        ranges.append((start, end))
+
+
+def _resolve_columns(names: Iterable[str]) -> Dict[str, str]:
+    lowered = {name.strip().lower(): name for name in names}
+    resolved: Dict[str, str] = {}
+    for column, aliases in _COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lowered:
+                resolved[column] = lowered[alias]
+                break
+    missing = {"timestamp", "open", "high", "low", "close", "volume"} - resolved.keys()
+    if missing:
+        raise ValueError(f"Bar file is missing columns: {', '.join(sorted(missing))}")
+    return resolved
+
+
+def _parse_timestamp(value) -> datetime:
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        text = str(value).strip()
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        ts = datetime.fromisoformat(text)
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=timezone.utc)
+
+
+class LocalBarProvider:
+    """Reads bars from ``root`` without any network access.
+
+    Files live in ``root`` or in a per-timeframe subdirectory (``day``,
+    ``hour``, ``minute``). A file named after a symbol (``AAPL.csv``,
+    ``AAPL.parquet``) holds that symbol's bars; any other file must carry a
+    ``symbol`` column. The directory is indexed once per timeframe: for
+    multi-symbol CSV files the index stores the byte ranges of each symbol's
+    rows so later reads seek straight to them. Parquet files need pyarrow.
+    ``max_cached_bars`` bounds the parsed bars kept in memory; evicted
+    symbols are re-read from their files when requested again.
+    """
+
+    def __init__(self, root: str, max_cached_bars: Optional[int] = None):
+        if not os.path.isdir(root):
+            raise ValueError(f"Bars directory does not exist: {root}")
+        self.root = root
+        # timeframe key -> (directory mtimes, symbol -> files holding its bars)
+        self._index: Dict[str, Tuple[Tuple[float, ...], Dict[str, List[_FileEntry]]]] = {}
+        # (symbol, timeframe key) -> all bars sorted by time, and the source mtimes they were read at
+        self._series = BarCache(max_cached_bars)
+        self._series_mtimes: Dict[Tuple[str, str], Tuple[float, ...]] = {}
+        self._refreshed: Set[Tuple[str, str]] = set()
+        self._lock = Lock()
+
+    @staticmethod
+    def timeframe_from_string(value: str) -> str:
+        return parse_timeframe(value)
+
+    def get_bars(
+        self,
+        symbols: Iterable[str],
+        timeframe: str,
+        start: datetime,
+        end: datetime,
+        cancel_event: Optional[Event] = None,
+    ) -> Dict[str, List[OHLCVBar]]:
+        """Return bars in ``[start, end]`` per symbol, reading each file at most once."""
+        symbols = [s.upper() for s in symbols]
+        series = self._load(symbols, timeframe, cancel_event)
+        out: Dict[str, List[OHLCVBar]] = {}
+        for symbol in symbols:
+            bars = series.get(symbol, [])
+            times = [b.timestamp for b in bars]
+            out[symbol] = bars[bisect_left(times, start) : bisect_right(times, end)]
+        return out
+
+    def reset_live(self, symbols: Iterable[str], timeframe: str) -> None:
+        """Report the symbols as changed on their next ``refresh_bars``, whether or not their files changed."""
+        with self._lock:
+            self._refreshed.difference_update((s.upper(), timeframe) for s in symbols)
+
+    def refresh_bars(
+        self,
+        symbols: Iterable[str],
+        timeframe: str,
+        start: datetime,
+        cancel_event: Optional[Event] = None,
+    ) -> Tuple[Dict[str, List[OHLCVBar]], Set[str]]:
+        """Reload symbols whose files changed on disk; see ``AlpacaDataProvider.refresh_bars``."""
+        symbols = [s.upper() for s in symbols]
+        with self._lock:
+            before = {s: self._series_mtimes.get((s, timeframe)) for s in symbols}
+            first_seen = {s for s in symbols if (s, timeframe) not in self._refreshed}
+        series = self._load(symbols, timeframe, cancel_event)
+        with self._lock:
+            self._refreshed.update((s, timeframe) for s in symbols)
+            # _load records new mtimes whenever a symbol's files changed.
+            changed = first_seen | {s for s in symbols if self._series_mtimes.get((s, timeframe)) != before[s]}
+
+        out: Dict[str, List[OHLCVBar]] = {}
+        for symbol in symbols:
+            bars = series.get(symbol, [])
+            times = [b.timestamp for b in bars]
+            out[symbol] = bars[bisect_left(times, start) :]
+        return out, changed
+
+    def _load(
+        self, symbols: List[str], timeframe: str, cancel_event: Optional[Event] = None
+    ) -> Dict[str, List[OHLCVBar]]:
+        index = self._symbol_index(timeframe)
+        out: Dict[str, List[OHLCVBar]] = {}
+        stale: Dict[str, List[str]] = {}
+
+        with self._lock:
+            for symbol in symbols:
+                entries = index.get(symbol, [])
+                mtimes = tuple(self._mtime(e.path) for e in entries)
+                cached = self._series.get((symbol, timeframe))
+                if cached is not None and self._series_mtimes.get((symbol, timeframe)) == mtimes:
+                    out[symbol] = cached
+                else:
+                    for entry in entries:
+                        stale.setdefault(entry.path, []).append(symbol)
+
+        if not stale:
+            return out
+
+        # One read per file covering every requested symbol it holds.
+        loaded: Dict[str, List[OHLCVBar]] = {}
+        for path, file_symbols in stale.items():
+            if cancel_event is not None and cancel_event.is_set():
+                raise FetchCancelled()
+            entry = next(e for e in index[file_symbols[0]] if e.path == path)
+            for symbol, bars in self._read_file(entry, file_symbols).items():
+                loaded.setdefault(symbol, []).extend(bars)
+
+        delta = TIMEFRAME_DELTAS[timeframe]
+        now_utc = datetime.now(timezone.utc)
+        with self._lock:
+            for symbol in {s for syms in stale.values() for s in syms}:
+                bars = sorted(loaded.get(symbol, []), key=lambda b: b.timestamp)
+                if bars and bars[-1].timestamp + delta > now_utc:
+                    bars = bars[:-1]
+                self._series.put((symbol, timeframe), bars)
+                self._series_mtimes[(symbol, timeframe)] = tuple(self._mtime(e.path) for e in index[symbol])
+                out[symbol] = bars
+        return out
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.stat(path).st_mtime
+        except FileNotFoundError:
+            return -1.0
+
+    def _candidate_dirs(self, timeframe: str) -> List[str]:
+        dirs = []
+        names = _TIMEFRAME_DIRS[timeframe] | {timeframe.lower()}
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            if os.path.isdir(path) and name.lower() in names:
+                dirs.append(path)
+        return dirs or [self.root]
+
+    def _symbol_index(self, timeframe: str) -> Dict[str, List[_FileEntry]]:
+        """Symbol -> files index, rebuilt when files are added, removed or rewritten."""
+        directories = self._candidate_dirs(timeframe)
+        dir_mtimes = tuple(self._mtime(d) for d in directories)
+        with self._lock:
+            cached = self._index.get(timeframe)
+        if cached is not None and cached[0] == dir_mtimes:
+            entries = {id(e): e for files in cached[1].values() for e in files}.values()
+            # Byte ranges of multi-symbol files are only valid for the indexed version.
+            if all(not e.ranges or self._mtime(e.path) == e.mtime for e in entries):
+                return cached[1]
+
+        index: Dict[str, List[_FileEntry]] = {}
+        for directory in directories:
+            for name in sorted(os.listdir(directory)):
+                stem, ext = os.path.splitext(name)
+                if ext.lower() not in _EXTENSIONS:
+                    continue
+                path = os.path.join(directory, name)
+                entry = _FileEntry(path=path, fmt=ext.lower()[1:], mtime=self._mtime(path))
+                try:
+                    symbols = self._index_file(entry)
+                except ValueError as exc:
+                    raise ValueError(f"{path}: {exc}") from exc
+                if symbols is None:
+                    symbols = [stem.upper()]
+                for symbol in symbols:
+                    index.setdefault(symbol, []).append(entry)
+
+        with self._lock:
+            self._index[timeframe] = (dir_mtimes, index)
+        return index
+
+    def _index_file(self, entry: _FileEntry) -> Optional[List[str]]:
+        """Index a multi-symbol file; returns ``None`` for single-symbol files."""
+        if entry.fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            schema = pq.read_schema(entry.path)
+            columns = _resolve_columns(schema.names)
+            if "symbol" not in columns:
+                return None
+            for value in pq.read_table(entry.path, columns=[columns["symbol"]]).column(0).unique().to_pylist():
+                entry.spellings.setdefault(str(value).upper(), []).append(value)
+            return list(entry.spellings)
+
+        with open(entry.path, "rb") as f:
+            header_line = f.readline()
+            header = next(csv.reader([header_line.decode("utf-8-sig")]))
+            columns = _resolve_columns(header)
+            if "symbol" not in columns:
+                return None
+            entry.header = header
+            symbol_idx = header.index(columns["symbol"])
+
+            offset = len(header_line)
+            current: Optional[str] = None
+            run_start = offset
+            for line in f:
+                symbol = next(csv.reader([line.decode("utf-8")]))[symbol_idx].strip().upper() if line.strip() else current
+                if symbol != current:
+                    if current is not None:
+                        _add_range(entry.ranges.setdefault(current, []), run_start, offset)
+                    current, run_start = symbol, offset
+                offset += len(line)
+            if current is not None:
+                _add_range(entry.ranges.setdefault(current, []), run_start, offset)
+        return list(entry.ranges)
+
+    def _read_file(self, entry: _FileEntry, symbols: List[str]) -> Dict[str, List[OHLCVBar]]:
+        if entry.fmt == "parquet":
+            return self._read_parquet(entry, symbols)
+        return self._read_csv(entry, symbols)
+
+    def _read_csv(self, entry: _FileEntry, symbols: List[str]) -> Dict[str, List[OHLCVBar]]:
+        out: Dict[str, List[OHLCVBar]] = {}
+        with open(entry.path, "rb") as f:
+            if entry.header is None:
+                reader = csv.reader(io.TextIOWrapper(f, encoding="utf-8-sig", newline=""))
+                header = next(reader)
+                out[symbols[0]] = self._rows_to_bars(reader, _resolve_columns(header), header)
+                return out
+
+            # Merged ranges may span other symbols' rows (e.g. a file ordered by
+            # time), so rows are picked by their symbol column.
+            columns = _resolve_columns(entry.header)
+            symbol_idx = entry.header.index(columns["symbol"])
+            spans: List[Tuple[int, int]] = []
+            for start, end in sorted(r for symbol in symbols for r in entry.ranges.get(symbol, [])):
+                _add_range(spans, start, end)
+
+            rows_by_symbol: Dict[str, list] = {symbol: [] for symbol in symbols}
+            for start, end in spans:
+                f.seek(start)
+                for row in csv.reader(io.StringIO(f.read(end - start).decode("utf-8"))):
+                    rows = rows_by_symbol.get(row[symbol_idx].strip().upper()) if row else None
+                    if rows is not None:
+                        rows.append(row)
+            for symbol, rows in rows_by_symbol.items():
+                out[symbol] = self._rows_to_bars(rows, columns, entry.header)
+        return out
+
+    @staticmethod
+    def _rows_to_bars(rows, columns: Dict[str, str], header: List[str]) -> List[OHLCVBar]:
+        ts_i, o_i, h_i, l_i, c_i, v_i = (
+            header.index(columns[name]) for name in ("timestamp", "open", "high", "low", "close", "volume")
+        )
+        return [
+            OHLCVBar(
+                timestamp=_parse_timestamp(row[ts_i]),
+                open=float(row[o_i]),
+                high=float(row[h_i]),
+                low=float(row[l_i]),
+                close=float(row[c_i]),
+                volume=float(row[v_i]),
+            )
+            for row in rows
+            if row
+        ]
+
+    @staticmethod
+    def _read_parquet(entry: _FileEntry, symbols: List[str]) -> Dict[str, List[OHLCVBar]]:
+        import pyarrow.parquet as pq
+
+        columns = _resolve_columns(pq.read_schema(entry.path).names)
+        names = [columns[c] for c in ("timestamp", "open", "high", "low", "close", "volume")]
+        if "symbol" in columns:
+            table = pq.read_table(
+                entry.path,
+                columns=names + [columns["symbol"]],
+                # Filter on the spellings stored in the file; lookups are upper-cased.
+                filters=[(columns["symbol"], "in", [v for s in symbols for v in entry.spellings.get(s, [s])])],
+            )
+            keys = [str(s).upper() for s in table.column(columns["symbol"]).to_pylist()]
+        else:
+            table = pq.read_table(entry.path, columns=names)
+            keys = [symbols[0]] * table.num_rows
+
+        ts, opens, highs, lows, closes, volumes = (table.column(name).to_pylist() for name in names)
+        out: Dict[str, List[OHLCVBar]] = {s: [] for s in symbols}
+        for i, key in enumerate(keys):
+            if key in out:
+                out[key].append(OHLCVBar(_parse_timestamp(ts[i]), opens[i], highs[i], lows[i], closes[i], volumes[i]))
+        return out
@@ -0,0 +1,80 @@
+"""Bar record and the provider interface the screener engine depends on."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Event
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Set, Tuple
+
+
+# UI timeframe names -> timeframe keys shared by the bundled providers, and each key's bar length.
+TIMEFRAMES = {"day": "1Day", "hour": "1Hour", "minute": "1Min"}
+TIMEFRAME_DELTAS = {"1Day": timedelta(days=1), "1Hour": timedelta(hours=1), "1Min": timedelta(minutes=1)}
+
+
+@dataclass
+class OHLCVBar:
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class FetchCancelled(Exception):
+    """Raised by a provider when ``cancel_event`` is set while bars are being fetched.
+
+    Data already received stays in the provider's cache, so a later request
+    for the same range only fetches what is still missing.
+    """
+
+
+def parse_timeframe(value: str) -> str:
+    """Timeframe key for a UI name (``Day``, ``Hour``, ``Minute``)."""
+    key = TIMEFRAMES.get(value.lower().strip())
+    if key is None:
+        raise ValueError(f"Unsupported timeframe: {value}")
+    return key
+
+
+class BarProvider(Protocol):
+    """Source of completed OHLCV bars.
+
+    ``timeframe_from_string`` maps the UI names ``Day``/``Hour``/``Minute`` to
+    whatever timeframe object the provider's ``get_bars`` accepts; ``str()``
+    of that object must identify the timeframe (it is used in cache keys).
+    Providers check ``cancel_event`` while fetching and raise
+    ``FetchCancelled`` once it is set.
+    """
+
+    def timeframe_from_string(self, value: str) -> Any: ...
+
+    def get_bars(
+        self,
+        symbols: Iterable[str],
+        timeframe: Any,
+        start: datetime,
+        end: datetime,
+        cancel_event: Optional[Event] = None,
+    ) -> Dict[str, List[OHLCVBar]]: ...
+
+
+class LiveBarProvider(BarProvider, Protocol):
+    """Provider that can also extend live series for scheduled rescans.
+
+    ``refresh_bars`` returns every symbol's bars plus those that changed
+    since the previous call; ``reset_live`` makes the next call report the
+    given symbols as changed, as at the start of a new session.
+    """
+
+    def reset_live(self, symbols: Iterable[str], timeframe: Any) -> None: ...
+
+    def refresh_bars(
+        self,
+        symbols: Iterable[str],
+        timeframe: Any,
+        start: datetime,
+        cancel_event: Optional[Event] = None,
+    ) -> Tuple[Dict[str, List[OHLCVBar]], Set[str]]: ...
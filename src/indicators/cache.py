@@ -0,0 +1,82 @@
+"""Size-bounded memoization of indicator outputs."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Callable, Hashable, Sequence, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+# Approximate resident bytes per series value: the list slot plus a float object.
+_VALUE_BYTES = 32
+
+# (symbol, timeframe, first bar time, last bar time, bar count)
+SeriesFingerprint = Tuple[str, str, datetime, datetime, int]
+
+
+class IndicatorCache:
+    """LRU cache of indicator series keyed by series fingerprint and parameters.
+
+    The fingerprint identifies the input bars, so rescans over the same data
+    with different filter settings reuse the computed ``ema``/``sma``/MACD
+    series instead of recomputing them.
+
+    The bound is on the estimated size of the cached values rather than the
+    entry count, since one minute-bar series can outweigh thousands of daily
+    ones. The default keeps a few thousand symbols of daily scans resident.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Tuple[object, int]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = compute()
+        size = _estimated_size(value)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            # The newest entry always stays, even when it alone exceeds the bound.
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+def _estimated_size(value: object) -> int:
+    """Bytes held by a series, or by a tuple of series (multi-output indicators)."""
+    if isinstance(value, tuple):
+        return sum(_estimated_size(v) for v in value)
+    if isinstance(value, Sequence) and not isinstance(value, str):
+        return len(value) * _VALUE_BYTES
+    return _VALUE_BYTES
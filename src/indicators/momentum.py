@@ -0,0 +1,26 @@
+"""Momentum oscillators."""
+
+from __future__ import annotations
+
+from operator import sub
+from typing import Iterable
+
+from indicators.moving_averages import NumberList, wilder
+
+
+def rsi(closes: Iterable[float], period: int = 14) -> NumberList:
+    """Wilder's RSI in ``[0, 100]``; the first value needs ``period + 1`` closes."""
+    if period <= 0:
+        raise ValueError("period must be > 0")
+
+    prices = list(closes)
+    if len(prices) <= period:
+        return [None] * len(prices)
+
+    changes = list(map(sub, prices[1:], prices[:-1]))
+    avg_gain = wilder([c if c > 0 else 0.0 for c in changes], period)
+    avg_loss = wilder([-c if c < 0 else 0.0 for c in changes], period)
+    return [None] + [
+        None if g is None else 100.0 if l == 0 else 100.0 - 100.0 / (1.0 + g / l)
+        for g, l in zip(avg_gain, avg_loss)
+    ]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from itertools import accumulate
+from math import sqrt
 from typing import Iterable, List, Optional
 
 
@@ -28,6 +30,44 @@ def sma(values: Iterable[float], period: int) -> NumberList:
     return out
 
 
+def rolling_std(values: Iterable[float], period: int) -> NumberList:
+    """Population standard deviation over a trailing window, ``None`` until full."""
+    if period <= 0:
+        raise ValueError("period must be > 0")
+
+    data = list(values)
+    if len(data) < period:
+        return [None] * len(data)
+
+    # Windowed Welford: slide the mean and sum of squared deviations one bar
+    # at a time. Unlike prefix sums of x and x^2 this does not cancel
+    # catastrophically when prices are large relative to their spread.
+    mean = sum(data[:period]) / period
+    m2 = sum((x - mean) ** 2 for x in data[:period])
+    out: NumberList = [None] * (period - 1) + [sqrt(m2 / period)]
+    for old, new in zip(data, data[period:]):
+        delta = new - old
+        next_mean = mean + delta / period
+        m2 = max(m2 + delta * (new - next_mean + old - mean), 0.0)
+        mean = next_mean
+        out.append(sqrt(m2 / period))
+    return out
+
+
+def wilder(values: Iterable[float], period: int) -> NumberList:
+    """Wilder's smoothing (RMA): SMA seed, then ``prev + (x - prev) / period``."""
+    if period <= 0:
+        raise ValueError("period must be > 0")
+
+    data = list(values)
+    if len(data) < period:
+        return [None] * len(data)
+
+    seed = sum(data[:period]) / period
+    smoothed = accumulate(data[period:], lambda prev, x: prev + (x - prev) / period, initial=seed)
+    return [None] * (period - 1) + list(smoothed)
+
+
 def detect_ma_crossover_age(
     closes: Iterable[float],
     fast_period: int,
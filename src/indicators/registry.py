@@ -0,0 +1,94 @@
+"""Named indicators over columnar OHLCV data, with declared inputs and warm-up."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Mapping, Sequence, Tuple
+
+from indicators.macd import ema, macd_series
+from indicators.momentum import rsi
+from indicators.moving_averages import sma
+from indicators.volatility import atr, bollinger_bands
+
+
+# Column name -> values, oldest first (``open``, ``high``, ``low``, ``close``, ``volume``).
+Columns = Mapping[str, Sequence[float]]
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """One registered computation.
+
+    ``compute(columns, *params)`` returns one series, or a tuple of series
+    when ``outputs`` names several. ``warmup(*params)`` is the number of bars
+    needed before the first non-``None`` value.
+    """
+
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[..., Any]
+    warmup: Callable[..., int]
+    outputs: Tuple[str, ...] = ("value",)
+
+
+_INDICATORS: Dict[str, Indicator] = {}
+
+
+def register(indicator: Indicator) -> Indicator:
+    unknown = set(indicator.inputs) - set(OHLCV_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown input columns: {', '.join(sorted(unknown))}")
+    _INDICATORS[indicator.name] = indicator
+    return indicator
+
+
+def get_indicator(name: str) -> Indicator:
+    indicator = _INDICATORS.get(name)
+    if indicator is None:
+        raise ValueError(f"Unsupported series kind: {name}")
+    return indicator
+
+
+def indicator_names() -> Tuple[str, ...]:
+    return tuple(_INDICATORS)
+
+
+def columns_from_bars(bars: Iterable[Any], names: Iterable[str] = OHLCV_COLUMNS) -> Dict[str, list]:
+    """Split bar records (anything with OHLCV attributes) into per-column lists."""
+    rows = list(bars)
+    return {name: [getattr(bar, name) for bar in rows] for name in names}
+
+
+register(Indicator("close", ("close",), lambda c: c["close"], lambda: 1))
+register(Indicator("volume", ("volume",), lambda c: c["volume"], lambda: 1))
+register(Indicator("sma", ("close",), lambda c, period: sma(c["close"], period), lambda period: period))
+register(Indicator("ema", ("close",), lambda c, period: ema(c["close"], period), lambda period: period))
+register(
+    Indicator(
+        "macd",
+        ("close",),
+        lambda c, fast, slow, signal: macd_series(c["close"], fast, slow, signal),
+        lambda fast, slow, signal: slow + signal - 1,
+        ("line", "signal", "histogram"),
+    )
+)
+register(Indicator("rsi", ("close",), lambda c, period: rsi(c["close"], period), lambda period: period + 1))
+register(
+    Indicator(
+        "bollinger",
+        ("close",),
+        lambda c, period, width: bollinger_bands(c["close"], period, width),
+        lambda period, width: period,
+        ("middle", "upper", "lower"),
+    )
+)
+register(
+    Indicator(
+        "atr",
+        ("high", "low", "close"),
+        lambda c, period: atr(c["high"], c["low"], c["close"], period),
+        lambda period: period,
+    )
+)
+register(Indicator("volume_sma", ("volume",), lambda c, period: sma(c["volume"], period), lambda period: period))
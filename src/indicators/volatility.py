@@ -0,0 +1,34 @@
+"""Volatility bands and ranges."""
+
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+from indicators.moving_averages import NumberList, rolling_std, sma, wilder
+
+
+def bollinger_bands(
+    closes: Sequence[float],
+    period: int = 20,
+    width: float = 2.0,
+) -> Tuple[NumberList, NumberList, NumberList]:
+    """Return middle (SMA), upper and lower bands ``width`` standard deviations apart."""
+    middle = sma(closes, period)
+    std = rolling_std(closes, period)
+    upper = [None if m is None else m + width * d for m, d in zip(middle, std)]
+    lower = [None if m is None else m - width * d for m, d in zip(middle, std)]
+    return middle, upper, lower
+
+
+def true_range(high: Sequence[float], low: Sequence[float], close: Sequence[float]) -> List[float]:
+    """True range per bar; the first bar has no previous close and uses ``high - low``."""
+    if not close:
+        return []
+    return [high[0] - low[0]] + [
+        max(h - l, abs(h - pc), abs(l - pc)) for h, l, pc in zip(high[1:], low[1:], close[:-1])
+    ]
+
+
+def atr(high: Sequence[float], low: Sequence[float], close: Sequence[float], period: int = 14) -> NumberList:
+    """Average true range with Wilder's smoothing."""
+    return wilder(true_range(high, low, close), period)
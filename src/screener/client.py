@@ -0,0 +1,126 @@
+"""Thin client for the local scan service (``src/server.py``)."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import socket
+from threading import Event, Thread
+from typing import Any, Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from screener.engine import ScanConfig, ScanResult
+from screener.service import config_to_dict, result_from_dict
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class ScanServiceError(RuntimeError):
+    pass
+
+
+class ScanClient:
+    """Submits scans to a scan service at ``http://127.0.0.1:PORT`` or ``unix:///path.sock``.
+
+    ``run_scan`` has the same signature and return value as
+    ``ScreenerEngine.run_scan``, so callers can swap one for the other.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "unix"}:
+            raise ValueError(f"Unsupported scan service URL: {url}")
+        self.url = url
+        self.timeout = timeout
+        self._parts = parts
+
+    def _connection(self, timeout: Optional[float]) -> http.client.HTTPConnection:
+        if self._parts.scheme == "unix":
+            return _UnixHTTPConnection(self._parts.path, timeout=timeout)
+        return http.client.HTTPConnection(self._parts.hostname or "127.0.0.1", self._parts.port or 8765, timeout=timeout)
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        conn = self._connection(self.timeout)
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = json.loads(response.read() or b"{}")
+            if response.status >= 400:
+                raise ScanServiceError(data.get("error", f"HTTP {response.status}"))
+            return data
+        finally:
+            conn.close()
+
+    def submit(self, config: ScanConfig) -> str:
+        return self._request("POST", "/scans", config_to_dict(config))["id"]
+
+    def cancel(self, job_id: str) -> None:
+        self._request("DELETE", f"/scans/{job_id}")
+
+    def events(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield job events as the service streams them (no read timeout)."""
+        conn = self._connection(None)
+        try:
+            conn.request("GET", f"/scans/{job_id}/events")
+            response = conn.getresponse()
+            if response.status >= 400:
+                raise ScanServiceError(json.loads(response.read() or b"{}").get("error", f"HTTP {response.status}"))
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+    def run_scan(
+        self,
+        config: ScanConfig,
+        cancel_event: Event,
+        progress_cb: Callable[[int, int, int], None],
+        result_cb: Optional[Callable[[ScanResult], None]] = None,
+    ) -> tuple[list[ScanResult], list[str], list[str]]:
+        job_id = self.submit(config)
+        finished = Event()
+
+        def forward_cancel() -> None:
+            while not finished.wait(0.2):
+                if cancel_event.is_set():
+                    try:
+                        self.cancel(job_id)
+                    except (OSError, ScanServiceError):
+                        pass
+                    return
+
+        watcher = Thread(target=forward_cancel, daemon=True)
+        watcher.start()
+
+        results: list[ScanResult] = []
+        try:
+            for event in self.events(job_id):
+                kind = event["type"]
+                if kind == "progress":
+                    progress_cb(event["done"], event["total"], event["matched"])
+                elif kind == "result":
+                    result = result_from_dict(event["result"])
+                    results.append(result)
+                    if result_cb is not None:
+                        result_cb(result)
+                elif kind == "error":
+                    raise ScanServiceError(event["message"])
+                elif kind == "done":
+                    return results, event["invalid"], event["warnings"]
+        finally:
+            finished.set()
+        raise ScanServiceError("Scan service closed the stream before the scan finished")
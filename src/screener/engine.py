@@ -2,19 +2,54 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
+import math
 import re
 from threading import Event
-from typing import Callable, Iterable, List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional
 
-from data.alpaca_client import AlpacaDataProvider, build_date_range
-from indicators.macd import detect_macd_crossover_age, macd_series
-from indicators.moving_averages import detect_ma_crossover_age, sma
+from data.alpaca_client import build_date_range
+from data.provider import BarProvider, FetchCancelled, OHLCVBar
+from indicators.cache import IndicatorCache, SeriesFingerprint
+from indicators.registry import Columns, columns_from_bars
+from screener.ranking import TopKCollector
+from screener.streaming import BAR_BYTES, Chunk, MemoryBudget, Prefetcher
+from screener.rules import (
+    Above,
+    Below,
+    Condition,
+    CrossAbove,
+    CrossBelow,
+    EvaluationPlan,
+    PlanContext,
+    Series,
+    Signal,
+    exp_moving_average,
+    macd_histogram,
+    macd_line,
+    macd_signal,
+    moving_average,
+    relative_strength_index,
+    volume_average,
+)
+
+if TYPE_CHECKING:
+    from screener.parallel import ParallelEvaluator
 
 
 SYMBOL_RE = re.compile(r"^[A-Z][A-Z0-9.\-]{0,9}$")
 
+# Rough completed bars per calendar day, used to widen lookbacks too short for indicator warm-up.
+_BARS_PER_CALENDAR_DAY = {"day": 5 / 7, "hour": 7 * 5 / 7, "minute": 390 * 5 / 7}
+# Symbols per provider request.
+_CHUNK_SIZE = 25
+# Below this many symbols a process pool costs more than it saves, and the
+# serial path can use the indicator cache, so scans stay in-process.
+PARALLEL_MIN_SYMBOLS = 500
+# Closes kept per result in out-of-core scans (enough for the sparkline and exports).
+_STREAMED_SERIES_BARS = 1000
+
 
 @dataclass
 class ScanConfig:
@@ -33,6 +68,32 @@ class ScanConfig:
     ma_fast: int = 20
     ma_slow: int = 200
 
+    use_ema: bool = False
+    ema_fast: int = 12
+    ema_slow: int = 26
+
+    # Optional filters; every built-in signal must also pass them.
+    rsi_period: int = 14
+    rsi_min: Optional[float] = None
+    rsi_max: Optional[float] = None
+    volume_period: int = 20
+    min_avg_volume: Optional[float] = None
+
+    # Ranked mode: keep only the best ``top_k`` matches by ``rank_by``
+    # (a ``screener.ranking.RANK_SCORES`` name) instead of every match.
+    top_k: Optional[int] = None
+    rank_by: str = "age"
+
+    # Out-of-core mode: stream symbols through fetch -> evaluate -> discard,
+    # holding at most about this many MB of fetched bars (see screener.streaming).
+    memory_limit_mb: Optional[float] = None
+
+    # Custom rules; when set they replace the built-in MACD/MA crossover signals.
+    signals: Optional[List[Signal]] = None
+
+    # Keep every evaluated indicator series on results (for exporting them).
+    include_series: bool = False
+
 
 @dataclass
 class ScanResult:
@@ -47,6 +108,8 @@ class ScanResult:
     slow_ma: Optional[float]
     last_bar_time: str
     close_series: List[float]
+    # Evaluated indicator series by ``rules.series_name``; only with ``ScanConfig.include_series``.
+    indicator_series: Dict[str, List[Optional[float]]] = field(default_factory=dict)
 
 
 def parse_symbols(raw_text: str) -> tuple[list[str], list[str]]:
@@ -65,73 +128,439 @@ def parse_symbols(raw_text: str) -> tuple[list[str], list[str]]:
     return deduped, invalid
 
 
+def build_signals(config: ScanConfig) -> list[Signal]:
+    """Return ``config.signals`` or the built-in crossover signals it enables."""
+    if config.signals is not None:
+        return list(config.signals)
+
+    signals: list[Signal] = []
+    if config.use_macd:
+        line = macd_line(config.macd_fast, config.macd_slow, config.macd_signal)
+        signal = macd_signal(config.macd_fast, config.macd_slow, config.macd_signal)
+        signals.append(Signal("MACD Bull", CrossAbove(line, signal, config.within_bars)))
+        signals.append(Signal("MACD Bear", CrossBelow(line, signal, config.within_bars)))
+
+    if config.use_ma:
+        fast = moving_average(config.ma_fast)
+        slow = moving_average(config.ma_slow)
+        signals.append(Signal("MA Bull", CrossAbove(fast, slow, config.within_bars)))
+        signals.append(Signal("MA Bear", CrossBelow(fast, slow, config.within_bars)))
+
+    if config.use_ema:
+        fast = exp_moving_average(config.ema_fast)
+        slow = exp_moving_average(config.ema_slow)
+        signals.append(Signal("EMA Bull", CrossAbove(fast, slow, config.within_bars)))
+        signals.append(Signal("EMA Bear", CrossBelow(fast, slow, config.within_bars)))
+
+    filters = _filters(config)
+    if filters:
+        for i, signal in enumerate(signals):
+            condition = signal.condition
+            for extra in filters:
+                condition = condition & extra
+            signals[i] = Signal(signal.label, condition)
+    return signals
+
+
+def _filters(config: ScanConfig) -> list[Condition]:
+    rsi = relative_strength_index(config.rsi_period)
+    filters: list[Condition] = []
+    if config.rsi_min is not None:
+        filters.append(Above(rsi, config.rsi_min))
+    if config.rsi_max is not None:
+        filters.append(Below(rsi, config.rsi_max))
+    if config.min_avg_volume is not None:
+        filters.append(Above(volume_average(config.volume_period), config.min_avg_volume))
+    return filters
+
+
+def has_signals(config: ScanConfig) -> bool:
+    return config.signals is not None or config.use_macd or config.use_ma or config.use_ema
+
+
+def lookback_days(config: ScanConfig, min_bars: int) -> int:
+    """``config.lookback_days``, widened when it cannot cover ``min_bars`` of warm-up."""
+    per_day = _BARS_PER_CALENDAR_DAY.get(config.timeframe.lower(), _BARS_PER_CALENDAR_DAY["day"])
+    # build_date_range requests twice the lookback; keep 10% spare for holidays.
+    return max(config.lookback_days, math.ceil(min_bars * 1.1 / per_day / 2))
+
+
+def _display_series(config: ScanConfig) -> tuple[Series, ...]:
+    """Series shown in the result columns: MACD line, signal, histogram, fast MA, slow MA."""
+    params = (config.macd_fast, config.macd_slow, config.macd_signal)
+    return (
+        macd_line(*params),
+        macd_signal(*params),
+        macd_histogram(*params),
+        moving_average(config.ma_fast),
+        moving_average(config.ma_slow),
+    )
+
+
+def _indicator_series(ctx: PlanContext, series_bars: Optional[int] = None) -> Dict[str, List[Optional[float]]]:
+    """Computed indicator series, trimmed like ``close_series`` to the last ``series_bars`` values."""
+    named = ctx.named_series()
+    if series_bars is None:
+        return named
+    return {name: values[-series_bars:] for name, values in named.items()}
+
+
+def compile_plan(config: ScanConfig) -> EvaluationPlan:
+    return EvaluationPlan(build_signals(config), extra_series=_display_series(config))
+
+
 class ScreenerEngine:
     """Handles scan lifecycle and signal matching."""
 
-    def __init__(self, provider: AlpacaDataProvider):
+    def __init__(
+        self,
+        provider: BarProvider,
+        indicator_cache: Optional[IndicatorCache] = None,
+        evaluator: Optional[ParallelEvaluator] = None,
+        parallel_min_symbols: int = PARALLEL_MIN_SYMBOLS,
+    ):
         self.provider = provider
+        self.indicator_cache = indicator_cache
+        # When set, run_scan evaluates scans of at least ``parallel_min_symbols``
+        # symbols on its process pool. Workers compute every series afresh:
+        # the indicator cache is not consulted in that mode.
+        self.evaluator = evaluator
+        self.parallel_min_symbols = parallel_min_symbols
 
     def run_scan(
         self,
         config: ScanConfig,
         cancel_event: Event,
         progress_cb: Callable[[int, int, int], None],
+        result_cb: Optional[Callable[[ScanResult], None]] = None,
+        collect: bool = True,
     ) -> tuple[list[ScanResult], list[str], list[str]]:
+        """Scan ``config``; ``result_cb``, if given, receives each match as soon as it is found.
+
+        With ``collect=False`` matches are only passed to ``result_cb`` and
+        the returned list is empty, so nothing holds on to them.
+
+        With ``config.top_k`` set, only the best ``top_k`` matches are kept
+        while streaming and are returned best first; ``result_cb`` then
+        receives just those, in rank order, once the scan ends.
+
+        With ``config.memory_limit_mb`` set, symbols stream through
+        fetch -> evaluate -> discard: fetching runs ahead on a background
+        thread only while the fetched bars not yet evaluated fit the limit,
+        and results keep just the last ``_STREAMED_SERIES_BARS`` closes.
+
+        Setting ``cancel_event`` interrupts the scan, including a fetch in
+        flight; matches evaluated so far are still returned.
+        """
         symbols, invalid = parse_symbols(config.symbols_text)
         if not symbols:
             return [], invalid, []
 
         timeframe = self.provider.timeframe_from_string(config.timeframe)
-        start, end = build_date_range(config.lookback_days, config.end_date)
+        plan = compile_plan(config)
+        min_bars = max(config.ma_slow, config.macd_slow + config.macd_signal + 3, plan.min_bars)
+        start, end = build_date_range(lookback_days(config, min_bars), config.end_date)
 
         results: list[ScanResult] = []
+        collector = TopKCollector(config.top_k, config.rank_by) if config.top_k else None
+        if collector is not None:
+            keep = collector.add
+            matched: Callable[[], int] = lambda: collector.seen
+        else:
+            found = 0
+
+            def keep(result: ScanResult) -> None:
+                nonlocal found
+                found += 1
+                if collect:
+                    results.append(result)
+                if result_cb is not None:
+                    result_cb(result)
+
+            matched = lambda: found
+
+        budget = MemoryBudget(int(config.memory_limit_mb * 1024 * 1024)) if config.memory_limit_mb else None
+        chunks = self._fetch_chunks(symbols, timeframe, start, end, config, min_bars, cancel_event, budget)
+        try:
+            if self.evaluator is not None and len(symbols) >= self.parallel_min_symbols:
+                warnings = self._run_parallel_scan(
+                    symbols, chunks, config, plan, min_bars, cancel_event, budget, progress_cb, keep, matched
+                )
+            else:
+                warnings = self._run_serial_scan(
+                    symbols, chunks, timeframe, config, plan, min_bars, cancel_event, budget, progress_cb, keep, matched
+                )
+        finally:
+            chunks.close()
+
+        if collector is not None:
+            results = collector.results()
+            if result_cb is not None:
+                for result in results:
+                    result_cb(result)
+        return results, invalid, warnings
+
+    def _fetch_chunks(
+        self,
+        symbols: list[str],
+        timeframe,
+        start,
+        end,
+        config: ScanConfig,
+        min_bars: int,
+        cancel_event: Event,
+        budget: Optional[MemoryBudget],
+    ) -> Iterator[Optional[Chunk]]:
+        """Yield ``(chunk, bars_by_symbol, bytes)`` until done or cancelled.
+
+        Without ``budget`` chunks are fetched on demand. With one, they are
+        sized to the budget and fetched ahead on a background thread that
+        waits whenever the chunks not yet released would exceed it.
+        """
+
+        def fetch(chunk: list[str]) -> dict[str, list[OHLCVBar]]:
+            return self.provider.get_bars(chunk, timeframe, start, end, cancel_event=cancel_event)
+
+        if budget is None:
+            for start_idx in range(0, len(symbols), _CHUNK_SIZE):
+                if cancel_event.is_set():
+                    return
+                chunk = symbols[start_idx : start_idx + _CHUNK_SIZE]
+                try:
+                    bars_by_symbol = fetch(chunk)
+                except FetchCancelled:
+                    return
+                yield chunk, bars_by_symbol, 0
+            return
+
+        per_day = _BARS_PER_CALENDAR_DAY.get(config.timeframe.lower(), _BARS_PER_CALENDAR_DAY["day"])
+        # build_date_range requests twice the lookback.
+        symbol_bytes = max(int(2 * lookback_days(config, min_bars) * per_day * BAR_BYTES), 1)
+        # A quarter of the budget per chunk leaves room to fetch ahead while one is evaluated.
+        chunk_size = max(1, min(_CHUNK_SIZE, budget.limit // 4 // symbol_bytes))
+        chunks = [symbols[i : i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+        prefetcher = Prefetcher(fetch, chunks, budget, lambda chunk: len(chunk) * symbol_bytes, cancel_event)
+        try:
+            yield from prefetcher
+        finally:
+            prefetcher.close()
+
+    def _run_serial_scan(
+        self,
+        symbols: list[str],
+        chunks: Iterator[Optional[Chunk]],
+        timeframe,
+        config: ScanConfig,
+        plan: EvaluationPlan,
+        min_bars: int,
+        cancel_event: Event,
+        budget: Optional[MemoryBudget],
+        progress_cb: Callable[[int, int, int], None],
+        keep: Callable[[ScanResult], object],
+        matched: Callable[[], int],
+    ) -> list[str]:
+        """Evaluate each fetched symbol in this thread; returns warnings."""
         warnings: list[str] = []
-        chunk_size = 25
+        series_bars = _STREAMED_SERIES_BARS if budget is not None else None
+        done = 0
 
-        for start_idx in range(0, len(symbols), chunk_size):
+        for item in chunks:
             if cancel_event.is_set():
                 break
+            if item is None:
+                continue
 
-            chunk = symbols[start_idx : start_idx + chunk_size]
-            bars_by_symbol = self.provider.get_bars(chunk, timeframe, start, end)
-
+            chunk, bars_by_symbol, nbytes = item
             for symbol in chunk:
                 if cancel_event.is_set():
                     break
 
-                bars = bars_by_symbol.get(symbol, [])
-                closes = [b.close for b in bars]
-                if len(closes) < max(config.ma_slow, config.macd_slow + config.macd_signal + 3):
+                symbol_matches = self._scan_bars(
+                    symbol, bars_by_symbol.get(symbol, []), str(timeframe), config, plan, min_bars, series_bars
+                )
+                if symbol_matches is None:
                     warnings.append(f"{symbol}: not enough bars for selected indicators")
-                    progress_cb(min(start_idx + chunk.index(symbol) + 1, len(symbols)), len(symbols), len(results))
-                    continue
+                else:
+                    for result in symbol_matches:
+                        keep(result)
+                done += 1
+                progress_cb(min(done, len(symbols)), len(symbols), matched())
+
+            if budget is not None:
+                del bars_by_symbol, item
+                budget.release(nbytes)
+
+        return warnings
 
+    def _run_parallel_scan(
+        self,
+        symbols: list[str],
+        chunks: Iterator[Optional[Chunk]],
+        config: ScanConfig,
+        plan: EvaluationPlan,
+        min_bars: int,
+        cancel_event: Event,
+        budget: Optional[MemoryBudget],
+        progress_cb: Callable[[int, int, int], None],
+        keep: Callable[[ScanResult], object],
+        matched: Callable[[], int],
+    ) -> list[str]:
+        """Evaluate batches of fetched symbols on the process pool; returns warnings."""
+        evaluator = self.evaluator
+        warnings: list[str] = []
+        series_bars = _STREAMED_SERIES_BARS if budget is not None else None
+        done = 0
+        pending: dict[str, list[OHLCVBar]] = {}
+        pending_bytes = 0
+
+        def flush() -> None:
+            nonlocal done, pending_bytes
+            batch_done = done
+
+            def on_progress(finished: int) -> None:
+                progress_cb(min(batch_done + finished, len(symbols)), len(symbols), matched())
+
+            columns_by_symbol = [(symbol, columns_from_bars(bars, plan.columns)) for symbol, bars in pending.items()]
+            records = evaluator.evaluate(plan, columns_by_symbol, _display_series(config), cancel_event, on_progress)
+            del columns_by_symbol
+            for symbol, matches, lasts in records:
+                bars = pending[symbol]
                 last = bars[-1]
-                macd_line, signal_line, histogram = macd_series(
-                    closes,
-                    config.macd_fast,
-                    config.macd_slow,
-                    config.macd_signal,
+                closes = [b.close for b in (bars if series_bars is None else bars[-series_bars:])]
+                indicator_series = None
+                if matches and config.include_series:
+                    # Workers return only the latest values; recompute the full series
+                    # here, for the (usually few) matching symbols only.
+                    _, ctx = plan.evaluate(columns_from_bars(bars, plan.columns))
+                    indicator_series = _indicator_series(ctx, series_bars)
+                symbol_matches = self._build_results(
+                    symbol, closes, last.close, last.timestamp.isoformat(), matches, lasts, indicator_series
                 )
-                fast_sma = sma(closes, config.ma_fast)
-                slow_sma = sma(closes, config.ma_slow)
-
-                symbol_matches = self._evaluate_symbol(
-                    symbol=symbol,
-                    closes=closes,
-                    last_close=last.close,
-                    last_bar_time=last.timestamp.isoformat(),
-                    config=config,
-                    macd_line=macd_line,
-                    signal_line=signal_line,
-                    histogram=histogram,
-                    fast_sma=fast_sma,
-                    slow_sma=slow_sma,
-                )
-                results.extend(symbol_matches)
-                progress_cb(min(start_idx + chunk.index(symbol) + 1, len(symbols)), len(symbols), len(results))
+                for result in symbol_matches:
+                    keep(result)
+            done += len(pending)
+            pending.clear()
+            if budget is not None:
+                budget.release(pending_bytes)
+            pending_bytes = 0
+            progress_cb(min(done, len(symbols)), len(symbols), matched())
 
-        return results, invalid, warnings
+        for item in chunks:
+            if cancel_event.is_set():
+                break
+            if item is None:
+                # The fetcher is waiting on the budget: free what this batch holds.
+                if pending:
+                    flush()
+                continue
+
+            chunk, bars_by_symbol, nbytes = item
+            pending_bytes += nbytes
+            for symbol in chunk:
+                bars = bars_by_symbol.get(symbol, [])
+                if len(bars) < min_bars:
+                    warnings.append(f"{symbol}: not enough bars for selected indicators")
+                    done += 1
+                else:
+                    pending[symbol] = bars
+
+            if len(pending) >= evaluator.batch_size or (budget is not None and pending_bytes >= budget.limit // 2):
+                flush()
+
+        if pending and not cancel_event.is_set():
+            flush()
+
+        return warnings
+
+    def run_incremental_scan(
+        self,
+        config: ScanConfig,
+        cancel_event: Event,
+        progress_cb: Callable[[int, int, int], None],
+        full: bool = False,
+    ) -> tuple[dict[str, list[ScanResult]], list[str], list[str]]:
+        """Rescan using the provider's live series, evaluating only symbols that gained bars.
+
+        Returns current matches keyed by symbol for changed symbols only;
+        symbols absent from the mapping keep their previous results. With
+        ``full`` (the first tick of an auto session) the provider's live
+        state is reset first, so every symbol is evaluated and returned.
+        """
+        symbols, invalid = parse_symbols(config.symbols_text)
+        if not symbols:
+            return {}, invalid, []
+
+        timeframe = self.provider.timeframe_from_string(config.timeframe)
+        plan = compile_plan(config)
+        min_bars = max(config.ma_slow, config.macd_slow + config.macd_signal + 3, plan.min_bars)
+        start, _ = build_date_range(lookback_days(config, min_bars), config.end_date)
+
+        changed_results: dict[str, list[ScanResult]] = {}
+        warnings: list[str] = []
+        matched = 0
+
+        for start_idx in range(0, len(symbols), _CHUNK_SIZE):
+            if cancel_event.is_set():
+                break
+
+            chunk = symbols[start_idx : start_idx + _CHUNK_SIZE]
+            if full:
+                self.provider.reset_live(chunk, timeframe)
+            try:
+                bars_by_symbol, changed = self.provider.refresh_bars(chunk, timeframe, start, cancel_event=cancel_event)
+            except FetchCancelled:
+                break
+
+            for offset, symbol in enumerate(chunk, start=1):
+                if cancel_event.is_set():
+                    break
+
+                if symbol in changed:
+                    symbol_matches = self._scan_bars(
+                        symbol, bars_by_symbol[symbol], str(timeframe), config, plan, min_bars
+                    )
+                    if symbol_matches is None:
+                        warnings.append(f"{symbol}: not enough bars for selected indicators")
+                        symbol_matches = []
+                    changed_results[symbol] = symbol_matches
+                    matched += len(symbol_matches)
+                progress_cb(min(start_idx + offset, len(symbols)), len(symbols), matched)
+
+        return changed_results, invalid, warnings
+
+    def _scan_bars(
+        self,
+        symbol: str,
+        bars: list[OHLCVBar],
+        timeframe_key: str,
+        config: ScanConfig,
+        plan: EvaluationPlan,
+        min_bars: int,
+        series_bars: Optional[int] = None,
+    ) -> Optional[list[ScanResult]]:
+        """Evaluate one symbol's bars; ``None`` when there are too few bars.
+
+        With ``series_bars`` set (out-of-core scans), results keep only that
+        many closes and the indicator cache is bypassed, so nothing holds on
+        to the full series once the symbol is done.
+        """
+        if len(bars) < min_bars:
+            return None
+
+        # Only the columns the plan's indicators read, each built once per symbol.
+        columns = columns_from_bars(bars, plan.columns)
+        last = bars[-1]
+        return self._evaluate_symbol(
+            symbol=symbol,
+            closes=columns["close"] if "close" in columns else [b.close for b in bars],
+            columns=columns,
+            last_close=last.close,
+            last_bar_time=last.timestamp.isoformat(),
+            config=config,
+            plan=plan,
+            fingerprint=None if series_bars else (symbol, timeframe_key, bars[0].timestamp, last.timestamp, len(bars)),
+            series_bars=series_bars,
+        )
 
     def _evaluate_symbol(
         self,
@@ -141,65 +570,47 @@ class ScreenerEngine:
         last_close: float,
         last_bar_time: str,
         config: ScanConfig,
-        macd_line: list[Optional[float]],
-        signal_line: list[Optional[float]],
-        histogram: list[Optional[float]],
-        fast_sma: list[Optional[float]],
-        slow_sma: list[Optional[float]],
+        plan: EvaluationPlan,
+        columns: Optional[Columns] = None,
+        fingerprint: Optional[SeriesFingerprint] = None,
+        series_bars: Optional[int] = None,
     ) -> list[ScanResult]:
-        matches: list[ScanResult] = []
-
-        if config.use_macd:
-            for bullish, label in ((True, "MACD Bull"), (False, "MACD Bear")):
-                age = detect_macd_crossover_age(
-                    closes,
-                    config.macd_fast,
-                    config.macd_slow,
-                    config.macd_signal,
-                    config.within_bars,
-                    bullish,
-                )
-                if age is not None:
-                    matches.append(
-                        ScanResult(
-                            symbol=symbol,
-                            last_close=last_close,
-                            signal_type=label,
-                            signal_age=age,
-                            macd=macd_line[-1],
-                            signal_line=signal_line[-1],
-                            histogram=histogram[-1],
-                            fast_ma=fast_sma[-1],
-                            slow_ma=slow_sma[-1],
-                            last_bar_time=last_bar_time,
-                            close_series=closes,
-                        )
-                    )
+        matches, ctx = plan.evaluate(closes if columns is None else columns, self.indicator_cache, fingerprint)
+        if not matches:
+            return []
 
-        if config.use_ma:
-            for bullish, label in ((True, "MA Bull"), (False, "MA Bear")):
-                age = detect_ma_crossover_age(
-                    closes,
-                    config.ma_fast,
-                    config.ma_slow,
-                    config.within_bars,
-                    bullish,
-                )
-                if age is not None:
-                    matches.append(
-                        ScanResult(
-                            symbol=symbol,
-                            last_close=last_close,
-                            signal_type=label,
-                            signal_age=age,
-                            macd=macd_line[-1],
-                            signal_line=signal_line[-1],
-                            histogram=histogram[-1],
-                            fast_ma=fast_sma[-1],
-                            slow_ma=slow_sma[-1],
-                            last_bar_time=last_bar_time,
-                            close_series=closes,
-                        )
-                    )
+        lasts = tuple(ctx.last(series) for series in _display_series(config))
+        if series_bars is not None:
+            closes = closes[-series_bars:]
+        indicator_series = _indicator_series(ctx, series_bars) if config.include_series else None
+        return self._build_results(symbol, closes, last_close, last_bar_time, matches, lasts, indicator_series)
 
-        return matches
+    @staticmethod
+    def _build_results(
+        symbol: str,
+        closes: list[float],
+        last_close: float,
+        last_bar_time: str,
+        matches: Iterable[tuple[str, int]],
+        lasts: tuple[Optional[float], ...],
+        indicator_series: Optional[Dict[str, List[Optional[float]]]] = None,
+    ) -> list[ScanResult]:
+        """One row per match; ``lasts`` holds the latest ``_display_series`` values."""
+        macd, signal, histogram, fast_ma, slow_ma = lasts
+        return [
+            ScanResult(
+                symbol=symbol,
+                last_close=last_close,
+                signal_type=label,
+                signal_age=age,
+                macd=macd,
+                signal_line=signal,
+                histogram=histogram,
+                fast_ma=fast_ma,
+                slow_ma=slow_ma,
+                last_bar_time=last_bar_time,
+                close_series=closes,
+                indicator_series=indicator_series or {},
+            )
+            for label, age in matches
+        ]
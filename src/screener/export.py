@@ -0,0 +1,179 @@
+"""Streaming export of scan results to CSV, JSON Lines, Parquet and Arrow."""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+import os
+from itertools import chain, islice
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from screener.engine import ScanResult
+
+
+RESULT_COLUMNS = (
+    "symbol",
+    "last_close",
+    "signal_type",
+    "signal_age",
+    "macd",
+    "signal_line",
+    "histogram",
+    "fast_ma",
+    "slow_ma",
+    "last_bar_time",
+)
+SERIES_COLUMN = "close_series"
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet", "arrow")
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+
+def format_from_path(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _EXTENSIONS:
+        raise ValueError(f"Cannot infer export format from extension: {ext or path}")
+    return _EXTENSIONS[ext]
+
+
+def export_results(
+    results: Iterable[ScanResult],
+    path: str,
+    fmt: str | None = None,
+    include_series: bool = False,
+    batch_size: int = 4096,
+) -> int:
+    """Write ``results`` to ``path`` as they are consumed and return the row count.
+
+    ``results`` may be any iterable, including a generator fed by a running
+    scan. Row formats write one result at a time; columnar formats write
+    record batches of at most ``batch_size`` rows. ``include_series`` adds
+    the close series and every indicator series the results carry (see
+    ``ScanConfig.include_series``), one column each.
+    """
+    fmt = (fmt or format_from_path(path)).lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt in {"parquet", "arrow"} and batch_size <= 0:
+        raise ValueError("batch_size must be > 0")
+
+    series_columns: Tuple[str, ...] = ()
+    if include_series:
+        results, series_columns = _peek_series_columns(results)
+    if fmt == "csv":
+        return _write_csv(results, path, series_columns)
+    if fmt == "jsonl":
+        return _write_jsonl(results, path, series_columns)
+    return _write_arrow(results, path, fmt, series_columns, batch_size)
+
+
+def _peek_series_columns(results: Iterable[ScanResult]) -> Tuple[Iterable[ScanResult], Tuple[str, ...]]:
+    """Series columns taken from the first result; all results of one scan carry the same set."""
+    iterator = iter(results)
+    first: Optional[ScanResult] = next(iterator, None)
+    if first is None:
+        return iterator, (SERIES_COLUMN,)
+    return chain([first], iterator), (SERIES_COLUMN,) + tuple(first.indicator_series)
+
+
+def _row(result: ScanResult) -> Iterator[object]:
+    return (getattr(result, name) for name in RESULT_COLUMNS)
+
+
+def _series(result: ScanResult, name: str) -> Sequence[Optional[float]]:
+    if name == SERIES_COLUMN:
+        return result.close_series
+    return result.indicator_series.get(name, [])
+
+
+def _json_value(value: object) -> object:
+    # JSON has no NaN or Infinity; missing and non-finite numbers are written as null.
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _write_csv(results: Iterable[ScanResult], path: str, series_columns: Tuple[str, ...]) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_COLUMNS + series_columns)
+        for result in results:
+            row = list(_row(result))
+            for name in series_columns:
+                # Space-separated values; warm-up bars without a value are written as nan.
+                row.append(" ".join("nan" if v is None else repr(float(v)) for v in _series(result, name)))
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_jsonl(results: Iterable[ScanResult], path: str, series_columns: Tuple[str, ...]) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for result in results:
+            record = {name: _json_value(value) for name, value in zip(RESULT_COLUMNS, _row(result))}
+            for name in series_columns:
+                record[name] = [_json_value(v) for v in _series(result, name)]
+            f.write(json.dumps(record, separators=(",", ":"), allow_nan=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def _write_arrow(
+    results: Iterable[ScanResult], path: str, fmt: str, series_columns: Tuple[str, ...], batch_size: int
+) -> int:
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise ImportError(f"{fmt} export requires pyarrow (pip install pyarrow)") from exc
+
+    fields = [
+        pa.field("symbol", pa.string()),
+        pa.field("last_close", pa.float64()),
+        pa.field("signal_type", pa.string()),
+        pa.field("signal_age", pa.int32()),
+        pa.field("macd", pa.float64()),
+        pa.field("signal_line", pa.float64()),
+        pa.field("histogram", pa.float64()),
+        pa.field("fast_ma", pa.float64()),
+        pa.field("slow_ma", pa.float64()),
+        pa.field("last_bar_time", pa.string()),
+    ]
+    fields += [pa.field(name, pa.list_(pa.float64())) for name in series_columns]
+    schema = pa.schema(fields)
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        import pyarrow.ipc as ipc
+
+        writer = ipc.new_file(path, schema)
+
+    count = 0
+    iterator = iter(results)
+    try:
+        while True:
+            batch: List[ScanResult] = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            columns = [[getattr(r, name) for r in batch] for name in RESULT_COLUMNS]
+            columns += [[_series(r, name) for r in batch] for name in series_columns]
+            arrays = [pa.array(column, type=field.type) for column, field in zip(columns, schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
@@ -0,0 +1,63 @@
+"""In-view result filters applied to a finished scan without rescanning."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from screener.engine import ScanResult
+
+
+# How a new filter relates to the previous one (maps onto Gtk.FilterChange).
+SAME = "same"
+STRICTER = "stricter"
+LOOSER = "looser"
+DIFFERENT = "different"
+
+
+@dataclass(frozen=True)
+class ResultFilter:
+    """Empty fields match everything; ``histogram_sign`` is 1, -1 or 0 (any)."""
+
+    signal_type: str = ""
+    symbol_prefix: str = ""
+    max_age: Optional[int] = None
+    histogram_sign: int = 0
+
+    def __post_init__(self) -> None:
+        # Symbols are upper case; normalize once instead of on every row.
+        object.__setattr__(self, "symbol_prefix", self.symbol_prefix.strip().upper())
+
+    def matches(self, result: ScanResult) -> bool:
+        if self.signal_type and result.signal_type != self.signal_type:
+            return False
+        if self.symbol_prefix and not result.symbol.startswith(self.symbol_prefix):
+            return False
+        if self.max_age is not None and result.signal_age > self.max_age:
+            return False
+        if self.histogram_sign:
+            histogram = result.histogram or 0.0
+            if (histogram > 0) != (self.histogram_sign > 0) or histogram == 0:
+                return False
+        return True
+
+    def narrows(self, other: ResultFilter) -> bool:
+        """True when every result this filter keeps is also kept by ``other``."""
+        return (
+            (not other.signal_type or self.signal_type == other.signal_type)
+            and self.symbol_prefix.startswith(other.symbol_prefix)
+            and (other.max_age is None or (self.max_age is not None and self.max_age <= other.max_age))
+            and (not other.histogram_sign or self.histogram_sign == other.histogram_sign)
+        )
+
+    def change_from(self, previous: ResultFilter) -> str:
+        """Classify the change so only rows that can flip are re-checked."""
+        stricter = self.narrows(previous)
+        looser = previous.narrows(self)
+        if stricter and looser:
+            return SAME
+        if stricter:
+            return STRICTER
+        if looser:
+            return LOOSER
+        return DIFFERENT
@@ -0,0 +1,156 @@
+"""Multi-process rule evaluation over shared-memory OHLCV column buffers."""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+from array import array
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from threading import Event, Lock
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from indicators.registry import Columns
+from screener.rules import EvaluationPlan, Series
+
+
+# (symbol, offset, length) into the shared float64 buffer; the symbol's
+# ``plan.columns`` follow each other from ``offset``, ``length`` values each.
+ShardEntry = Tuple[str, int, int]
+# Compact match record: (symbol, ((label, age), ...), last value of each requested series).
+MatchRecord = Tuple[str, Tuple[Tuple[str, int], ...], Tuple[Optional[float], ...]]
+
+_worker_cancel = None
+
+
+def _init_worker(cancel) -> None:
+    global _worker_cancel
+    _worker_cancel = cancel
+
+
+def _evaluate_shard(
+    shm_name: str,
+    entries: Sequence[ShardEntry],
+    plan: EvaluationPlan,
+    report: Sequence[Series],
+) -> List[MatchRecord]:
+    # Pool workers share the parent's resource tracker, which keeps owning
+    # (and eventually unlinking) the segment.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        values = shm.buf.cast("d")
+        try:
+            records: List[MatchRecord] = []
+            for symbol, offset, length in entries:
+                if _worker_cancel is not None and _worker_cancel.is_set():
+                    break
+                columns = {
+                    name: values[offset + k * length : offset + (k + 1) * length].tolist()
+                    for k, name in enumerate(plan.columns)
+                }
+                matches, ctx = plan.evaluate(columns)
+                if matches:
+                    records.append((symbol, tuple(matches), tuple(ctx.last(s) for s in report)))
+            return records
+        finally:
+            values.release()
+    finally:
+        shm.close()
+
+
+class ParallelEvaluator:
+    """Persistent process pool that evaluates symbol shards of an ``EvaluationPlan``.
+
+    The OHLCV columns the plan reads are copied once into a shared-memory
+    float64 buffer per batch; workers receive only ``(symbol, offset, length)``
+    entries and return compact match records, so bar lists are never pickled.
+    """
+
+    def __init__(self, workers: Optional[int] = None, shard_size: int = 64):
+        if shard_size <= 0:
+            raise ValueError("shard_size must be > 0")
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        # spawn: forking a process that runs GTK and worker threads is unsafe.
+        ctx = mp.get_context("spawn")
+        self._cancel = ctx.Event()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self._cancel,),
+        )
+        self._lock = Lock()
+
+    @property
+    def batch_size(self) -> int:
+        """Symbols per ``evaluate`` call that keep every worker busy."""
+        return self.workers * self.shard_size
+
+    def evaluate(
+        self,
+        plan: EvaluationPlan,
+        columns_by_symbol: Sequence[Tuple[str, Columns]],
+        report: Sequence[Series],
+        cancel_event: Event,
+        progress_cb: Optional[Callable[[int], None]] = None,
+    ) -> List[MatchRecord]:
+        """Evaluate ``plan`` for every symbol and return records in input order.
+
+        ``progress_cb`` receives the number of symbols finished so far. When
+        ``cancel_event`` is set, workers stop between symbols and the records
+        gathered so far are returned.
+        """
+        if not columns_by_symbol:
+            return []
+
+        total = sum(len(columns[name]) for _, columns in columns_by_symbol for name in plan.columns)
+        entries: List[ShardEntry] = []
+        with self._lock:
+            self._cancel.clear()
+            shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * 8)
+            try:
+                buf = shm.buf.cast("d")
+                try:
+                    offset = 0
+                    for symbol, columns in columns_by_symbol:
+                        length = len(columns[plan.columns[0]]) if plan.columns else 0
+                        entries.append((symbol, offset, length))
+                        for name in plan.columns:
+                            buf[offset : offset + length] = array("d", columns[name])
+                            offset += length
+                finally:
+                    buf.release()
+
+                shards = [entries[i : i + self.shard_size] for i in range(0, len(entries), self.shard_size)]
+                futures: List[Future] = [
+                    self._pool.submit(_evaluate_shard, shm.name, shard, plan, tuple(report)) for shard in shards
+                ]
+                sizes = {future: len(shard) for future, shard in zip(futures, shards)}
+
+                done_count = 0
+                pending = set(futures)
+                while pending:
+                    if cancel_event.is_set():
+                        self._cancel.set()
+                        for future in pending:
+                            future.cancel()
+                    finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        if not future.cancelled():
+                            done_count += sizes[future]
+                    if finished and progress_cb is not None:
+                        progress_cb(done_count)
+
+                records: List[MatchRecord] = []
+                for future in futures:
+                    if not future.cancelled():
+                        records.extend(future.result())
+                return records
+            finally:
+                shm.close()
+                shm.unlink()
+
+    def shutdown(self) -> None:
+        self._cancel.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,85 @@
+"""Score functions and bounded top-K collection for ranked scans."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from itertools import count
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from screener.engine import ScanResult
+
+
+Score = Callable[["ScanResult"], float]
+
+
+def _age_score(result: ScanResult) -> float:
+    # Fresher crossovers first.
+    return -float(result.signal_age)
+
+
+def _histogram_score(result: ScanResult) -> float:
+    # Histogram magnitude relative to price, so symbols of any price compare.
+    if result.histogram is None or not result.last_close:
+        return -math.inf
+    return abs(result.histogram) / result.last_close
+
+
+def _ma_distance_score(result: ScanResult) -> float:
+    # How far price sits from the slow MA, as a fraction of the MA.
+    if result.slow_ma is None or not result.slow_ma:
+        return -math.inf
+    return abs(result.last_close - result.slow_ma) / result.slow_ma
+
+
+RANK_SCORES: Dict[str, Score] = {
+    "age": _age_score,
+    "histogram": _histogram_score,
+    "ma_distance": _ma_distance_score,
+}
+
+
+def get_score(name: str) -> Score:
+    score = RANK_SCORES.get(name)
+    if score is None:
+        raise ValueError(f"Unsupported rank score: {name}")
+    return score
+
+
+class TopKCollector:
+    """Keeps the ``k`` highest-scoring results seen, in O(k) memory.
+
+    A min-heap holds the current best ``k``; each new result costs one
+    comparison against the weakest kept row, plus a heap replace when it wins.
+    Ties keep the earlier result.
+    """
+
+    def __init__(self, k: int, rank_by: str = "age"):
+        if k <= 0:
+            raise ValueError("k must be > 0")
+        self.k = k
+        self.score = get_score(rank_by)
+        self.seen = 0
+        self._heap: List[Tuple[float, int, ScanResult]] = []
+        # Decreasing sequence numbers make earlier rows win ties in the min-heap.
+        self._order = count(0, -1)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, result: ScanResult) -> bool:
+        """Offer ``result``; returns whether it is currently among the best ``k``."""
+        self.seen += 1
+        entry = (self.score(result), next(self._order), result)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] <= self._heap[0][:2]:
+            return False
+        heapq.heapreplace(self._heap, entry)
+        return True
+
+    def results(self) -> List[ScanResult]:
+        """Kept results, best first."""
+        return [result for _, _, result in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
@@ -0,0 +1,434 @@
+"""Composable signal rules compiled into a shared per-symbol evaluation plan."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from indicators.cache import IndicatorCache, SeriesFingerprint
+from indicators.macd import NumberList
+from indicators.registry import OHLCV_COLUMNS, Columns, get_indicator
+
+
+SeriesKey = Tuple[str, Tuple[float, ...]]
+
+
+@dataclass(frozen=True)
+class Series:
+    """Reference to one output of a registered indicator (``indicators.registry``).
+
+    ``kind`` and ``params`` identify the computation, ``component`` selects an
+    output when the computation yields several (MACD line/signal/histogram).
+    """
+
+    kind: str
+    params: Tuple[float, ...] = ()
+    component: int = 0
+
+    @property
+    def key(self) -> SeriesKey:
+        return self.kind, self.params
+
+
+Operand = Union[Series, float]
+
+
+def price() -> Series:
+    return Series("close")
+
+
+def moving_average(period: int) -> Series:
+    return Series("sma", (period,))
+
+
+def exp_moving_average(period: int) -> Series:
+    return Series("ema", (period,))
+
+
+def macd_line(fast: int = 12, slow: int = 26, signal: int = 9) -> Series:
+    return Series("macd", (fast, slow, signal), 0)
+
+
+def macd_signal(fast: int = 12, slow: int = 26, signal: int = 9) -> Series:
+    return Series("macd", (fast, slow, signal), 1)
+
+
+def macd_histogram(fast: int = 12, slow: int = 26, signal: int = 9) -> Series:
+    return Series("macd", (fast, slow, signal), 2)
+
+
+def relative_strength_index(period: int = 14) -> Series:
+    return Series("rsi", (period,))
+
+
+def bollinger_middle(period: int = 20, width: float = 2.0) -> Series:
+    return Series("bollinger", (period, width), 0)
+
+
+def bollinger_upper(period: int = 20, width: float = 2.0) -> Series:
+    return Series("bollinger", (period, width), 1)
+
+
+def bollinger_lower(period: int = 20, width: float = 2.0) -> Series:
+    return Series("bollinger", (period, width), 2)
+
+
+def average_true_range(period: int = 14) -> Series:
+    return Series("atr", (period,))
+
+
+def volume() -> Series:
+    return Series("volume")
+
+
+def volume_average(period: int = 20) -> Series:
+    return Series("volume_sma", (period,))
+
+
+def series_name(series: Series) -> str:
+    """Column name for ``series``, e.g. ``sma_20`` or ``macd_signal_12_26_9``."""
+    indicator = get_indicator(series.kind)
+    name = indicator.name
+    if len(indicator.outputs) > 1:
+        name = f"{name}_{indicator.outputs[series.component]}"
+    return "_".join([name] + [format(p, "g") for p in series.params])
+
+
+def _warmup(series: Series) -> int:
+    """Bars needed before ``series`` has its first non-``None`` value."""
+    return get_indicator(series.kind).warmup(*series.params)
+
+
+def _compute(key: SeriesKey, columns: Columns):
+    kind, params = key
+    return get_indicator(kind).compute(columns, *params)
+
+
+class PlanContext:
+    """Per-symbol series values and memoized condition outcomes."""
+
+    def __init__(self, computed: Dict[SeriesKey, object]):
+        self._computed = computed
+        self._outcomes: Dict[Condition, Optional[int]] = {}
+
+    def values(self, series: Series) -> NumberList:
+        out = self._computed[series.key]
+        if len(get_indicator(series.kind).outputs) > 1:
+            return out[series.component]
+        return out
+
+    def last(self, series: Series) -> Optional[float]:
+        values = self.values(series)
+        return values[-1] if values else None
+
+    def operand(self, operand: Operand, idx: int) -> Optional[float]:
+        if isinstance(operand, Series):
+            return self.values(operand)[idx]
+        return operand
+
+    def outcome(self, condition: Condition) -> Optional[int]:
+        return self._outcomes[condition]
+
+    def named_series(self) -> Dict[str, NumberList]:
+        """Every computed indicator output by ``series_name``; raw OHLCV columns are left out."""
+        out: Dict[str, NumberList] = {}
+        for kind, params in self._computed:
+            if kind in OHLCV_COLUMNS:
+                continue
+            for component in range(len(get_indicator(kind).outputs)):
+                series = Series(kind, params, component)
+                out[series_name(series)] = self.values(series)
+        return out
+
+
+class Condition:
+    """Base rule. ``evaluate`` returns a signal age in bars, or ``None`` on no match.
+
+    Level conditions (``Above``, ``Rising``...) report age 0 when they hold.
+    Conditions combine with ``&``, ``|`` and ``~``.
+    """
+
+    def __and__(self, other: Condition) -> Condition:
+        return AllOf(_flatten(AllOf, (self, other)))
+
+    def __or__(self, other: Condition) -> Condition:
+        return AnyOf(_flatten(AnyOf, (self, other)))
+
+    def __invert__(self) -> Condition:
+        return Not(self)
+
+    def children(self) -> Tuple[Condition, ...]:
+        return ()
+
+    def series(self) -> Tuple[Series, ...]:
+        return ()
+
+    def min_bars(self) -> int:
+        return max((_warmup(s) for s in self.series()), default=1)
+
+    def evaluate(self, ctx: PlanContext) -> Optional[int]:
+        raise NotImplementedError
+
+
+def _flatten(cls: type, conditions: Iterable[Condition]) -> Tuple[Condition, ...]:
+    out: List[Condition] = []
+    for condition in conditions:
+        if isinstance(condition, cls):
+            out.extend(condition.conditions)
+        else:
+            out.append(condition)
+    return tuple(out)
+
+
+def _operand_series(*operands: Operand) -> Tuple[Series, ...]:
+    return tuple(o for o in operands if isinstance(o, Series))
+
+
+@dataclass(frozen=True, eq=True)
+class _Cross(Condition):
+    fast: Series
+    slow: Operand
+    within: int
+    bullish: bool
+
+    def __post_init__(self) -> None:
+        if self.within <= 0:
+            raise ValueError("within must be > 0")
+
+    def series(self) -> Tuple[Series, ...]:
+        return _operand_series(self.fast, self.slow)
+
+    def min_bars(self) -> int:
+        return super().min_bars() + 1
+
+    def evaluate(self, ctx: PlanContext) -> Optional[int]:
+        fast = ctx.values(self.fast)
+        n = len(fast)
+        for idx in range(n - 1, 0, -1):
+            f_curr, f_prev = fast[idx], fast[idx - 1]
+            s_curr, s_prev = ctx.operand(self.slow, idx), ctx.operand(self.slow, idx - 1)
+            if f_curr is None or f_prev is None or s_curr is None or s_prev is None:
+                continue
+
+            age = n - 1 - idx
+            if age >= self.within:
+                break
+
+            curr = f_curr - s_curr
+            prev = f_prev - s_prev
+            if self.bullish and prev <= 0 < curr:
+                return age
+            if not self.bullish and prev >= 0 > curr:
+                return age
+        return None
+
+
+def CrossAbove(fast: Series, slow: Operand, within: int = 1) -> Condition:
+    """``fast`` crossed above ``slow`` within the last ``within`` bars."""
+    return _Cross(fast, slow, within, True)
+
+
+def CrossBelow(fast: Series, slow: Operand, within: int = 1) -> Condition:
+    """``fast`` crossed below ``slow`` within the last ``within`` bars."""
+    return _Cross(fast, slow, within, False)
+
+
+@dataclass(frozen=True, eq=True)
+class _Compare(Condition):
+    left: Series
+    right: Operand
+    greater: bool
+
+    def series(self) -> Tuple[Series, ...]:
+        return _operand_series(self.left, self.right)
+
+    def evaluate(self, ctx: PlanContext) -> Optional[int]:
+        left = ctx.last(self.left)
+        right = ctx.operand(self.right, -1)
+        if left is None or right is None:
+            return None
+        holds = left > right if self.greater else left < right
+        return 0 if holds else None
+
+
+def Above(left: Series, right: Operand) -> Condition:
+    """Latest ``left`` value is strictly above ``right``."""
+    return _Compare(left, right, True)
+
+
+def Below(left: Series, right: Operand) -> Condition:
+    """Latest ``left`` value is strictly below ``right``."""
+    return _Compare(left, right, False)
+
+
+@dataclass(frozen=True, eq=True)
+class _Trend(Condition):
+    target: Series
+    bars: int
+    rising: bool
+
+    def __post_init__(self) -> None:
+        if self.bars <= 0:
+            raise ValueError("bars must be > 0")
+
+    def series(self) -> Tuple[Series, ...]:
+        return (self.target,)
+
+    def min_bars(self) -> int:
+        return super().min_bars() + self.bars
+
+    def evaluate(self, ctx: PlanContext) -> Optional[int]:
+        values = ctx.values(self.target)
+        if len(values) <= self.bars:
+            return None
+        window = values[-self.bars - 1 :]
+        if any(v is None for v in window):
+            return None
+        for prev, curr in zip(window, window[1:]):
+            if self.rising and not curr > prev:
+                return None
+            if not self.rising and not curr < prev:
+                return None
+        return 0
+
+
+def Rising(target: Series, bars: int = 1) -> Condition:
+    """``target`` increased on each of the last ``bars`` bars."""
+    return _Trend(target, bars, True)
+
+
+def Falling(target: Series, bars: int = 1) -> Condition:
+    """``target`` decreased on each of the last ``bars`` bars."""
+    return _Trend(target, bars, False)
+
+
+@dataclass(frozen=True, eq=True)
+class AllOf(Condition):
+    """Matches when every child matches; age is the oldest child age."""
+
+    conditions: Tuple[Condition, ...]
+
+    def children(self) -> Tuple[Condition, ...]:
+        return self.conditions
+
+    def min_bars(self) -> int:
+        return max((c.min_bars() for c in self.conditions), default=1)
+
+    def evaluate(self, ctx: PlanContext) -> Optional[int]:
+        ages = [ctx.outcome(c) for c in self.conditions]
+        if any(age is None for age in ages):
+            return None
+        return max(ages, default=0)
+
+
+@dataclass(frozen=True, eq=True)
+class AnyOf(Condition):
+    """Matches when any child matches; age is the most recent child age."""
+
+    conditions: Tuple[Condition, ...]
+
+    def children(self) -> Tuple[Condition, ...]:
+        return self.conditions
+
+    def min_bars(self) -> int:
+        return max((c.min_bars() for c in self.conditions), default=1)
+
+    def evaluate(self, ctx: PlanContext) -> Optional[int]:
+        ages = [age for age in (ctx.outcome(c) for c in self.conditions) if age is not None]
+        return min(ages) if ages else None
+
+
+@dataclass(frozen=True, eq=True)
+class Not(Condition):
+    condition: Condition
+
+    def children(self) -> Tuple[Condition, ...]:
+        return (self.condition,)
+
+    def min_bars(self) -> int:
+        return self.condition.min_bars()
+
+    def evaluate(self, ctx: PlanContext) -> Optional[int]:
+        return 0 if ctx.outcome(self.condition) is None else None
+
+
+@dataclass(frozen=True)
+class Signal:
+    """Named rule; each match becomes one result row labelled ``label``."""
+
+    label: str
+    condition: Condition
+
+
+class EvaluationPlan:
+    """Compiled form of a set of signals.
+
+    Every distinct series computation and every distinct condition node is
+    evaluated once per symbol, no matter how many signals reference it.
+    ``columns`` lists the OHLCV columns those computations read.
+    """
+
+    def __init__(self, signals: Sequence[Signal], extra_series: Iterable[Series] = ()):
+        self.signals = tuple(signals)
+        self._conditions: List[Condition] = []
+        seen: set[Condition] = set()
+        for signal in self.signals:
+            self._collect(signal.condition, seen)
+
+        series_keys: Dict[SeriesKey, None] = {}
+        for condition in self._conditions:
+            for series in condition.series():
+                series_keys.setdefault(series.key, None)
+        for series in extra_series:
+            series_keys.setdefault(series.key, None)
+        self.series_keys: Tuple[SeriesKey, ...] = tuple(series_keys)
+        inputs = {column for kind, _ in self.series_keys for column in get_indicator(kind).inputs}
+        self.columns: Tuple[str, ...] = tuple(c for c in OHLCV_COLUMNS if c in inputs)
+
+        self.min_bars = max(
+            [s.condition.min_bars() for s in self.signals] + [_warmup(Series(k, p)) for k, p in self.series_keys],
+            default=1,
+        )
+
+    def _collect(self, condition: Condition, seen: set[Condition]) -> None:
+        if condition in seen:
+            return
+        for child in condition.children():
+            self._collect(child, seen)
+        seen.add(condition)
+        self._conditions.append(condition)
+
+    @property
+    def conditions(self) -> Tuple[Condition, ...]:
+        return tuple(self._conditions)
+
+    def evaluate(
+        self,
+        data: Union[Columns, Sequence[float]],
+        cache: Optional[IndicatorCache] = None,
+        fingerprint: Optional[SeriesFingerprint] = None,
+    ) -> Tuple[List[Tuple[str, int]], PlanContext]:
+        """Return ``(label, age)`` matches and the context holding computed series.
+
+        ``data`` maps column names to values (at least ``self.columns``); a
+        plain sequence is taken as the close column. With ``cache`` and
+        ``fingerprint`` set, series are memoized under ``fingerprint + series key``.
+        """
+        columns: Columns = data if isinstance(data, Mapping) else {"close": data}
+        if cache is None or fingerprint is None:
+            computed = {key: _compute(key, columns) for key in self.series_keys}
+        else:
+            computed = {
+                key: cache.get_or_compute((fingerprint, key), lambda key=key: _compute(key, columns))
+                for key in self.series_keys
+            }
+        ctx = PlanContext(computed)
+        for condition in self._conditions:
+            ctx._outcomes[condition] = condition.evaluate(ctx)
+
+        matches: List[Tuple[str, int]] = []
+        for signal in self.signals:
+            age = ctx.outcome(signal.condition)
+            if age is not None:
+                matches.append((signal.label, age))
+        return matches, ctx
@@ -0,0 +1,67 @@
+"""Bar-close aligned scheduling and result diffing for automatic rescans."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Iterable, List, Mapping, Tuple
+from zoneinfo import ZoneInfo
+
+if TYPE_CHECKING:
+    from screener.engine import ScanResult
+
+
+MARKET_TZ = ZoneInfo("America/New_York")
+DEFAULT_GRACE = timedelta(seconds=3)
+
+# (symbol, signal type) identifies one row of the results table.
+ResultKey = Tuple[str, str]
+
+
+def next_bar_close(timeframe: str, now: datetime | None = None, grace: timedelta = DEFAULT_GRACE) -> datetime:
+    """Return when the bar currently forming on ``timeframe`` is complete, plus ``grace``.
+
+    Matches ``AlpacaDataProvider._prune_incomplete_bar``: intraday bars close
+    on UTC minute/hour boundaries, daily bars (stamped at midnight New York
+    time) are complete at the following New York midnight.
+    """
+    now = datetime.now(timezone.utc) if now is None else now.astimezone(timezone.utc)
+    value = timeframe.lower().strip()
+
+    if value == "minute":
+        boundary = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    elif value == "hour":
+        boundary = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    elif value == "day":
+        local = now.astimezone(MARKET_TZ)
+        next_day = (local + timedelta(days=1)).date()
+        boundary = datetime.combine(next_day, datetime.min.time(), MARKET_TZ).astimezone(timezone.utc)
+    else:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+    return boundary + grace
+
+
+def seconds_until_next_bar_close(timeframe: str, now: datetime | None = None, grace: timedelta = DEFAULT_GRACE) -> float:
+    now = datetime.now(timezone.utc) if now is None else now.astimezone(timezone.utc)
+    return max((next_bar_close(timeframe, now, grace) - now).total_seconds(), 0.0)
+
+
+def diff_changed_results(
+    keys_by_symbol: Mapping[str, Iterable[ResultKey]], changed: Mapping[str, List[ScanResult]]
+) -> Tuple[List[ResultKey], List[ScanResult], List[ScanResult]]:
+    """Split an incremental rescan into removed keys, updated results and added results.
+
+    ``keys_by_symbol`` holds the keys currently shown for each symbol. Only
+    the changed symbols are looked up, so the cost follows the size of the
+    change rather than of the table.
+    """
+    removed: List[ResultKey] = []
+    updated: List[ScanResult] = []
+    added: List[ScanResult] = []
+    for symbol, results in changed.items():
+        current = set(keys_by_symbol.get(symbol, ()))
+        fresh = {(r.symbol, r.signal_type): r for r in results}
+        removed.extend(key for key in current if key not in fresh)
+        for key, result in fresh.items():
+            (updated if key in current else added).append(result)
+    return removed, updated, added
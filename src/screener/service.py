@@ -0,0 +1,184 @@
+"""Long-lived scan service shared by local clients, plus its JSON wire format."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, fields
+from datetime import date
+from operator import itemgetter
+from threading import Condition, Event, Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from data.provider import BarProvider
+from indicators.cache import IndicatorCache
+from screener.engine import ScanConfig, ScanResult, ScreenerEngine
+
+
+logger = logging.getLogger(__name__)
+
+_CONFIG_FIELDS = {f.name for f in fields(ScanConfig)} - {"signals"}
+
+
+def config_to_dict(config: ScanConfig) -> Dict[str, Any]:
+    if config.signals is not None:
+        raise ValueError("Custom signals cannot be sent to the scan service")
+    data = {name: getattr(config, name) for name in _CONFIG_FIELDS}
+    data["end_date"] = config.end_date.isoformat() if config.end_date else None
+    return data
+
+
+def config_from_dict(data: Dict[str, Any]) -> ScanConfig:
+    unknown = set(data) - _CONFIG_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown scan config fields: {', '.join(sorted(unknown))}")
+    values = dict(data)
+    if values.get("end_date"):
+        values["end_date"] = date.fromisoformat(values["end_date"])
+    return ScanConfig(**values)
+
+
+def result_to_dict(result: ScanResult) -> Dict[str, Any]:
+    return asdict(result)
+
+
+def result_from_dict(data: Dict[str, Any]) -> ScanResult:
+    return ScanResult(**data)
+
+
+class ScanJob:
+    """One submitted scan: an event log that any number of readers can follow.
+
+    Once the job finishes only its last progress event is kept; result
+    events and the final event stay for late readers.
+    """
+
+    def __init__(self, job_id: str, config: ScanConfig):
+        self.id = job_id
+        self.config = config
+        self.cancel_event = Event()
+        self.finished = False
+        # (sequence number, event); readers resume after the last number they saw,
+        # which stays valid when progress events are dropped.
+        self._events: List[Tuple[int, Dict[str, Any]]] = []
+        self._seq = itertools.count()
+        self._cond = Condition()
+
+    def publish(self, event: Dict[str, Any], final: bool = False) -> None:
+        with self._cond:
+            self._events.append((next(self._seq), event))
+            if final:
+                self.finished = True
+                progress = [seq for seq, e in self._events if e["type"] == "progress"]
+                last = progress[-1] if progress else None
+                self._events = [item for item in self._events if item[1]["type"] != "progress" or item[0] == last]
+            self._cond.notify_all()
+
+    def events(self, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the retained events from the start, blocking for new ones until the job finishes."""
+        seen = -1
+        while True:
+            with self._cond:
+                while (not self._events or self._events[-1][0] <= seen) and not self.finished:
+                    if not self._cond.wait(timeout):
+                        return
+                batch = self._events[bisect_right(self._events, seen, key=itemgetter(0)) :]
+                done = self.finished
+            if batch:
+                seen = batch[-1][0]
+            yield from (event for _, event in batch)
+            if done:
+                with self._cond:
+                    if self._events[-1][0] <= seen:
+                        return
+
+
+class ScanService:
+    """Owns one provider, indicator cache and engine for every client on the host.
+
+    Jobs run concurrently on a thread pool and can be cancelled individually.
+    A finished job is released once a client has read its event stream to
+    the end (see ``release``); until then up to ``keep_finished`` finished
+    jobs are kept so late readers can still replay their results.
+    """
+
+    def __init__(
+        self,
+        provider: BarProvider,
+        max_concurrent: int = 4,
+        keep_finished: int = 64,
+        indicator_cache: Optional[IndicatorCache] = None,
+    ):
+        self.engine = ScreenerEngine(provider, indicator_cache=indicator_cache or IndicatorCache())
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="scan-job")
+        self._jobs: OrderedDict[str, ScanJob] = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = Lock()
+
+    def submit(self, config: ScanConfig) -> ScanJob:
+        with self._lock:
+            job = ScanJob(str(next(self._ids)), config)
+            self._jobs[job.id] = job
+            self._evict()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None:
+            return False
+        job.cancel_event.set()
+        return True
+
+    def release(self, job_id: str) -> None:
+        """Forget a finished job, e.g. once a client has read its final event."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished:
+                del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _evict(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - self.keep_finished, 0)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: ScanJob) -> None:
+        def progress_cb(done: int, total: int, matched: int) -> None:
+            job.publish({"type": "progress", "done": done, "total": total, "matched": matched})
+
+        def result_cb(result: ScanResult) -> None:
+            job.publish({"type": "result", "result": result_to_dict(result)})
+
+        try:
+            _, invalid, warnings = self.engine.run_scan(job.config, job.cancel_event, progress_cb, result_cb)
+        except Exception as exc:
+            logger.exception("Scan job %s failed", job.id)
+            job.publish({"type": "error", "message": str(exc)}, final=True)
+        else:
+            job.publish(
+                {
+                    "type": "done",
+                    "invalid": invalid,
+                    "warnings": warnings,
+                    "cancelled": job.cancel_event.is_set(),
+                },
+                final=True,
+            )
+        # Evict here too, so finished jobs are bounded even when nothing new is submitted.
+        with self._lock:
+            self._evict()
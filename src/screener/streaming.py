@@ -0,0 +1,148 @@
+"""Fetch-ahead pipeline that keeps a scan's fetched bars under a memory budget."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from threading import Event
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from data.provider import FetchCancelled, OHLCVBar
+
+
+# Approximate resident size of one ``OHLCVBar`` (object, datetime and five floats).
+BAR_BYTES = 300
+
+BarsBySymbol = Dict[str, List[OHLCVBar]]
+# (symbols of the chunk, their bars, bytes charged to the budget)
+Chunk = Tuple[List[str], BarsBySymbol, int]
+
+_POLL_SECONDS = 0.05
+
+
+def bars_bytes(bars_by_symbol: BarsBySymbol) -> int:
+    return BAR_BYTES * sum(len(bars) for bars in bars_by_symbol.values())
+
+
+def cache_bars(memory_limit_mb: float) -> int:
+    """Bars a provider cache may keep in memory alongside a scan limited to ``memory_limit_mb``.
+
+    An eighth of the limit each, so the scan's own bars plus a provider's
+    two caches stay within about 1.25x the limit.
+    """
+    return max(int(memory_limit_mb * 1024 * 1024) // 8 // BAR_BYTES, 1)
+
+
+class MemoryBudget:
+    """Bytes of fetched bars that may be held at once.
+
+    ``acquire`` blocks while the reservation would exceed ``limit``, unless
+    nothing is held (so a single oversized chunk still makes progress).
+    """
+
+    def __init__(self, limit: int):
+        if limit <= 0:
+            raise ValueError("memory limit must be > 0")
+        self.limit = limit
+        self.used = 0
+        self.peak = 0
+        self.waiting = False
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes: int, *cancel_events: Event) -> bool:
+        """Reserve ``nbytes``; returns ``False`` if any of ``cancel_events`` is set while waiting."""
+        with self._cond:
+            while self.used and self.used + nbytes > self.limit:
+                if any(event.is_set() for event in cancel_events):
+                    return False
+                self.waiting = True
+                self._cond.wait(_POLL_SECONDS)
+            self.waiting = False
+            self._charge(nbytes)
+            return True
+
+    def adjust(self, reserved: int, actual: int) -> None:
+        """Replace a reservation with the size actually fetched, without blocking."""
+        with self._cond:
+            self._charge(actual - reserved)
+            self._cond.notify_all()
+
+    def release(self, nbytes: int) -> None:
+        with self._cond:
+            self.used = max(self.used - nbytes, 0)
+            self._cond.notify_all()
+
+    def _charge(self, nbytes: int) -> None:
+        self.used += nbytes
+        self.peak = max(self.peak, self.used)
+
+
+class Prefetcher:
+    """Fetches symbol chunks on a background thread, ahead of evaluation.
+
+    Each chunk reserves ``estimate(chunk)`` bytes of ``budget`` before it is
+    fetched, so fetching stalls (backpressure) until the consumer releases
+    the bytes of chunks it has finished with. Iterating yields chunks in
+    order, or ``None`` when the fetcher is stalled and nothing is queued: a
+    consumer holding chunks back should release some when it sees ``None``.
+    Iteration ends early once ``cancel_event`` is set; fetch errors are
+    re-raised in the consumer.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], BarsBySymbol],
+        chunks: Sequence[List[str]],
+        budget: MemoryBudget,
+        estimate: Callable[[List[str]], int],
+        cancel_event: Event,
+    ):
+        self.budget = budget
+        self.cancel_event = cancel_event
+        self._fetch = fetch
+        self._chunks = chunks
+        self._estimate = estimate
+        self._queue: queue.Queue = queue.Queue()
+        self._stop = Event()
+        self._thread = threading.Thread(target=self._run, name="scan-prefetch", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            for chunk in self._chunks:
+                reserved = self._estimate(chunk)
+                if self._stop.is_set() or not self.budget.acquire(reserved, self.cancel_event, self._stop):
+                    break
+                try:
+                    bars_by_symbol = self._fetch(chunk)
+                except BaseException:
+                    self.budget.release(reserved)
+                    raise
+                nbytes = bars_bytes(bars_by_symbol)
+                self.budget.adjust(reserved, nbytes)
+                self._queue.put((chunk, bars_by_symbol, nbytes))
+        except FetchCancelled:
+            pass
+        except BaseException as exc:
+            self._queue.put(exc)
+        finally:
+            self._queue.put(StopIteration())
+
+    def __iter__(self) -> Iterator[Optional[Chunk]]:
+        while True:
+            try:
+                item = self._queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self.budget.waiting:
+                    yield None
+                continue
+            if isinstance(item, StopIteration):
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def close(self) -> None:
+        """Stop fetching and wait for the fetch thread (after its current request)."""
+        self._stop.set()
+        self._thread.join()
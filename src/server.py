@@ -0,0 +1,167 @@
+"""Local scan daemon: one warm provider cache served over localhost HTTP or a Unix socket.
+
+Routes:
+  POST   /scans              body: ScanConfig JSON -> {"id": ...}
+  GET    /scans/<id>/events  JSON lines: progress/result events, then done or error
+  DELETE /scans/<id>         cancel the job
+  GET    /health
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import socketserver
+import stat
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+from data.alpaca_client import AlpacaDataProvider
+from data.local_provider import LocalBarProvider
+from screener.service import ScanService, config_from_dict
+from utils.logging import configure_logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class ScanRequestHandler(BaseHTTPRequestHandler):
+    server_version = "StockScreener/1"
+    service: ScanService
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job_path(self) -> tuple[str, str]:
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        if len(parts) >= 2 and parts[0] == "scans":
+            return parts[1], "/".join(parts[2:])
+        return "", ""
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+            return
+
+        job_id, tail = self._job_path()
+        job = self.service.get(job_id) if tail == "events" else None
+        if job is None:
+            self._send_json(404, {"error": "unknown scan"})
+            return
+
+        # HTTP/1.0 without Content-Length: the stream ends when the job does.
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for event in job.events():
+                self.wfile.write(json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("Client left the event stream of scan %s", job.id)
+            return
+        # The client has every result; do not hold them for the daemon's lifetime.
+        self.service.release(job.id)
+
+    def do_POST(self) -> None:
+        if self.path != "/scans":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            config = config_from_dict(json.loads(self.rfile.read(length) or b"{}"))
+        except (TypeError, ValueError) as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        job = self.service.submit(config)
+        self._send_json(202, {"id": job.id})
+
+    def do_DELETE(self) -> None:
+        job_id, tail = self._job_path()
+        if tail or not self.service.cancel(job_id):
+            self._send_json(404, {"error": "unknown scan"})
+            return
+        self._send_json(200, {"id": job_id, "cancelled": True})
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service: ScanService, host: str = "127.0.0.1", port: int = 8765, socket_path: str | None = None):
+    handler = type("BoundScanRequestHandler", (ScanRequestHandler,), {"service": service})
+    if socket_path:
+        try:
+            mode = os.lstat(socket_path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            # Only clear a stale socket; never delete whatever else sits at the path.
+            if not stat.S_ISSOCK(mode):
+                raise ValueError(f"Refusing to replace {socket_path}: not a socket")
+            os.unlink(socket_path)
+        # Bind under a umask that already yields 0660, so the socket is never
+        # briefly open to other users before a chmod.
+        old_umask = os.umask(0o117)
+        try:
+            return UnixHTTPServer(socket_path, handler)
+        finally:
+            os.umask(old_umask)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv: list[str] | None = None) -> int:
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Serve stock screener scans to local clients.")
+    parser.add_argument("--port", type=int, default=8765, help="Listen on 127.0.0.1:PORT")
+    parser.add_argument("--socket", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--bars-dir", default=os.getenv("SCREENER_BARS_DIR"), help="Serve bars from local files")
+    parser.add_argument("--max-jobs", type=int, default=4, help="Scans run concurrently")
+    args = parser.parse_args(argv)
+
+    if args.bars_dir:
+        provider = LocalBarProvider(args.bars_dir)
+    else:
+        api_key = os.getenv("ALPACA_API_KEY", "")
+        secret_key = os.getenv("ALPACA_SECRET_KEY", "")
+        if not api_key or not secret_key:
+            logger.error("Missing API credentials: set ALPACA_API_KEY and ALPACA_SECRET_KEY, or pass --bars-dir")
+            return 2
+        provider = AlpacaDataProvider(api_key, secret_key)
+
+    service = ScanService(provider, max_concurrent=args.max_jobs)
+    try:
+        server = make_server(service, port=args.port, socket_path=args.socket)
+    except ValueError as exc:
+        logger.error("%s", exc)
+        service.shutdown()
+        return 2
+    logger.info("Scan service listening on %s", args.socket or f"http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if isinstance(provider, AlpacaDataProvider):
+            provider.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""GTK application object for the stock screener."""
+
+from __future__ import annotations
+
+from utils.startup import STARTUP
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+from gi.repository import GLib, Gtk
+
+STARTUP.mark("GTK imported")
+
+from ui.main_window import MainWindow
+from utils.logging import configure_logging
+
+STARTUP.mark("UI modules imported")
+
+
+class StockScreenerApplication(Gtk.Application):
+    def __init__(self):
+        super().__init__(application_id="com.rusty4104.StockScreener")
+
+    def do_activate(self) -> None:
+        window = self.props.active_window
+        if not window:
+            window = MainWindow(self)
+            STARTUP.mark("Main window constructed")
+        window.present()
+        STARTUP.mark("Main window presented")
+        GLib.idle_add(self._on_first_idle)
+
+    def _on_first_idle(self) -> bool:
+        STARTUP.mark("Main loop idle")
+        STARTUP.report()
+        return GLib.SOURCE_REMOVE
+
+
+def main() -> None:
+    configure_logging()
+    app = StockScreenerApplication()
+    app.run(None)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import math
 import os
 import threading
 from dataclasses import asdict
@@ -14,7 +15,17 @@ gi.require_version("Gtk", "4.0")
 from gi.repository import Gio, GLib, GObject, Gtk
 
 from data.alpaca_client import AlpacaDataProvider
-from screener.engine import ScanConfig, ScanResult, ScreenerEngine
+from data.bar_cache import DEFAULT_SPILL_MB, spill_limit_bytes
+from data.local_provider import LocalBarProvider
+from data.provider import BarProvider
+from indicators.cache import IndicatorCache
+from screener.client import ScanClient
+from screener.engine import PARALLEL_MIN_SYMBOLS, ScanConfig, ScanResult, ScreenerEngine, has_signals, parse_symbols
+from screener.export import export_results
+from screener.filtering import DIFFERENT, LOOSER, SAME, STRICTER, ResultFilter
+from screener.parallel import ParallelEvaluator
+from screener.schedule import diff_changed_results, seconds_until_next_bar_close
+from screener.streaming import cache_bars
 
 
 class ResultRow(GObject.Object):
@@ -33,6 +44,13 @@ class ResultRow(GObject.Object):
 
     def __init__(self, result: ScanResult):
         super().__init__()
+        self.update(result)
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.symbol, self.signal_type
+
+    def update(self, result: ScanResult) -> None:
         self.raw = result
         self.symbol = result.symbol
         self.last_close = float(result.last_close)
@@ -47,8 +65,8 @@ class ResultRow(GObject.Object):
 
 
 class SettingsDialog(Gtk.Dialog):
-    def __init__(self, parent: Gtk.Window, api_key: str, secret_key: str):
-        super().__init__(title="Alpaca Settings", transient_for=parent, modal=True)
+    def __init__(self, parent: Gtk.Window, api_key: str, secret_key: str, bars_dir: str):
+        super().__init__(title="Data Settings", transient_for=parent, modal=True)
         self.add_button("Cancel", Gtk.ResponseType.CANCEL)
         self.add_button("Save", Gtk.ResponseType.OK)
 
@@ -64,10 +82,18 @@ class SettingsDialog(Gtk.Dialog):
         grid.attach(Gtk.Label(label="Secret Key", halign=Gtk.Align.START), 0, 1, 1, 1)
         grid.attach(self.secret_entry, 1, 1, 1, 1)
 
+        self.bars_dir_entry = Gtk.Entry(text=bars_dir, placeholder_text="Optional: read bars from this directory")
+        grid.attach(Gtk.Label(label="Local Bars Dir", halign=Gtk.Align.START), 0, 2, 1, 1)
+        grid.attach(self.bars_dir_entry, 1, 2, 1, 1)
+
         box.append(grid)
 
-    def get_values(self) -> tuple[str, str]:
-        return self.api_entry.get_text().strip(), self.secret_entry.get_text().strip()
+    def get_values(self) -> tuple[str, str, str]:
+        return (
+            self.api_entry.get_text().strip(),
+            self.secret_entry.get_text().strip(),
+            self.bars_dir_entry.get_text().strip(),
+        )
 
 
 class MainWindow(Gtk.ApplicationWindow):
@@ -77,9 +103,32 @@ class MainWindow(Gtk.ApplicationWindow):
 
         self.api_key = os.getenv("ALPACA_API_KEY", "")
         self.secret_key = os.getenv("ALPACA_SECRET_KEY", "")
+        # When set, scans read local bar files instead of calling Alpaca.
+        self.bars_dir = os.getenv("SCREENER_BARS_DIR", "")
+        self.local_provider: Optional[LocalBarProvider] = None
+        # Kept across scans so its keep-alive connections stay warm and segments
+        # cached by one scan (or by a cancelled one) are not downloaded again.
+        self.alpaca_provider: Optional[AlpacaDataProvider] = None
+        self._alpaca_keys: tuple[str, str] = ("", "")
+        self._provider_cache_bars: Optional[int] = None
+        # When set, scans run on a shared local scan service (src/server.py).
+        self.server_url = os.getenv("SCREENER_SERVER_URL", "")
 
         self.cancel_event = threading.Event()
         self.scan_thread: Optional[threading.Thread] = None
+        # Survives across scans so filter-only tweaks skip indicator math.
+        self.indicator_cache = IndicatorCache()
+        # Process pool started on the first multi-core scan and kept warm.
+        self.evaluator: Optional[ParallelEvaluator] = None
+        self.connect("close-request", self.on_close_request)
+
+        # Auto-rescan state: engine (and its provider's live bars) persist between ticks.
+        self.auto_engine: Optional[ScreenerEngine] = None
+        self.auto_config: Optional[ScanConfig] = None
+        self._auto_source: Optional[int] = None
+        self._rows: dict[tuple[str, str], ResultRow] = {}
+        # Keys of the rows shown for each symbol, so rescans diff only changed symbols.
+        self._symbol_keys: dict[str, set[tuple[str, str]]] = {}
 
         self._build_ui()
 
@@ -91,6 +140,10 @@ class MainWindow(Gtk.ApplicationWindow):
         settings_btn.connect("clicked", self.on_settings_clicked)
         header.pack_end(settings_btn)
 
+        self.export_btn = Gtk.Button(label="Export")
+        self.export_btn.connect("clicked", self.on_export_clicked)
+        header.pack_end(self.export_btn)
+
         root = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8, margin_top=8, margin_bottom=8, margin_start=8, margin_end=8)
         self.set_child(root)
 
@@ -132,6 +185,21 @@ class MainWindow(Gtk.ApplicationWindow):
         self.ma_fast.set_value(20)
         self.ma_slow.set_value(200)
 
+        self.ema_check = Gtk.CheckButton(label="Enable EMA")
+        self.ema_fast = Gtk.SpinButton.new_with_range(2, 200, 1)
+        self.ema_slow = Gtk.SpinButton.new_with_range(3, 400, 1)
+        self.ema_fast.set_value(12)
+        self.ema_slow.set_value(26)
+
+        self.rsi_check = Gtk.CheckButton(label="RSI(14) between")
+        self.rsi_min = Gtk.SpinButton.new_with_range(0, 100, 1)
+        self.rsi_max = Gtk.SpinButton.new_with_range(0, 100, 1)
+        self.rsi_min.set_value(30)
+        self.rsi_max.set_value(70)
+        self.volume_check = Gtk.CheckButton(label="Min avg volume (20 bars)")
+        self.volume_min = Gtk.SpinButton.new_with_range(0, 1_000_000_000, 10_000)
+        self.volume_min.set_value(500_000)
+
         self.load_btn = Gtk.Button(label="Load Symbols File")
         self.load_btn.connect("clicked", self.on_load_symbols)
         self.scan_btn = Gtk.Button(label="Run Scan")
@@ -139,6 +207,8 @@ class MainWindow(Gtk.ApplicationWindow):
         self.cancel_btn = Gtk.Button(label="Cancel")
         self.cancel_btn.set_sensitive(False)
         self.cancel_btn.connect("clicked", self.on_cancel_scan)
+        self.auto_check = Gtk.CheckButton(label="Auto-rescan on bar close")
+        self.auto_check.connect("toggled", self.on_auto_toggled)
 
         controls.attach(Gtk.Label(label="Timeframe"), 0, 0, 1, 1)
         controls.attach(self.timeframe_combo, 1, 0, 1, 1)
@@ -167,12 +237,83 @@ class MainWindow(Gtk.ApplicationWindow):
         controls.attach(self.scan_btn, 6, 2, 1, 1)
         controls.attach(self.cancel_btn, 7, 2, 1, 1)
 
+        controls.attach(self.ema_check, 0, 3, 1, 1)
+        controls.attach(Gtk.Label(label="Fast"), 1, 3, 1, 1)
+        controls.attach(self.ema_fast, 2, 3, 1, 1)
+        controls.attach(Gtk.Label(label="Slow"), 3, 3, 1, 1)
+        controls.attach(self.ema_slow, 4, 3, 1, 1)
+
+        controls.attach(self.rsi_check, 0, 4, 1, 1)
+        controls.attach(self.rsi_min, 1, 4, 1, 1)
+        controls.attach(Gtk.Label(label="and"), 2, 4, 1, 1)
+        controls.attach(self.rsi_max, 3, 4, 1, 1)
+        controls.attach(self.volume_check, 4, 4, 2, 1)
+        controls.attach(self.volume_min, 6, 4, 2, 1)
+
+        controls.attach(self.auto_check, 0, 5, 2, 1)
+
+        self.export_series_check = Gtk.CheckButton(label="Export indicator series")
+        controls.attach(self.export_series_check, 2, 5, 2, 1)
+
+        # Off by default: the pool only pays off on large universes and skips the indicator cache.
+        self.parallel_check = Gtk.CheckButton(label="Use all CPU cores")
+        self.parallel_check.set_tooltip_text(
+            f"Evaluate scans of {PARALLEL_MIN_SYMBOLS}+ symbols on a process pool (indicator cache not used)"
+        )
+        controls.attach(self.parallel_check, 4, 5, 2, 1)
+
+        self.top_check = Gtk.CheckButton(label="Keep best")
+        self.top_spin = Gtk.SpinButton.new_with_range(1, 100_000, 10)
+        self.top_spin.set_value(100)
+        self.rank_labels = [("age", "by signal age"), ("histogram", "by histogram strength"), ("ma_distance", "by distance from slow MA")]
+        self.rank_dropdown = Gtk.DropDown.new_from_strings([label for _, label in self.rank_labels])
+        controls.attach(self.top_check, 0, 6, 1, 1)
+        controls.attach(self.top_spin, 1, 6, 1, 1)
+        controls.attach(self.rank_dropdown, 2, 6, 2, 1)
+
+        self.memory_check = Gtk.CheckButton(label="Memory limit (MB)")
+        self.memory_spin = Gtk.SpinButton.new_with_range(64, 65536, 64)
+        self.memory_spin.set_value(2048)
+        controls.attach(self.memory_check, 4, 6, 2, 1)
+        controls.attach(self.memory_spin, 6, 6, 2, 1)
+
         content = Gtk.Paned.new(Gtk.Orientation.HORIZONTAL)
         content.set_vexpand(True)
         root.append(content)
 
+        results_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
+        filter_bar = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
+        self.search_entry = Gtk.SearchEntry(placeholder_text="Symbol prefix")
+        self.search_entry.connect("search-changed", self.on_filter_changed)
+        filter_bar.append(self.search_entry)
+        self.signal_types = Gtk.StringList.new(["All signals"])
+        self.signal_dropdown = Gtk.DropDown(model=self.signal_types)
+        self.signal_dropdown.connect("notify::selected", self.on_filter_changed)
+        filter_bar.append(self.signal_dropdown)
+        self.age_check = Gtk.CheckButton(label="Max age")
+        self.age_check.connect("toggled", self.on_filter_changed)
+        filter_bar.append(self.age_check)
+        self.age_spin = Gtk.SpinButton.new_with_range(0, 1000, 1)
+        self.age_spin.connect("value-changed", self.on_filter_changed)
+        filter_bar.append(self.age_spin)
+        self.hist_dropdown = Gtk.DropDown.new_from_strings(["Any histogram", "Hist > 0", "Hist < 0"])
+        self.hist_dropdown.connect("notify::selected", self.on_filter_changed)
+        filter_bar.append(self.hist_dropdown)
+        self.shown_label = Gtk.Label(xalign=0)
+        filter_bar.append(self.shown_label)
+        results_box.append(filter_bar)
+
+        # store -> filter -> sort -> selection. Filtering runs incrementally so
+        # large result sets stay responsive while typing; the sort model only
+        # sees rows that passed the filter.
         self.store = Gio.ListStore.new(ResultRow)
-        self.sort_model = Gtk.SortListModel(model=self.store)
+        self.view_filter = ResultFilter()
+        self._syncing_filters = False
+        self.result_filter = Gtk.CustomFilter.new(lambda row: self.view_filter.matches(row.raw))
+        self.filter_model = Gtk.FilterListModel(model=self.store, filter=self.result_filter, incremental=True)
+        self.filter_model.connect("items-changed", self._update_shown_label)
+        self.store.connect("items-changed", self._update_shown_label)
+        self.sort_model = Gtk.SortListModel(model=self.filter_model)
         self.selection = Gtk.SingleSelection(model=self.sort_model)
         self.selection.connect("notify::selected-item", self.on_result_selected)
 
@@ -190,10 +331,12 @@ class MainWindow(Gtk.ApplicationWindow):
             ("Last Bar", "last_bar_time", "{}"),
         ]:
             self.column_view.append_column(self._make_text_column(title, prop_name, fmt))
+        self.sort_model.set_sorter(self.column_view.get_sorter())
 
         scroller = Gtk.ScrolledWindow(vexpand=True, hexpand=True)
         scroller.set_child(self.column_view)
-        content.set_start_child(scroller)
+        results_box.append(scroller)
+        content.set_start_child(results_box)
 
         right_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8, margin_top=8, margin_bottom=8, margin_start=8, margin_end=8)
         self.detail_label = Gtk.Label(label="Select a row to view details", wrap=True, halign=Gtk.Align.START)
@@ -230,11 +373,53 @@ class MainWindow(Gtk.ApplicationWindow):
         column.set_resizable(True)
         return column
 
+    def on_filter_changed(self, *_args) -> None:
+        if self._syncing_filters:
+            return
+        selected = self.signal_dropdown.get_selected()
+        new_filter = ResultFilter(
+            signal_type=self.signal_types.get_string(selected) if 0 < selected < self.signal_types.get_n_items() else "",
+            symbol_prefix=self.search_entry.get_text(),
+            max_age=self.age_spin.get_value_as_int() if self.age_check.get_active() else None,
+            histogram_sign=(0, 1, -1)[self.hist_dropdown.get_selected()],
+        )
+        change = new_filter.change_from(self.view_filter)
+        self.view_filter = new_filter
+        if change == SAME:
+            return
+        # Stricter/looser changes let GTK re-check only the rows that can flip.
+        self.result_filter.changed(
+            {
+                STRICTER: Gtk.FilterChange.MORE_STRICT,
+                LOOSER: Gtk.FilterChange.LESS_STRICT,
+                DIFFERENT: Gtk.FilterChange.DIFFERENT,
+            }[change]
+        )
+
+    def _update_shown_label(self, *_args) -> None:
+        total = self.store.get_n_items()
+        shown = self.filter_model.get_n_items()
+        self.shown_label.set_text(f"Showing {shown} of {total}" if shown != total else f"{total} rows")
+
+    def _refresh_signal_types(self) -> None:
+        """Offer the signal labels present in the results; keeps the current choice."""
+        current = self.view_filter.signal_type
+        labels = sorted({self.store.get_item(i).signal_type for i in range(self.store.get_n_items())} | ({current} - {""}))
+        existing = [self.signal_types.get_string(i) for i in range(1, self.signal_types.get_n_items())]
+        if labels == existing:
+            return
+        self._syncing_filters = True
+        try:
+            self.signal_types.splice(1, len(existing), labels)
+            self.signal_dropdown.set_selected(labels.index(current) + 1 if current else 0)
+        finally:
+            self._syncing_filters = False
+
     def on_settings_clicked(self, _button: Gtk.Button) -> None:
-        dialog = SettingsDialog(self, self.api_key, self.secret_key)
+        dialog = SettingsDialog(self, self.api_key, self.secret_key, self.bars_dir)
         response = dialog.run()
         if response == Gtk.ResponseType.OK:
-            self.api_key, self.secret_key = dialog.get_values()
+            self.api_key, self.secret_key, self.bars_dir = dialog.get_values()
         dialog.destroy()
 
     def on_load_symbols(self, _button: Gtk.Button) -> None:
@@ -249,9 +434,86 @@ class MainWindow(Gtk.ApplicationWindow):
                         self.symbol_text.get_buffer().set_text(f.read())
         chooser.destroy()
 
+    def _make_provider(self, memory_limit_mb: Optional[float] = None) -> BarProvider:
+        # Caches are bounded to a share of the memory limit, if any (see screener.streaming).
+        max_cached_bars = cache_bars(memory_limit_mb) if memory_limit_mb else None
+        if self.bars_dir:
+            # Reused while the directory and cache bound are unchanged so its file index stays warm.
+            if (
+                self.local_provider is None
+                or self.local_provider.root != self.bars_dir
+                or self._provider_cache_bars != max_cached_bars
+            ):
+                self.local_provider = LocalBarProvider(self.bars_dir, max_cached_bars=max_cached_bars)
+                self._provider_cache_bars = max_cached_bars
+            return self.local_provider
+        if (
+            self.alpaca_provider is None
+            or self._alpaca_keys != (self.api_key, self.secret_key)
+            or self._provider_cache_bars != max_cached_bars
+        ):
+            if self.alpaca_provider is not None:
+                self.alpaca_provider.close()
+            self.alpaca_provider = AlpacaDataProvider(
+                self.api_key,
+                self.secret_key,
+                max_cached_bars=max_cached_bars,
+                spill_dir=os.getenv("SCREENER_SPILL_DIR") or None,
+                max_spill_bytes=spill_limit_bytes(float(os.getenv("SCREENER_SPILL_MAX_MB", DEFAULT_SPILL_MB))),
+            )
+            self._alpaca_keys = (self.api_key, self.secret_key)
+            self._provider_cache_bars = max_cached_bars
+        return self.alpaca_provider
+
+    def on_close_request(self, _window: Gtk.Window) -> bool:
+        self.cancel_event.set()
+        self._stop_auto_rescan()
+        if self.evaluator is not None:
+            self.evaluator.shutdown()
+            self.evaluator = None
+        if self.alpaca_provider is not None:
+            self.alpaca_provider.close()
+            self.alpaca_provider = None
+        return False
+
+    def on_export_clicked(self, _button: Gtk.Button) -> None:
+        count = self.sort_model.get_n_items()
+        if count == 0:
+            self.status_label.set_text("Nothing to export yet.")
+            return
+
+        chooser = Gtk.FileChooserNative(title="Export Results", action=Gtk.FileChooserAction.SAVE, transient_for=self)
+        chooser.set_current_name("scan_results.csv")
+        response = chooser.run()
+        path = None
+        if response == Gtk.ResponseType.ACCEPT:
+            file = chooser.get_file()
+            path = file.get_path() if file else None
+        chooser.destroy()
+        if not path:
+            return
+
+        # Rows are streamed straight from the view model in its current order.
+        rows = (self.sort_model.get_item(i).raw for i in range(count))
+        try:
+            written = export_results(rows, path, include_series=self.export_series_check.get_active())
+        except (ImportError, OSError, ValueError) as exc:
+            self.status_label.set_text(f"Export error: {exc}")
+            return
+        self.status_label.set_text(f"Exported {written} rows to {path}")
+
     def on_cancel_scan(self, _button: Gtk.Button) -> None:
         self.cancel_event.set()
-        self.status_label.set_text("Cancelling...")
+        self._stop_auto_rescan()
+        if self.scan_thread and self.scan_thread.is_alive():
+            self.status_label.set_text("Cancelling...")
+        else:
+            self.cancel_btn.set_sensitive(False)
+            self.status_label.set_text("Auto-rescan stopped")
+
+    def on_auto_toggled(self, button: Gtk.CheckButton) -> None:
+        if not button.get_active():
+            self._stop_auto_rescan()
 
     def _set_controls_enabled(self, enabled: bool) -> None:
         for widget in [
@@ -268,17 +530,32 @@ class MainWindow(Gtk.ApplicationWindow):
             self.ma_check,
             self.ma_fast,
             self.ma_slow,
+            self.ema_check,
+            self.ema_fast,
+            self.ema_slow,
+            self.rsi_check,
+            self.rsi_min,
+            self.rsi_max,
+            self.volume_check,
+            self.volume_min,
             self.symbol_text,
+            self.auto_check,
+            self.parallel_check,
+            self.top_check,
+            self.top_spin,
+            self.rank_dropdown,
+            self.memory_check,
+            self.memory_spin,
         ]:
             widget.set_sensitive(enabled)
-        self.cancel_btn.set_sensitive(not enabled)
+        self.cancel_btn.set_sensitive(not enabled or self._auto_source is not None)
 
     def on_run_scan(self, _button: Gtk.Button) -> None:
         if self.scan_thread and self.scan_thread.is_alive():
             return
 
-        if not self.api_key or not self.secret_key:
-            self.status_label.set_text("Missing API credentials. Set env vars or use Settings.")
+        if not self.server_url and not self.bars_dir and (not self.api_key or not self.secret_key):
+            self.status_label.set_text("Missing API credentials or local bars directory. Set env vars or use Settings.")
             return
 
         text_buffer = self.symbol_text.get_buffer()
@@ -306,21 +583,75 @@ class MainWindow(Gtk.ApplicationWindow):
             use_ma=self.ma_check.get_active(),
             ma_fast=self.ma_fast.get_value_as_int(),
             ma_slow=self.ma_slow.get_value_as_int(),
+            use_ema=self.ema_check.get_active(),
+            ema_fast=self.ema_fast.get_value_as_int(),
+            ema_slow=self.ema_slow.get_value_as_int(),
+            rsi_min=self.rsi_min.get_value() if self.rsi_check.get_active() else None,
+            rsi_max=self.rsi_max.get_value() if self.rsi_check.get_active() else None,
+            min_avg_volume=self.volume_min.get_value() if self.volume_check.get_active() else None,
+            top_k=self.top_spin.get_value_as_int() if self.top_check.get_active() else None,
+            rank_by=self.rank_labels[self.rank_dropdown.get_selected()][0],
+            memory_limit_mb=self.memory_spin.get_value() if self.memory_check.get_active() else None,
+            include_series=self.export_series_check.get_active(),
         )
 
-        if not config.use_macd and not config.use_ma:
-            self.status_label.set_text("Enable at least one filter (MACD or MA).")
+        if not has_signals(config):
+            self.status_label.set_text("Enable at least one filter (MACD, MA or EMA).")
+            return
+
+        # Reject an auto-rescan start before clearing, so the current results stay.
+        if self.auto_check.get_active():
+            # Auto-rescan runs in this process, not on the scan service.
+            if not self.bars_dir and (not self.api_key or not self.secret_key):
+                self.status_label.set_text(
+                    "Auto-rescan runs in the app, not on the scan service; set API credentials or a bars directory."
+                )
+                return
+            if config.end_date is not None:
+                self.status_label.set_text("Auto-rescan needs an open-ended scan; clear the end date.")
+                return
+            if config.top_k is not None:
+                self.status_label.set_text("Auto-rescan keeps every match; clear \"Keep best\".")
+                return
+
+        self._stop_auto_rescan()
+        self.store.remove_all()
+        self._rows.clear()
+        self._symbol_keys.clear()
+
+        if self.auto_check.get_active():
+            self.auto_config = config
+            try:
+                provider = self._make_provider(config.memory_limit_mb)
+            except ValueError as exc:
+                self.status_label.set_text(str(exc))
+                return
+            self.auto_engine = ScreenerEngine(provider, indicator_cache=self.indicator_cache)
+            # The table was just cleared, so the first tick evaluates every symbol.
+            self._start_auto_rescan(full=True)
             return
 
         self.cancel_event.clear()
         self._set_controls_enabled(False)
         self.status_label.set_text("Starting scan...")
-        self.store.remove_all()
+
+        # Smaller scans run in-process anyway, so do not start the pool for them.
+        use_parallel = (
+            self.parallel_check.get_active() and len(parse_symbols(config.symbols_text)[0]) >= PARALLEL_MIN_SYMBOLS
+        )
 
         def worker() -> None:
             try:
-                provider = AlpacaDataProvider(self.api_key, self.secret_key)
-                engine = ScreenerEngine(provider)
+                if self.server_url:
+                    engine = ScanClient(self.server_url)
+                else:
+                    provider = self._make_provider(config.memory_limit_mb)
+                    evaluator = None
+                    if use_parallel:
+                        if self.evaluator is None:
+                            self.evaluator = ParallelEvaluator()
+                        evaluator = self.evaluator
+                    engine = ScreenerEngine(provider, indicator_cache=self.indicator_cache, evaluator=evaluator)
 
                 def progress_cb(done: int, total: int, matched: int) -> None:
                     GLib.idle_add(self.status_label.set_text, f"Fetched {done}/{total} symbols, matched {matched}")
@@ -333,12 +664,125 @@ class MainWindow(Gtk.ApplicationWindow):
         self.scan_thread = threading.Thread(target=worker, daemon=True)
         self.scan_thread.start()
 
-    def _on_scan_done(self, results: list[ScanResult], invalid: list[str], warnings: list[str]) -> None:
+    def _start_auto_rescan(self, full: bool = False) -> None:
+        engine, config = self.auto_engine, self.auto_config
+        if engine is None or config is None:
+            return
+
+        self.cancel_event.clear()
+        self._set_controls_enabled(False)
+        self.status_label.set_text("Refreshing completed bars...")
+
+        def worker() -> None:
+            try:
+                def progress_cb(done: int, total: int, matched: int) -> None:
+                    GLib.idle_add(self.status_label.set_text, f"Checked {done}/{total} symbols, changed matches {matched}")
+
+                changed, invalid, warnings = engine.run_incremental_scan(config, self.cancel_event, progress_cb, full)
+                GLib.idle_add(self._on_rescan_done, changed, invalid, warnings)
+            except Exception as exc:
+                GLib.idle_add(self._on_scan_error, str(exc))
+
+        self.scan_thread = threading.Thread(target=worker, daemon=True)
+        self.scan_thread.start()
+
+    def _schedule_auto_rescan(self) -> None:
+        if self.auto_config is None or not self.auto_check.get_active() or self.cancel_event.is_set():
+            return
+        delay = seconds_until_next_bar_close(self.auto_config.timeframe)
+        self._auto_source = GLib.timeout_add_seconds(max(1, math.ceil(delay)), self._on_auto_tick)
+        self.cancel_btn.set_sensitive(True)
+
+    def _on_auto_tick(self) -> bool:
+        self._auto_source = None
+        if self.scan_thread and self.scan_thread.is_alive():
+            self._schedule_auto_rescan()
+        else:
+            self._start_auto_rescan()
+        return GLib.SOURCE_REMOVE
+
+    def _stop_auto_rescan(self) -> None:
+        if self._auto_source is not None:
+            GLib.source_remove(self._auto_source)
+            self._auto_source = None
+        self.auto_engine = None
+        self.auto_config = None
+
+    def _apply_changed_results(self, changed: dict[str, list[ScanResult]]) -> int:
+        """Diff rows for changed symbols into the store in place; returns rows touched."""
+        removed, updated, added = diff_changed_results(self._symbol_keys, changed)
+
+        # Rows to drop (False) or rebind (True), located in one pass over the store.
+        pending: dict[ResultRow, bool] = {}
+        for key in removed:
+            pending[self._unindex_row(key)] = False
+        for result in updated:
+            row = self._rows[(result.symbol, result.signal_type)]
+            row.update(result)
+            pending[row] = True
+        if pending:
+            positions = []
+            for position in range(self.store.get_n_items()):
+                row = self.store.get_item(position)
+                if row in pending:
+                    positions.append((position, row))
+            # Back to front, so the positions still to visit stay valid.
+            for position, row in reversed(positions):
+                if pending[row]:
+                    # Re-splice so views rebind the updated values.
+                    self.store.splice(position, 1, [row])
+                else:
+                    self.store.remove(position)
+
+        rows = [ResultRow(result) for result in added]
+        for row in rows:
+            self._index_row(row)
+        self.store.splice(self.store.get_n_items(), 0, rows)
+        return len(removed) + len(updated) + len(added)
+
+    def _index_row(self, row: ResultRow) -> None:
+        self._rows[row.key] = row
+        self._symbol_keys.setdefault(row.symbol, set()).add(row.key)
+
+    def _unindex_row(self, key: tuple[str, str]) -> ResultRow:
+        keys = self._symbol_keys[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._symbol_keys[key[0]]
+        return self._rows.pop(key)
+
+    def _on_rescan_done(self, changed: dict[str, list[ScanResult]], invalid: list[str], warnings: list[str]) -> None:
         self._set_controls_enabled(True)
-        for row in sorted(results, key=lambda r: (r.signal_age, r.symbol)):
-            self.store.append(ResultRow(row))
+        touched = self._apply_changed_results(changed)
+        self._refresh_signal_types()
 
-        messages = [f"Scan complete. Matches: {len(results)}"]
+        messages = [f"Rescan complete. Changed symbols: {len(changed)}, rows updated: {touched}, matches: {len(self._rows)}"]
+        if invalid:
+            messages.append(f"Invalid symbols skipped: {', '.join(invalid[:10])}")
+        if warnings:
+            messages.append(f"Warnings: {len(warnings)} (e.g. {warnings[0]})")
+
+        self._schedule_auto_rescan()
+        if self._auto_source is not None:
+            messages.append("Next rescan after bar close")
+        self.status_label.set_text(" | ".join(messages))
+
+    def _on_scan_done(self, results: list[ScanResult], invalid: list[str], warnings: list[str]) -> None:
+        self._set_controls_enabled(True)
+        if not self.top_check.get_active():
+            results = sorted(results, key=lambda r: (r.signal_age, r.symbol))
+        # Ranked scans arrive best first and already bounded to K rows.
+        rows = [ResultRow(result) for result in results]
+        for row in rows:
+            self._index_row(row)
+        # One splice emits a single items-changed instead of one per row.
+        self.store.splice(self.store.get_n_items(), 0, rows)
+        self._refresh_signal_types()
+
+        if self.cancel_event.is_set():
+            messages = [f"Scan cancelled, partial results. Matches: {len(results)}"]
+        else:
+            messages = [f"Scan complete. Matches: {len(results)}"]
         if invalid:
             messages.append(f"Invalid symbols skipped: {', '.join(invalid[:10])}")
         if warnings:
@@ -347,6 +791,7 @@ class MainWindow(Gtk.ApplicationWindow):
         self.status_label.set_text(" | ".join(messages))
 
     def _on_scan_error(self, message: str) -> None:
+        self._stop_auto_rescan()
         self._set_controls_enabled(True)
         self.status_label.set_text(f"Scan error: {message}")
 
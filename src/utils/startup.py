@@ -0,0 +1,130 @@
+"""Opt-in startup timing report (set ``SCREENER_STARTUP_REPORT=1``).
+
+Records named milestones and, like ``python -X importtime``, the cumulative
+and self time of every module imported after this one.
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Modules that should stay unloaded until the first scan.
+DEFERRED_MODULES = ("pyarrow",)
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader: importlib.abc.Loader, name: str, timer: StartupTimer):
+        self._loader = loader
+        self._name = name
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        self._timer._enter_import()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._exit_import(self._name, time.perf_counter() - start)
+
+    def __getattr__(self, attr: str):
+        return getattr(self._loader, attr)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, timer: StartupTimer):
+        self._timer = timer
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "active", False):
+            return None
+        self._local.active = True
+        try:
+            for finder in sys.meta_path:
+                find_spec = getattr(finder, "find_spec", None)
+                if finder is self or find_spec is None:
+                    continue
+                spec = find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.active = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, fullname, self._timer)
+        return spec
+
+
+class StartupTimer:
+    """Collects startup milestones and per-module import times."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._origin = time.perf_counter()
+        self.milestones: List[Tuple[str, float]] = []
+        # module -> (self seconds, cumulative seconds)
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self._stack = threading.local()
+        self._finder: Optional[_TimingFinder] = None
+        if enabled:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    @classmethod
+    def from_env(cls) -> StartupTimer:
+        return cls(os.getenv("SCREENER_STARTUP_REPORT", "") not in {"", "0"})
+
+    def _enter_import(self) -> None:
+        frames = self._stack.__dict__.setdefault("frames", [])
+        frames.append(0.0)
+
+    def _exit_import(self, name: str, elapsed: float) -> None:
+        frames = self._stack.frames
+        nested = frames.pop()
+        if frames:
+            frames[-1] += elapsed
+        self.imports[name] = (elapsed - nested, elapsed)
+
+    def mark(self, name: str) -> None:
+        if self.enabled:
+            self.milestones.append((name, time.perf_counter() - self._origin))
+
+    def report(self, top: int = 15) -> str:
+        """Log and return the report, then stop timing imports."""
+        if not self.enabled:
+            return ""
+
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+        lines = ["Startup timing (ms since first import):"]
+        lines.extend(f"  {elapsed * 1000:9.1f}  {name}" for name, elapsed in self.milestones)
+
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        lines.append(f"Slowest of {len(self.imports)} timed imports (self ms | cumulative ms):")
+        lines.extend(f"  {own * 1000:9.1f} | {cumulative * 1000:9.1f}  {name}" for name, (own, cumulative) in slowest)
+
+        loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+        lines.append(f"Deferred modules already loaded: {', '.join(loaded) if loaded else 'none'}")
+
+        text = "\n".join(lines)
+        logger.info(text)
+        self.enabled = False
+        return text
+
+
+STARTUP = StartupTimer.from_env()
@@ -0,0 +1,75 @@
+"""Shared test data: sine-wave bars and ``ScanResult`` rows."""
+
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from screener.engine import ScanResult
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _sine_close(i: int, k: int) -> float:
+    # One wave per test symbol ``k``, so symbols cross at different bars.
+    return 100 + 10 * math.sin(i / (5 + k))
+
+
+@pytest.fixture
+def sine_closes():
+    """``sine_closes(count, k=0)``: closes of test symbol ``k``."""
+
+    def make(count: int, k: int = 0) -> list[float]:
+        return [_sine_close(i, k) for i in range(count)]
+
+    return make
+
+
+@pytest.fixture
+def sine_rows():
+    """``sine_rows(symbol, count, k=0, start=START)``: ``(symbol, ISO timestamp, close)`` per daily bar."""
+
+    def make(symbol: str, count: int, k: int = 0, start: datetime = START) -> list[tuple[str, str, float]]:
+        return [(symbol, (start + timedelta(days=i)).isoformat(), _sine_close(i, k)) for i in range(count)]
+
+    return make
+
+
+@pytest.fixture
+def write_sine_csv(sine_rows):
+    """``write_sine_csv(path, count, k=0, start=START, shift=0.0)``: one symbol's daily bars as CSV.
+
+    High and low sit one above and below the close; ``shift`` is added to every price.
+    """
+
+    def write(path, count: int, k: int = 0, start: datetime = START, shift: float = 0.0):
+        lines = ["timestamp,open,high,low,close,volume"]
+        for _, ts, close in sine_rows(path.stem, count, k, start):
+            c = close + shift
+            lines.append(f"{ts},{c},{c + 1},{c - 1},{c},1000")
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    return write
+
+
+@pytest.fixture
+def make_result():
+    """``make_result(symbol, signal_type, signal_age, **fields)``: a result row, other fields empty."""
+
+    def make(symbol: str = "AAPL", signal_type: str = "MACD Bull", signal_age: int = 0, **fields) -> ScanResult:
+        values = dict(
+            last_close=10.0,
+            macd=None,
+            signal_line=None,
+            histogram=None,
+            fast_ma=None,
+            slow_ma=None,
+            last_bar_time="2024-03-12T04:00:00+00:00",
+            close_series=[],
+        )
+        values.update(fields)
+        return ScanResult(symbol=symbol, signal_type=signal_type, signal_age=signal_age, **values)
+
+    return make
@@ -0,0 +1,184 @@
+import gzip
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from data.alpaca_client import AlpacaDataProvider
+from data.provider import FetchCancelled, OHLCVBar
+
+
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+class _FakeFetch:
+    """Stands in for the REST fetch: daily bars for every requested day, optionally gated."""
+
+    def __init__(self):
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, symbols, timeframe, start, end):
+        self.calls.append((tuple(symbols), start, end))
+        self.gate.wait(5)
+        days = int((end - start) / timedelta(days=1)) + 1
+        bars = [start + timedelta(days=i) for i in range(days)]
+        return {s: [OHLCVBar(ts, 1.0, 1.0, 1.0, 1.0, 1.0) for ts in bars if ts <= end] for s in symbols}
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = AlpacaDataProvider("key", "secret", fetch_workers=1)
+    fake = _FakeFetch()
+    monkeypatch.setattr(provider, "_fetch", fake)
+    return provider, fake
+
+
+def test_completed_segments_are_shared_between_ranges(provider):
+    provider, fake = provider
+    timeframe = provider.timeframe_from_string("Day")
+
+    first = provider.get_bars(["AAPL"], timeframe, START, START + timedelta(days=200))
+    assert [b.timestamp for b in first["AAPL"]] == [START + timedelta(days=i) for i in range(201)]
+    segment_calls = len(fake.calls)
+
+    # A different end inside the same segments is served without new requests.
+    second = provider.get_bars(["AAPL"], timeframe, START + timedelta(days=10), START + timedelta(days=150))
+    assert len(fake.calls) == segment_calls
+    assert second["AAPL"][0].timestamp == START + timedelta(days=10)
+    assert second["AAPL"][-1].timestamp == START + timedelta(days=150)
+
+
+def test_cancel_interrupts_fetch_and_keeps_the_segment(provider):
+    provider, fake = provider
+    timeframe = provider.timeframe_from_string("Day")
+    fake.gate.clear()
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+
+    began = time.monotonic()
+    with pytest.raises(FetchCancelled):
+        provider.get_bars(["AAPL"], timeframe, START, START + timedelta(days=30), cancel_event=cancel)
+    assert time.monotonic() - began < 2
+
+    # The abandoned request completes in the background and is still cached.
+    fake.gate.set()
+    provider._executor.submit(lambda: None).result()
+    calls = len(fake.calls)
+    bars = provider.get_bars(["AAPL"], timeframe, START, START + timedelta(days=30))
+    assert len(fake.calls) == calls
+    assert len(bars["AAPL"]) == 31
+
+
+def test_refresh_bars_extends_changed_series_and_trims_to_lookback(provider):
+    provider, fake = provider
+    timeframe = provider.timeframe_from_string("Day")
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = today - timedelta(days=30)
+
+    bars, changed = provider.refresh_bars(["aapl", "MSFT"], timeframe, start)
+    assert changed == {"AAPL", "MSFT"}
+    first = bars["AAPL"]
+    assert first[0].timestamp == start
+
+    # Nothing completed since: no request, nothing changed.
+    calls = len(fake.calls)
+    bars, changed = provider.refresh_bars(["AAPL", "MSFT"], timeframe, start)
+    assert len(fake.calls) == calls
+    assert changed == set()
+
+    # AAPL last refreshed three bars ago; the window has since moved forward.
+    del provider._live[("AAPL", str(timeframe))][-3:]
+    later = start + timedelta(days=3)
+    bars, changed = provider.refresh_bars(["AAPL", "MSFT"], timeframe, later)
+    assert changed == {"AAPL"}
+    assert fake.calls[-1][0] == ("AAPL",)
+    assert [b.timestamp for b in bars["AAPL"]] == [b.timestamp for b in first if b.timestamp >= later]
+    # Unchanged symbols keep their bars as they were.
+    assert bars["MSFT"][0].timestamp == start
+
+    # A new auto session starts over: every symbol is reported again, from its own start.
+    provider.reset_live(["aapl", "MSFT"], timeframe)
+    bars, changed = provider.refresh_bars(["AAPL", "MSFT"], timeframe, start - timedelta(days=5))
+    assert changed == {"AAPL", "MSFT"}
+    assert bars["AAPL"][0].timestamp == start - timedelta(days=5)
+
+
+class _BarsHandler(BaseHTTPRequestHandler):
+    """Serves /v2/stocks/bars 64 bars per page, gzipped, over keep-alive connections."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        type(self).requests.append((url.path, query, self.headers.get("APCA-API-KEY-ID")))
+
+        start = datetime.fromisoformat(query["start"].replace("Z", "+00:00"))
+        end = datetime.fromisoformat(query["end"].replace("Z", "+00:00"))
+        rows = [
+            (symbol, start + timedelta(days=i))
+            for symbol in query["symbols"].split(",")
+            for i in range(int((end - start) / timedelta(days=1)) + 1)
+        ]
+        offset = int(query.get("page_token", 0))
+        page = rows[offset : offset + 64]
+        bars = {}
+        for symbol, ts in page:
+            bars.setdefault(symbol, []).append(
+                {"t": ts.strftime("%Y-%m-%dT%H:%M:%SZ"), "o": 1, "h": 2, "l": 0.5, "c": 1.5, "v": 100}
+            )
+        token = str(offset + 64) if offset + 64 < len(rows) else None
+        body = gzip.compress(json.dumps({"bars": bars, "next_page_token": token}).encode())
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_rest_fetch_follows_pages_over_pooled_connections():
+    _BarsHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BarsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    provider = AlpacaDataProvider("key", "secret", fetch_workers=1, base_url=f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        timeframe = provider.timeframe_from_string("Day")
+        bars = provider.get_bars(["AAPL", "MSFT"], timeframe, START, START + timedelta(days=4))
+    finally:
+        provider.close()
+        server.shutdown()
+        server.server_close()
+
+    assert [b.timestamp for b in bars["MSFT"]] == [START + timedelta(days=i) for i in range(5)]
+    assert bars["AAPL"][0].close == 1.5
+    assert all(path == "/v2/stocks/bars" and key == "key" for path, _, key in _BarsHandler.requests)
+    assert len(_BarsHandler.requests) > 1
+    assert provider.http.connections_opened == 1
+
+
+def test_evicted_segments_are_read_back_from_the_spill_dir(monkeypatch, tmp_path):
+    provider = AlpacaDataProvider("key", "secret", fetch_workers=1, max_cached_bars=200, spill_dir=str(tmp_path))
+    fake = _FakeFetch()
+    monkeypatch.setattr(provider, "_fetch", fake)
+    timeframe = provider.timeframe_from_string("Day")
+
+    first = provider.get_bars(["AAPL", "MSFT"], timeframe, START, START + timedelta(days=500))
+    calls = len(fake.calls)
+    assert provider._segments.memory_bars <= 200
+    assert list(tmp_path.iterdir())
+
+    second = provider.get_bars(["AAPL", "MSFT"], timeframe, START, START + timedelta(days=499))
+    assert len(fake.calls) == calls
+    assert second["MSFT"] == first["MSFT"][:-1]
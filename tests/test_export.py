@@ -0,0 +1,116 @@
+import csv
+import json
+import threading
+from datetime import date
+
+import pytest
+
+from data.local_provider import LocalBarProvider
+from screener.engine import ScanConfig, ScreenerEngine
+from screener.export import export_results, format_from_path
+from screener.parallel import ParallelEvaluator
+
+
+@pytest.fixture
+def result_row(make_result):
+    def make(symbol: str, age: int):
+        return make_result(
+            symbol,
+            "MACD Bull",
+            age,
+            last_close=101.5,
+            macd=0.5,
+            signal_line=0.25,
+            histogram=0.25,
+            slow_ma=99.0,
+            close_series=[100.0, 101.0, 101.5],
+            indicator_series={"sma_2": [None, 100.5, 101.25]},
+        )
+
+    return make
+
+
+def test_format_inferred_from_extension():
+    assert format_from_path("out/results.JSONL") == "jsonl"
+    assert format_from_path("results.feather") == "arrow"
+    with pytest.raises(ValueError):
+        format_from_path("results.txt")
+
+
+def test_csv_export_streams_generator(tmp_path, result_row):
+    path = tmp_path / "results.csv"
+    count = export_results((result_row(s, i) for i, s in enumerate(["AAPL", "MSFT"])), str(path), include_series=True)
+    assert count == 2
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["symbol"] for r in rows] == ["AAPL", "MSFT"]
+    assert rows[0]["fast_ma"] == ""
+    assert [float(v) for v in rows[1]["close_series"].split()] == [100.0, 101.0, 101.5]
+    assert rows[1]["sma_2"].split() == ["nan", "100.5", "101.25"]
+
+
+def test_jsonl_export_round_trips(tmp_path, result_row):
+    path = tmp_path / "results.jsonl"
+    export_results([result_row("NVDA", 3)], str(path), include_series=True)
+
+    record = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+    assert record["symbol"] == "NVDA"
+    assert record["signal_age"] == 3
+    assert record["close_series"] == [100.0, 101.0, 101.5]
+    assert record["sma_2"] == [None, 100.5, 101.25]
+
+
+def test_jsonl_writes_non_finite_values_as_null(tmp_path, result_row):
+    result = result_row("NVDA", 3)
+    result.histogram = float("nan")
+    result.indicator_series = {"rsi_14": [None, float("inf"), 55.0]}
+    path = tmp_path / "results.jsonl"
+    export_results([result], str(path), include_series=True)
+
+    line = path.read_text(encoding="utf-8").splitlines()[0]
+    assert "NaN" not in line and "Infinity" not in line
+    record = json.loads(line)
+    assert record["histogram"] is None
+    assert record["rsi_14"] == [None, None, 55.0]
+
+
+def test_parquet_export(tmp_path, result_row):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "results.parquet"
+    count = export_results((result_row(f"S{i}", i) for i in range(10)), str(path), include_series=True, batch_size=3)
+    assert count == 10
+
+    table = pq.read_table(path)
+    assert table.num_rows == 10
+    assert table.column("close_series")[0].as_py() == [100.0, 101.0, 101.5]
+    assert table.column("sma_2")[0].as_py() == [None, 100.5, 101.25]
+
+
+def test_scan_keeps_indicator_series_for_export(tmp_path, write_sine_csv):
+    for k, symbol in enumerate(["AAA", "BBB", "CCC"]):
+        write_sine_csv(tmp_path / f"{symbol}.csv", 400, k)
+
+    config = ScanConfig(symbols_text="AAA,BBB,CCC", end_date=date(2025, 6, 1), within_bars=30, include_series=True)
+    provider = LocalBarProvider(str(tmp_path))
+    results, _, _ = ScreenerEngine(provider).run_scan(config, threading.Event(), lambda *a: None)
+    assert results
+
+    result = results[0]
+    assert len(result.indicator_series["macd_line_12_26_9"]) == len(result.close_series)
+    assert result.indicator_series["macd_histogram_12_26_9"][-1] == result.histogram
+    assert result.indicator_series["sma_200"][-1] == result.slow_ma
+
+    # Pool workers return only the latest values; the engine fills the series in.
+    evaluator = ParallelEvaluator(workers=2)
+    try:
+        engine = ScreenerEngine(provider, evaluator=evaluator, parallel_min_symbols=1)
+        pooled, _, _ = engine.run_scan(config, threading.Event(), lambda *a: None)
+    finally:
+        evaluator.shutdown()
+    assert [r.indicator_series for r in pooled] == [r.indicator_series for r in results]
+
+    path = tmp_path / "results.jsonl"
+    export_results(results, str(path), include_series=True)
+    record = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+    assert record["macd_signal_12_26_9"] == result.indicator_series["macd_signal_12_26_9"]
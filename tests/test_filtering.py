@@ -0,0 +1,36 @@
+import pytest
+
+from screener.filtering import DIFFERENT, LOOSER, SAME, STRICTER, ResultFilter
+
+
+@pytest.fixture
+def rows(make_result):
+    return [
+        make_result("AAPL", "MACD Bull", 0, histogram=0.4),
+        make_result("AMD", "MACD Bear", 3, histogram=-0.2),
+        make_result("MSFT", "MA Bull", 1),
+        make_result("AMZN", "MACD Bull", 5, histogram=0.1),
+    ]
+
+
+def _symbols(rows, view_filter: ResultFilter):
+    return [(r.symbol, r.signal_type) for r in rows if view_filter.matches(r)]
+
+
+def test_filter_fields_combine(rows):
+    assert len(_symbols(rows, ResultFilter())) == 4
+    assert _symbols(rows, ResultFilter(symbol_prefix=" am")) == [("AMD", "MACD Bear"), ("AMZN", "MACD Bull")]
+    assert _symbols(rows, ResultFilter(signal_type="MACD Bull", max_age=2)) == [("AAPL", "MACD Bull")]
+    assert _symbols(rows, ResultFilter(histogram_sign=-1)) == [("AMD", "MACD Bear")]
+    assert _symbols(rows, ResultFilter(histogram_sign=1, symbol_prefix="A")) == [("AAPL", "MACD Bull"), ("AMZN", "MACD Bull")]
+
+
+def test_change_classification():
+    base = ResultFilter(symbol_prefix="A")
+    assert ResultFilter(symbol_prefix="a").change_from(base) == SAME
+    assert ResultFilter(symbol_prefix="AM").change_from(base) == STRICTER
+    assert ResultFilter(symbol_prefix="AM", max_age=2).change_from(base) == STRICTER
+    assert ResultFilter().change_from(base) == LOOSER
+    assert ResultFilter(symbol_prefix="M").change_from(base) == DIFFERENT
+    assert ResultFilter(max_age=1).change_from(ResultFilter(max_age=3)) == STRICTER
+    assert ResultFilter(histogram_sign=1).change_from(ResultFilter(histogram_sign=-1)) == DIFFERENT
@@ -0,0 +1,82 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data.http_pool import HTTPPool, HTTPStatusError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    statuses = []
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        status = type(self).statuses.pop(0) if type(self).statuses else 200
+        body = json.dumps({"path": self.path, "gzip": self.headers.get("Accept-Encoding")}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    _Handler.connections = 0
+    _Handler.statuses = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused_across_requests_and_threads(server):
+    pool = HTTPPool(server, size=2)
+    threads = [threading.Thread(target=lambda: [pool.get_json("/x", {"n": i}) for i in range(5)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+
+    assert _Handler.connections <= 2
+    stats = pool.stats()
+    assert stats["requests"] == 20
+    assert stats["reused"] >= 0.9
+
+
+def test_requests_ask_for_gzip_and_encode_params(server):
+    pool = HTTPPool(server)
+    assert pool.get_json("/bars", {"symbols": "A,B"}) == {"path": "/bars?symbols=A%2CB", "gzip": "gzip"}
+
+
+def test_server_closed_connection_is_replaced(server):
+    pool = HTTPPool(server, size=1)
+    pool.get_json("/close")
+    pool.get_json("/a")
+    pool.get_json("/b")
+    assert pool.connections_opened == 2
+    assert [t.reused for t in pool.timings] == [False, False, True]
+
+
+def test_rate_limit_is_retried_then_errors_raise(server):
+    pool = HTTPPool(server, retries=1, retry_wait=0)
+    _Handler.statuses = [429]
+    assert pool.get_json("/ok")["path"] == "/ok"
+
+    _Handler.statuses = [403]
+    with pytest.raises(HTTPStatusError) as err:
+        pool.get_json("/forbidden")
+    assert err.value.status == 403
@@ -1,5 +1,13 @@
+import math
+import statistics
+
+import pytest
+
 from indicators.macd import detect_macd_crossover_age, macd_series
-from indicators.moving_averages import detect_ma_crossover_age, sma
+from indicators.momentum import rsi
+from indicators.moving_averages import detect_ma_crossover_age, rolling_std, sma
+from indicators.registry import get_indicator
+from indicators.volatility import atr, bollinger_bands, true_range
 
 
 def test_sma_series():
@@ -47,3 +55,53 @@ def test_macd_bearish_crossover_absent_returns_none():
     closes = [i for i in range(1, 80)]
     age = detect_macd_crossover_age(closes, fast_period=12, slow_period=26, signal_period=9, within_bars=5, bullish=False)
     assert age is None
+
+
+def test_rsi_wilder_values():
+    closes = [10, 11, 12, 11, 12, 13]
+    result = rsi(closes, period=3)
+    assert result[:3] == [None, None, None]
+    # Seed: gains (1, 1, 0) / losses (0, 0, 1) over 3 -> RS 2.
+    assert result[3] == pytest.approx(100 - 100 / 3)
+    # Wilder step: avg gain (2/3 * 2 + 1) / 3, avg loss (1/3 * 2) / 3.
+    assert result[4] == pytest.approx(100 - 100 / (1 + (7 / 9) / (2 / 9)))
+    assert rsi([1, 2, 3, 4, 5], period=3)[-1] == 100.0
+
+
+def test_bollinger_bands_and_atr():
+    closes = [1.0, 2.0, 3.0, 4.0]
+    middle, upper, lower = bollinger_bands(closes, period=2, width=2.0)
+    assert middle[1:] == [1.5, 2.5, 3.5]
+    assert upper[1] == pytest.approx(2.5)
+    assert lower[1] == pytest.approx(0.5)
+
+    high, low, close = [11.0, 12.0, 15.0], [9.0, 10.0, 12.0], [10.0, 11.0, 14.0]
+    assert true_range(high, low, close) == [2.0, 2.0, 4.0]
+    assert atr(high, low, close, period=2) == [None, 2.0, 3.0]
+
+
+def test_rolling_std_is_stable_for_high_prices_with_small_spread():
+    closes = [50000.0 + 0.05 * math.sin(i * 0.7) for i in range(20000)]
+    std = rolling_std(closes, 20)
+
+    assert std[:19] == [None] * 19
+    for i in (19, 5000, 19999):
+        assert std[i] == pytest.approx(statistics.pstdev(closes[i - 19 : i + 1]), rel=1e-6)
+
+
+def test_registry_warmup_matches_first_value():
+    closes = [100 + (i % 7) - (i % 3) for i in range(80)]
+    columns = {"high": [c + 1 for c in closes], "low": [c - 1 for c in closes], "close": closes, "volume": closes}
+    for name, params in [
+        ("sma", (5,)),
+        ("ema", (5,)),
+        ("macd", (12, 26, 9)),
+        ("rsi", (14,)),
+        ("bollinger", (20, 2.0)),
+        ("atr", (14,)),
+        ("volume_sma", (10,)),
+    ]:
+        indicator = get_indicator(name)
+        out = indicator.compute(columns, *params)
+        first = out[-1] if len(indicator.outputs) > 1 else out
+        assert next(i for i, v in enumerate(first) if v is not None) + 1 == indicator.warmup(*params), name
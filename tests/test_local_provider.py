@@ -0,0 +1,216 @@
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+import cli
+from data.local_provider import LocalBarProvider
+from screener.engine import ScanConfig, ScreenerEngine
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_per_symbol_csv_files(tmp_path, write_sine_csv):
+    day_dir = tmp_path / "day"
+    day_dir.mkdir()
+    write_sine_csv(day_dir / "AAPL.csv", 30)
+
+    provider = LocalBarProvider(str(tmp_path))
+    timeframe = provider.timeframe_from_string("Day")
+    bars = provider.get_bars(["aapl", "MSFT"], timeframe, START + timedelta(days=5), START + timedelta(days=9))
+
+    assert [b.timestamp.day for b in bars["AAPL"]] == [6, 7, 8, 9, 10]
+    assert bars["AAPL"][0].high == bars["AAPL"][0].close + 1
+    assert bars["MSFT"] == []
+
+
+def test_multi_symbol_csv_is_indexed_by_byte_ranges(tmp_path, sine_rows):
+    lines = ["symbol,t,o,h,l,c,v"]
+    for symbol in ("AAPL", "MSFT", "NVDA"):
+        lines += [f"{s},{ts},{c},{c},{c},{c},5" for s, ts, c in sine_rows(symbol, 10, len(symbol))]
+    (tmp_path / "dump.csv").write_text("\n".join(lines) + "\n")
+
+    provider = LocalBarProvider(str(tmp_path))
+    end = START + timedelta(days=100)
+    bars = provider.get_bars(["MSFT", "NVDA"], "1Day", START, end)
+    assert len(bars["MSFT"]) == 10
+    assert len(bars["NVDA"]) == 10
+
+    entry = provider._symbol_index("1Day")["MSFT"][0]
+    assert set(entry.ranges) == {"AAPL", "MSFT", "NVDA"}
+    assert all(len(ranges) == 1 for ranges in entry.ranges.values())
+
+
+def test_time_ordered_csv_reads_merged_ranges(tmp_path):
+    lines = ["symbol,t,o,h,l,c,v"]
+    for i in range(300):
+        for symbol in ("AAPL", "MSFT", "NVDA"):
+            c = 100 + i + len(symbol)
+            lines.append(f"{symbol},{(START + timedelta(days=i)).isoformat()},{c},{c},{c},{c},5")
+    (tmp_path / "dump.csv").write_text("\n".join(lines) + "\n")
+
+    provider = LocalBarProvider(str(tmp_path))
+    bars = provider.get_bars(["MSFT", "NVDA"], "1Day", START, START + timedelta(days=400))
+    assert [b.close for b in bars["MSFT"]] == [104.0 + i for i in range(300)]
+    assert [b.close for b in bars["NVDA"]] == [104.0 + i for i in range(300)]
+
+    # One range per symbol rather than one per row.
+    entry = provider._symbol_index("1Day")["MSFT"][0]
+    assert all(len(ranges) == 1 for ranges in entry.ranges.values())
+
+
+def test_refresh_reports_only_changed_files(tmp_path, write_sine_csv):
+    write_sine_csv(tmp_path / "AAPL.csv", 20)
+    write_sine_csv(tmp_path / "MSFT.csv", 20)
+    provider = LocalBarProvider(str(tmp_path))
+
+    _, changed = provider.refresh_bars(["AAPL", "MSFT"], "1Day", START)
+    assert changed == {"AAPL", "MSFT"}
+
+    _, changed = provider.refresh_bars(["AAPL", "MSFT"], "1Day", START)
+    assert changed == set()
+
+    path = tmp_path / "MSFT.csv"
+    write_sine_csv(path, 21)
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    bars, changed = provider.refresh_bars(["AAPL", "MSFT"], "1Day", START)
+    assert changed == {"MSFT"}
+    assert len(bars["MSFT"]) == 21
+
+
+def test_incremental_scan_reevaluates_only_changed_symbols(tmp_path, write_sine_csv):
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def write(symbol, count, k):
+        write_sine_csv(tmp_path / f"{symbol}.csv", count, k, start=today - timedelta(days=400))
+
+    write("AAPL", 390, 0)
+    write("MSFT", 390, 2)
+    engine = ScreenerEngine(LocalBarProvider(str(tmp_path)))
+    config = ScanConfig(symbols_text="AAPL,MSFT", within_bars=60)
+
+    changed, invalid, warnings = engine.run_incremental_scan(config, threading.Event(), lambda *args: None)
+    assert set(changed) == {"AAPL", "MSFT"}
+    assert changed["AAPL"] and not invalid and not warnings
+
+    changed, _, _ = engine.run_incremental_scan(config, threading.Event(), lambda *args: None)
+    assert changed == {}
+
+    write("MSFT", 391, 2)
+    path = tmp_path / "MSFT.csv"
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    changed, _, _ = engine.run_incremental_scan(config, threading.Event(), lambda *args: None)
+    assert list(changed) == ["MSFT"]
+    assert all(r.symbol == "MSFT" for r in changed["MSFT"])
+    assert changed["MSFT"][0].last_bar_time.startswith((today - timedelta(days=10)).date().isoformat())
+
+    # A restarted session on the same provider starts from an empty table, so its first
+    # tick must report every symbol even though no file changed since the last session.
+    restarted = ScreenerEngine(engine.provider)
+    changed, _, _ = restarted.run_incremental_scan(config, threading.Event(), lambda *args: None, full=True)
+    assert set(changed) == {"AAPL", "MSFT"}
+    changed, _, _ = restarted.run_incremental_scan(config, threading.Event(), lambda *args: None)
+    assert changed == {}
+
+
+def test_multi_symbol_parquet(tmp_path, sine_rows):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = [r for symbol in ("AAPL", "MSFT") for r in sine_rows(symbol, 12)]
+    table = pa.table(
+        {
+            "symbol": [r[0] for r in rows],
+            "timestamp": [datetime.fromisoformat(r[1]) for r in rows],
+            "open": [r[2] for r in rows],
+            "high": [r[2] for r in rows],
+            "low": [r[2] for r in rows],
+            "close": [r[2] for r in rows],
+            "volume": [1.0 for _ in rows],
+        }
+    )
+    pq.write_table(table, tmp_path / "bars.parquet")
+
+    provider = LocalBarProvider(str(tmp_path))
+    bars = provider.get_bars(["MSFT"], "1Day", START, START + timedelta(days=365))
+    assert len(bars["MSFT"]) == 12
+    assert bars["MSFT"][0].timestamp == START
+
+
+def test_parquet_symbols_match_regardless_of_case(tmp_path, sine_rows):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    rows = [r for symbol in ("aapl", "Msft") for r in sine_rows(symbol, 5)]
+    table = pa.table(
+        {
+            "ticker": [r[0] for r in rows],
+            "t": [datetime.fromisoformat(r[1]) for r in rows],
+            "o": [r[2] for r in rows],
+            "h": [r[2] for r in rows],
+            "l": [r[2] for r in rows],
+            "c": [r[2] for r in rows],
+            "v": [1.0 for _ in rows],
+        }
+    )
+    pq.write_table(table, tmp_path / "bars.parquet")
+
+    provider = LocalBarProvider(str(tmp_path))
+    bars = provider.get_bars(["AAPL", "msft"], "1Day", START, START + timedelta(days=365))
+    assert len(bars["AAPL"]) == 5
+    assert len(bars["MSFT"]) == 5
+
+
+def test_cli_scans_local_directory_without_credentials(tmp_path, write_sine_csv, monkeypatch):
+    monkeypatch.delenv("ALPACA_API_KEY", raising=False)
+    for k, symbol in enumerate(["AAA", "BBB", "CCC", "DDD"]):
+        write_sine_csv(tmp_path / f"{symbol}.csv", 400, k)
+    out = tmp_path / "results.jsonl"
+
+    argv = [
+        "--bars-dir", str(tmp_path),
+        "--symbols", "AAA,BBB,CCC,DDD",
+        "--end-date", "2025-12-31",
+        "--lookback-days", "400",
+        "--within", "10",
+        "--ma", "--ma-periods", "5", "20",
+        "-o", str(out),
+    ]
+    code = cli.main(argv)
+    assert code == 0
+    records = [json.loads(line) for line in out.read_text().splitlines()]
+    assert records
+    assert {r["symbol"] for r in records} <= {"AAA", "BBB", "CCC", "DDD"}
+
+    # Rows are written as they are found; --sort holds them and orders by signal age.
+    sorted_out = tmp_path / "sorted.jsonl"
+    assert cli.main(argv[:-1] + [str(sorted_out), "--sort"]) == 0
+    ordered = [json.loads(line) for line in sorted_out.read_text().splitlines()]
+    assert ordered == sorted(records, key=lambda r: (r["signal_age"], r["symbol"]))
+
+
+def test_cancel_mid_fetch_returns_partial_results(tmp_path, write_sine_csv):
+    symbols = [f"S{i:02d}" for i in range(30)]
+    for k, symbol in enumerate(symbols):
+        write_sine_csv(tmp_path / f"{symbol}.csv", 300, k % 7)
+    cancel = threading.Event()
+
+    class CancellingProvider(LocalBarProvider):
+        calls = 0
+
+        def get_bars(self, symbols, timeframe, start, end, cancel_event=None):
+            self.calls += 1
+            if self.calls == 2:
+                cancel.set()
+            return super().get_bars(symbols, timeframe, start, end, cancel_event)
+
+    config = ScanConfig(
+        symbols_text=",".join(symbols), end_date=date(2024, 11, 1), lookback_days=300, within_bars=30
+    )
+    results, _, _ = ScreenerEngine(CancellingProvider(str(tmp_path))).run_scan(config, cancel, lambda *args: None)
+
+    assert results
+    assert {r.symbol for r in results} <= set(symbols[:25])
@@ -0,0 +1,86 @@
+from threading import Event
+
+import pytest
+
+from screener.parallel import ParallelEvaluator
+from screener.rules import Above, CrossAbove, CrossBelow, EvaluationPlan, Signal, average_true_range, moving_average
+
+
+@pytest.fixture
+def sine_columns(sine_closes):
+    def make(k: int) -> dict[str, list[float]]:
+        closes = sine_closes(400, k)
+        return {"high": [c + 1 + k % 3 for c in closes], "low": [c - 1 for c in closes], "close": closes}
+
+    return make
+
+
+def test_parallel_records_match_serial_evaluation(sine_columns):
+    fast, slow = moving_average(5), moving_average(20)
+    plan = EvaluationPlan(
+        [
+            Signal("MA Bull", CrossAbove(fast, slow, 10) & Above(average_true_range(14), 3.0)),
+            Signal("MA Bear", CrossBelow(fast, slow, 10)),
+        ]
+    )
+    assert plan.columns == ("high", "low", "close")
+    columns_by_symbol = [(f"S{k}", sine_columns(k)) for k in range(12)]
+
+    expected = []
+    for symbol, columns in columns_by_symbol:
+        matches, ctx = plan.evaluate(columns)
+        if matches:
+            expected.append((symbol, tuple(matches), (ctx.last(fast), ctx.last(slow))))
+
+    evaluator = ParallelEvaluator(workers=2, shard_size=5)
+    try:
+        progress = []
+        records = evaluator.evaluate(plan, columns_by_symbol, (fast, slow), Event(), progress.append)
+        assert records == expected
+        assert progress[-1] == len(columns_by_symbol)
+
+    finally:
+        evaluator.shutdown()
+
+
+def test_cancel_stops_remaining_shards(sine_columns):
+    fast, slow = moving_average(5), moving_average(20)
+    plan = EvaluationPlan([Signal("MA", CrossAbove(fast, slow, 400) | CrossBelow(fast, slow, 400))])
+    columns_by_symbol = [(f"S{k}", sine_columns(k % 12)) for k in range(240)]
+    assert all(plan.evaluate(columns)[0] for _, columns in columns_by_symbol)
+
+    evaluator = ParallelEvaluator(workers=2, shard_size=4)
+    try:
+        cancel = Event()
+        progress = []
+
+        def on_progress(done: int) -> None:
+            progress.append(done)
+            cancel.set()
+
+        records = evaluator.evaluate(plan, columns_by_symbol, (fast, slow), cancel, on_progress)
+        # Every symbol matches, so fewer records means shards were skipped or stopped early.
+        assert 0 < len(records) < len(columns_by_symbol)
+        assert progress[-1] < len(columns_by_symbol)
+    finally:
+        evaluator.shutdown()
+
+
+def test_small_scans_stay_in_process(tmp_path, write_sine_csv):
+    from datetime import date
+
+    from data.local_provider import LocalBarProvider
+    from indicators.cache import IndicatorCache
+    from screener.engine import ScanConfig, ScreenerEngine
+
+    write_sine_csv(tmp_path / "AAA.csv", 400)
+
+    class Unused:
+        def evaluate(self, *args, **kwargs):
+            raise AssertionError("pool used for a small scan")
+
+    cache = IndicatorCache()
+    engine = ScreenerEngine(LocalBarProvider(str(tmp_path)), indicator_cache=cache, evaluator=Unused())
+    config = ScanConfig(symbols_text="AAA", end_date=date(2025, 2, 1), lookback_days=400, within_bars=50)
+    engine.run_scan(config, Event(), lambda *args: None)
+    assert cache.misses
@@ -0,0 +1,57 @@
+import math
+import threading
+from datetime import date
+
+import pytest
+
+from data.local_provider import LocalBarProvider
+from screener.engine import ScanConfig, ScreenerEngine
+from screener.ranking import RANK_SCORES, TopKCollector
+
+
+def test_collector_keeps_best_k_with_stable_ties(make_result):
+    collector = TopKCollector(3, "age")
+    for symbol, age in [("A", 4), ("B", 1), ("C", 3), ("D", 1), ("E", 0), ("F", 1)]:
+        collector.add(make_result(symbol, "MACD Bull", age))
+
+    assert [r.symbol for r in collector.results()] == ["E", "B", "D"]
+    assert collector.seen == 6
+    assert len(collector) == 3
+
+
+def test_scores_are_price_relative_and_rank_missing_values_last(make_result):
+    histogram = RANK_SCORES["histogram"]
+    assert histogram(make_result("A", "MACD Bull", 0, histogram=-2.0, last_close=100.0)) > histogram(
+        make_result("B", "MACD Bull", 0, histogram=1.0, last_close=100.0)
+    )
+    assert histogram(make_result("C", "MACD Bull", 0, histogram=1.0, last_close=10.0)) > histogram(
+        make_result("D", "MACD Bull", 0, histogram=1.0, last_close=100.0)
+    )
+    assert histogram(make_result("E", "MACD Bull", 0)) == -math.inf
+    assert RANK_SCORES["ma_distance"](make_result("F", "MACD Bull", 0, slow_ma=8.0)) == pytest.approx(0.25)
+
+    with pytest.raises(ValueError):
+        TopKCollector(3, "volume")
+    with pytest.raises(ValueError):
+        TopKCollector(0)
+
+
+def test_ranked_scan_returns_top_k_of_full_scan(tmp_path, write_sine_csv):
+    symbols = [f"S{i:02d}" for i in range(30)]
+    for k, symbol in enumerate(symbols):
+        write_sine_csv(tmp_path / f"{symbol}.csv", 300, k % 7, shift=k)
+
+    config = ScanConfig(symbols_text=",".join(symbols), end_date=date(2024, 11, 1), lookback_days=300, within_bars=30)
+    engine = ScreenerEngine(LocalBarProvider(str(tmp_path)))
+    everything, _, _ = engine.run_scan(config, threading.Event(), lambda *args: None)
+    assert len(everything) > 5
+
+    config.top_k = 5
+    config.rank_by = "histogram"
+    streamed = []
+    ranked, _, _ = engine.run_scan(config, threading.Event(), lambda *args: None, streamed.append)
+
+    score = RANK_SCORES["histogram"]
+    expected = sorted(everything, key=score, reverse=True)[:5]
+    assert [score(r) for r in ranked] == [score(r) for r in expected]
+    assert streamed == ranked
@@ -0,0 +1,132 @@
+from indicators.cache import IndicatorCache
+from indicators.macd import detect_macd_crossover_age
+from indicators.moving_averages import detect_ma_crossover_age
+from screener.rules import (
+    Above,
+    CrossAbove,
+    CrossBelow,
+    EvaluationPlan,
+    Rising,
+    Signal,
+    macd_histogram,
+    macd_line,
+    macd_signal,
+    moving_average,
+    price,
+)
+from screener.engine import ScanConfig, build_signals, compile_plan, lookback_days
+
+
+def test_cross_matches_detect_functions():
+    closes = [30, 29, 28, 27, 26, 25, 24, 23, 22, 21, 20, 21, 22, 23, 24, 25]
+    line, signal = macd_line(4, 8, 3), macd_signal(4, 8, 3)
+    fast, slow = moving_average(2), moving_average(4)
+    plan = EvaluationPlan(
+        [
+            Signal("MACD Bull", CrossAbove(line, signal, 5)),
+            Signal("MACD Bear", CrossBelow(line, signal, 5)),
+            Signal("MA Bull", CrossAbove(fast, slow, 5)),
+        ]
+    )
+    matches, _ = plan.evaluate(closes)
+    ages = dict(matches)
+
+    assert ages.get("MACD Bull") == detect_macd_crossover_age(closes, 4, 8, 3, 5, True)
+    assert ages.get("MACD Bear") == detect_macd_crossover_age(closes, 4, 8, 3, 5, False)
+    assert ages.get("MA Bull") == detect_ma_crossover_age(closes, 2, 4, 5, True)
+
+
+def test_composite_rule_and_shared_subexpressions():
+    closes = [10, 9, 8, 7, 6, 7, 9, 12]
+    bull = CrossAbove(moving_average(2), moving_average(4), within=3)
+    plan = EvaluationPlan(
+        [
+            Signal("Bull above SMA4", bull & Above(price(), moving_average(4)) & Rising(price(), 2)),
+            Signal("Bull only", bull),
+        ]
+    )
+
+    assert sorted(plan.series_keys) == [("close", ()), ("sma", (2,)), ("sma", (4,))]
+    assert plan.conditions.count(bull) == 1
+
+    matches, ctx = plan.evaluate(closes)
+    labels = [label for label, _ in matches]
+    assert labels == ["Bull above SMA4", "Bull only"]
+    assert ctx.last(moving_average(4)) == 8.5
+
+
+def test_macd_components_share_one_computation():
+    plan = EvaluationPlan(
+        [Signal("Hist up", Rising(macd_histogram()) & Above(macd_line(), macd_signal()))]
+    )
+    assert plan.series_keys == (("macd", (12, 26, 9)),)
+    assert plan.min_bars == 26 + 9 - 1 + 1
+
+
+def test_negated_rule_and_no_match():
+    closes = [float(i) for i in range(1, 40)]
+    plan = EvaluationPlan([Signal("Not rising", ~Rising(price()))])
+    matches, _ = plan.evaluate(closes)
+    assert matches == []
+
+
+def test_plan_reuses_memoized_series_for_same_fingerprint():
+    closes = [10, 9, 8, 7, 6, 7, 9, 12]
+    fingerprint = ("AAPL", "1Day", 0, 7, len(closes))
+    # Room for exactly two 8-value series.
+    cache = IndicatorCache(max_bytes=2 * 8 * 32)
+
+    narrow = EvaluationPlan([Signal("Bull", CrossAbove(moving_average(2), moving_average(4), within=1))])
+    wide = EvaluationPlan([Signal("Bull", CrossAbove(moving_average(2), moving_average(4), within=3))])
+
+    narrow.evaluate(closes, cache, fingerprint)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    matches, _ = wide.evaluate(closes, cache, fingerprint)
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert matches == [("Bull", 1)]
+
+    EvaluationPlan([Signal("Up", Rising(price()))]).evaluate(closes, cache, fingerprint)
+    assert len(cache) == 2
+
+
+def test_default_cache_keeps_a_typical_universe_resident():
+    closes = [100 + (i % 17) * 0.5 for i in range(260)]
+    cache = IndicatorCache()
+    narrow = compile_plan(ScanConfig(symbols_text="", within_bars=1))
+    wide = compile_plan(ScanConfig(symbols_text="", within_bars=5))
+
+    for symbol in range(2000):
+        narrow.evaluate(closes, cache, (f"S{symbol}", "1Day", 0, 259, len(closes)))
+    misses = cache.misses
+    for symbol in range(2000):
+        wide.evaluate(closes, cache, (f"S{symbol}", "1Day", 0, 259, len(closes)))
+
+    assert cache.misses == misses
+    assert cache.hits == misses
+
+
+def test_config_filters_read_only_needed_columns_and_widen_lookback():
+    config = ScanConfig(symbols_text="AAA", use_macd=False, use_ema=True, rsi_max=70, min_avg_volume=1e6)
+    signals = build_signals(config)
+    assert [s.label for s in signals] == ["EMA Bull", "EMA Bear"]
+
+    plan = compile_plan(config)
+    assert plan.columns == ("close", "volume")
+    assert (("rsi", (14,)) in plan.series_keys) and (("volume_sma", (20,)) in plan.series_keys)
+
+    bars = 60
+    closes = [100 + (i % 9) for i in range(bars)]
+    quiet = {"close": closes, "volume": [5e5] * bars}
+    busy = {"close": closes, "volume": [2e6] * bars}
+    unfiltered = EvaluationPlan(build_signals(ScanConfig(symbols_text="AAA", use_macd=False, use_ema=True, within_bars=60)))
+    filtered = EvaluationPlan(
+        build_signals(ScanConfig(symbols_text="AAA", use_macd=False, use_ema=True, within_bars=60, min_avg_volume=1e6))
+    )
+    assert unfiltered.evaluate(quiet)[0]
+    assert filtered.evaluate(quiet)[0] == []
+    assert filtered.evaluate(busy)[0] == unfiltered.evaluate(busy)[0]
+
+    assert lookback_days(ScanConfig(symbols_text="AAA"), 200) == 180
+    widened = lookback_days(ScanConfig(symbols_text="AAA", lookback_days=30), 200)
+    assert 200 < widened * 2 * 5 / 7 < 230
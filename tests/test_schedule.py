@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from screener.schedule import diff_changed_results, next_bar_close, seconds_until_next_bar_close
+
+
+NO_GRACE = timedelta(0)
+
+
+def test_minute_and_hour_bars_close_on_utc_boundaries():
+    now = datetime(2024, 3, 12, 14, 30, 17, tzinfo=timezone.utc)
+    assert next_bar_close("Minute", now, NO_GRACE) == datetime(2024, 3, 12, 14, 31, tzinfo=timezone.utc)
+    assert next_bar_close("Hour", now, NO_GRACE) == datetime(2024, 3, 12, 15, 0, tzinfo=timezone.utc)
+
+
+def test_daily_bar_closes_at_new_york_midnight():
+    # 2024-03-12 is after the DST switch: New York is UTC-4.
+    now = datetime(2024, 3, 12, 14, 30, tzinfo=timezone.utc)
+    assert next_bar_close("Day", now, NO_GRACE) == datetime(2024, 3, 13, 4, 0, tzinfo=timezone.utc)
+
+
+def test_grace_is_added_and_wait_is_positive():
+    now = datetime(2024, 3, 12, 14, 30, 59, tzinfo=timezone.utc)
+    assert seconds_until_next_bar_close("minute", now, timedelta(seconds=3)) == pytest.approx(4.0)
+
+
+def test_unknown_timeframe_raises():
+    with pytest.raises(ValueError):
+        next_bar_close("Week")
+
+
+def test_diff_touches_only_changed_symbols(make_result):
+    shown = {"AAPL": {("AAPL", "MACD Bull"), ("AAPL", "MA Bull")}, "MSFT": {("MSFT", "MACD Bear")}}
+    changed = {"AAPL": [make_result("AAPL", "MACD Bull"), make_result("AAPL", "EMA Bull")], "NVDA": [make_result("NVDA", "MA Bear")]}
+
+    removed, updated, added = diff_changed_results(shown, changed)
+
+    assert removed == [("AAPL", "MA Bull")]
+    assert [(r.symbol, r.signal_type) for r in updated] == [("AAPL", "MACD Bull")]
+    assert [(r.symbol, r.signal_type) for r in added] == [("AAPL", "EMA Bull"), ("NVDA", "MA Bear")]
+    assert diff_changed_results(shown, {"MSFT": []}) == ([("MSFT", "MACD Bear")], [], [])
@@ -0,0 +1,189 @@
+import stat
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from data.local_provider import LocalBarProvider
+from screener.client import ScanClient, ScanServiceError
+from screener.engine import ScanConfig, ScreenerEngine
+from screener.service import ScanJob, ScanService, config_from_dict, config_to_dict
+from server import make_server
+
+
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+
+
+@pytest.fixture
+def bars_dir(tmp_path, write_sine_csv):
+    for k, symbol in enumerate(SYMBOLS):
+        write_sine_csv(tmp_path / f"{symbol}.csv", 400, k)
+    return tmp_path
+
+
+def _config():
+    return ScanConfig(
+        symbols_text=",".join(SYMBOLS),
+        end_date=date(2025, 12, 31),
+        lookback_days=400,
+        within_bars=10,
+        use_ma=True,
+        ma_fast=5,
+        ma_slow=20,
+    )
+
+
+def _eventually(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def served(bars_dir):
+    service = ScanService(LocalBarProvider(str(bars_dir)))
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield service, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+
+def test_config_round_trip():
+    config = _config()
+    assert config_from_dict(config_to_dict(config)) == config
+    with pytest.raises(ValueError):
+        config_from_dict({"symbols_text": "AAA", "bogus": 1})
+
+
+def test_client_matches_local_engine(served, bars_dir):
+    service, url = served
+    progress = []
+    results, invalid, warnings = ScanClient(url).run_scan(
+        _config(), threading.Event(), lambda *args: progress.append(args)
+    )
+
+    expected, _, _ = ScreenerEngine(LocalBarProvider(str(bars_dir))).run_scan(
+        _config(), threading.Event(), lambda *args: None
+    )
+    assert results
+    assert sorted(results, key=lambda r: (r.symbol, r.signal_type)) == sorted(
+        expected, key=lambda r: (r.symbol, r.signal_type)
+    )
+    assert invalid == []
+    assert progress[-1][:2] == (len(SYMBOLS), len(SYMBOLS))
+
+    # A second client reuses the service's warm indicator cache.
+    hits = service.engine.indicator_cache.hits
+    ScanClient(url).run_scan(_config(), threading.Event(), lambda *args: None)
+    assert service.engine.indicator_cache.hits > hits
+    # Jobs whose streams were read to the end are released.
+    assert _eventually(lambda: service.get("1") is None and service.get("2") is None)
+
+
+def test_finished_jobs_drop_progress_and_are_evicted(bars_dir):
+    job = ScanJob("1", _config())
+    reader = job.events()
+    for done in range(1, 4):
+        job.publish({"type": "progress", "done": done, "total": 3, "matched": 0})
+    assert next(reader)["done"] == 1
+    job.publish({"type": "result", "result": {}})
+    job.publish({"type": "done"}, final=True)
+    # A reader part-way through still gets every later event once.
+    assert [e.get("done") for e in reader] == [2, 3, None, None]
+    assert [e["type"] for e in job.events()] == ["progress", "result", "done"]
+    assert next(job.events())["done"] == 3
+
+    service = ScanService(LocalBarProvider(str(bars_dir)), keep_finished=1)
+    try:
+        first = service.submit(_config())
+        list(first.events())
+        second = service.submit(_config())
+        list(second.events())
+        # Evicted when the later job finished, not only on the next submit.
+        assert _eventually(lambda: service.get(first.id) is None)
+        assert service.get(second.id) is second
+    finally:
+        service.shutdown()
+
+
+def test_bad_config_is_rejected(served):
+    _, url = served
+    client = ScanClient(url)
+    with pytest.raises(ScanServiceError):
+        client._request("POST", "/scans", {"symbols_text": "AAA", "bogus": 1})
+    with pytest.raises(ScanServiceError):
+        client.cancel("missing")
+
+
+class _GatedProvider(LocalBarProvider):
+    def __init__(self, root):
+        super().__init__(root)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def get_bars(self, symbols, timeframe, start, end, cancel_event=None):
+        self.started.set()
+        self.release.wait(5)
+        return super().get_bars(symbols, timeframe, start, end, cancel_event)
+
+
+def test_cancel_is_forwarded_to_the_service(bars_dir):
+    provider = _GatedProvider(str(bars_dir))
+    service = ScanService(provider)
+    server = make_server(service, socket_path=str(bars_dir / "scan.sock"))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        cancel = threading.Event()
+        outcome = {}
+
+        def run():
+            outcome["value"] = ScanClient(f"unix://{bars_dir / 'scan.sock'}").run_scan(
+                _config(), cancel, lambda *args: None
+            )
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        assert provider.started.wait(5)
+        job = service.get("1")
+        cancel.set()
+        assert job.cancel_event.wait(5)
+        provider.release.set()
+        thread.join(5)
+
+        results, _, _ = outcome["value"]
+        assert results == []
+        assert list(job.events())[-1] == {
+            "type": "done", "invalid": [], "warnings": [], "cancelled": True
+        }
+    finally:
+        provider.release.set()
+        server.shutdown()
+        server.server_close()
+        service.shutdown()
+
+
+def test_socket_path_is_private_and_never_replaces_other_files(tmp_path):
+    service = ScanService(LocalBarProvider(str(tmp_path)))
+    path = tmp_path / "scan.sock"
+    try:
+        path.write_text("not a socket")
+        with pytest.raises(ValueError):
+            make_server(service, socket_path=str(path))
+        assert path.read_text() == "not a socket"
+        path.unlink()
+
+        make_server(service, socket_path=str(path)).server_close()
+        # A stale socket left behind by a previous run is replaced.
+        server = make_server(service, socket_path=str(path))
+        server.server_close()
+        assert stat.S_ISSOCK(path.lstat().st_mode)
+        assert stat.S_IMODE(path.lstat().st_mode) == 0o660
+    finally:
+        service.shutdown()
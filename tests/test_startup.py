@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+from utils.startup import StartupTimer
+
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def test_engine_import_does_not_load_pyarrow():
+    code = "import sys, screener.engine, screener.export, data.alpaca_client, data.local_provider; print('pyarrow' in sys.modules)"
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_spawned_workers_do_not_import_gtk():
+    # multiprocessing's spawn start method re-runs the entry script as __mp_main__.
+    app = os.path.join(SRC_DIR, "app.py")
+    code = f"import runpy, sys; runpy.run_path({app!r}, run_name='__mp_main__'); print('gi' in sys.modules)"
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_timer_records_nested_import_times(tmp_path, monkeypatch):
+    pkg = tmp_path / "timed_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from . import child\n")
+    (pkg / "child.py").write_text("VALUE = sum(range(1000))\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    timer = StartupTimer(enabled=True)
+    try:
+        import timed_pkg  # noqa: F401
+
+        timer.mark("imported")
+    finally:
+        report = timer.report()
+
+    own, cumulative = timer.imports["timed_pkg"]
+    assert cumulative >= timer.imports["timed_pkg.child"][1]
+    assert own <= cumulative
+    assert "imported" in report
+    assert "timed_pkg.child" in report
+    assert not timer.enabled
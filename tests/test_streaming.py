@@ -0,0 +1,99 @@
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from data.bar_cache import BarCache
+from data.local_provider import LocalBarProvider
+from data.provider import OHLCVBar
+from screener.engine import ScanConfig, ScreenerEngine
+from screener.streaming import BAR_BYTES, MemoryBudget, Prefetcher
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _bars(count: int, offset: int = 0):
+    return [OHLCVBar(START + timedelta(minutes=offset + i), 1.5, 2.0, 1.0, 1.25, 100.0 + i) for i in range(count)]
+
+
+def test_bar_cache_bounds_memory_and_spills(tmp_path):
+    cache = BarCache(max_bars=10, spill_dir=str(tmp_path))
+    cache.put("a", _bars(6))
+    cache.put("b", _bars(6, 6))
+    assert cache.memory_bars == 6
+    assert "a" in cache
+
+    assert cache.get("a") == _bars(6)
+    assert cache.get("b") == _bars(6, 6)
+
+    dropped = BarCache(max_bars=10)
+    dropped.put("a", _bars(6))
+    dropped.put("b", _bars(6))
+    assert dropped.get("a") is None
+    assert "a" not in dropped
+
+
+def test_spill_directory_is_bounded(tmp_path):
+    # Six bars spill as 288 bytes; room for two such files.
+    cache = BarCache(max_bars=6, spill_dir=str(tmp_path), max_spill_bytes=600)
+    for i, key in enumerate("abcd"):
+        cache.put(key, _bars(6, 6 * i))
+    # a, b and c were evicted and spilled; the oldest spill file was deleted.
+    assert "a" not in cache
+    assert cache.get("b") == _bars(6, 6)
+    assert cache.spill_bytes <= 600
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.bars")) <= 600
+
+    # A second cache on the same directory starts from what is already there.
+    assert BarCache(max_bars=6, spill_dir=str(tmp_path), max_spill_bytes=600).spill_bytes == cache.spill_bytes
+
+
+def test_prefetcher_waits_for_released_chunks():
+    budget = MemoryBudget(3 * 10 * BAR_BYTES)
+    fetched = []
+
+    def fetch(chunk):
+        fetched.append(chunk[0])
+        return {chunk[0]: _bars(10)}
+
+    chunks = [[f"S{i}"] for i in range(8)]
+    prefetcher = Prefetcher(fetch, chunks, budget, lambda chunk: 10 * BAR_BYTES, threading.Event())
+    seen = []
+    try:
+        for item in prefetcher:
+            if item is None:
+                continue
+            time.sleep(0.02)
+            # Never more than the budget's worth of chunks ahead of the consumer.
+            assert len(fetched) - len(seen) <= 3
+            seen.append(item[0][0])
+            budget.release(item[2])
+    finally:
+        prefetcher.close()
+
+    assert seen == [f"S{i}" for i in range(8)]
+    assert budget.peak <= budget.limit
+    assert budget.used == 0
+
+
+def test_out_of_core_scan_matches_in_memory_scan(tmp_path, write_sine_csv):
+    symbols = [f"S{i:02d}" for i in range(30)]
+    for k, symbol in enumerate(symbols):
+        write_sine_csv(tmp_path / f"{symbol}.csv", 1500, k % 7)
+
+    config = ScanConfig(symbols_text=",".join(symbols), end_date=date(2027, 12, 1), lookback_days=1000, within_bars=30)
+    engine = ScreenerEngine(LocalBarProvider(str(tmp_path)))
+    expected, _, _ = engine.run_scan(config, threading.Event(), lambda *args: None)
+
+    # Room for about eight symbols of fetched bars at a time.
+    config.memory_limit_mb = 8 * 1500 * BAR_BYTES / (1024 * 1024)
+    streamed, _, warnings = ScreenerEngine(LocalBarProvider(str(tmp_path), max_cached_bars=3000)).run_scan(
+        config, threading.Event(), lambda *args: None
+    )
+
+    assert not warnings
+    assert [(r.symbol, r.signal_type, r.signal_age) for r in streamed] == [
+        (r.symbol, r.signal_type, r.signal_age) for r in expected
+    ]
+    assert all(len(r.close_series) == 1000 for r in streamed)
+    assert all(r.close_series == e.close_series[-1000:] for r, e in zip(streamed, expected))